@@ -3,6 +3,7 @@ import time
 import lvgl as lv
 import display_driver
 from micropython import const
+from chart_batch import ChartBatch
 
 # the example show the use of cubic-bezier3 in animation.
 # the control point P1,P2 of cubic-bezier3 can be adjusted by slider.
@@ -25,6 +26,7 @@ class LvExampleAnim_3():
 
         self.p1 = 0
         self.p2 = 0
+        self.drag_start = 0
         self.cont = lv.obj(lv.screen_active())
         self.cont.set_style_pad_all(2, lv.PART.MAIN)
         self.cont.set_style_pad_column(10, lv.PART.MAIN)
@@ -84,18 +86,38 @@ class LvExampleAnim_3():
         self.ser1 = self.chart.add_series(lv.palette_main(lv.PALETTE.RED), lv.chart.AXIS.PRIMARY_Y)
         self.chart.set_axis_range(lv.chart.AXIS.PRIMARY_Y, 0, 1024)
         self.chart.set_axis_range(lv.chart.AXIS.PRIMARY_X, 0, 1024)
-        self.chart.set_point_count(CHART_POINTS_NUM);
+        self.chart.set_point_count(CHART_POINTS_NUM + 1)
         self.chart.set_grid_cell(lv.GRID_ALIGN.STRETCH, 0, 3,lv.GRID_ALIGN.STRETCH, 3, 1)
-        
+
+        # Write the points straight into arrays owned by the example and
+        # refresh the chart once per update instead of once per point
+        self.batch = ChartBatch(self.chart)
+        self.xs, self.ys = self.batch.arrays(self.ser1, scatter=True)
+        self.bezier_table_init()
+
+        self.p1_slider.add_event_cb(self.slider_drag_event_cb, lv.EVENT.PRESSED, None)
+        self.p2_slider.add_event_cb(self.slider_drag_event_cb, lv.EVENT.PRESSED, None)
+        self.p1_slider.add_event_cb(self.slider_drag_event_cb, lv.EVENT.RELEASED, None)
+        self.p2_slider.add_event_cb(self.slider_drag_event_cb, lv.EVENT.RELEASED, None)
+
+    def bezier_table_init(self):
+        # x positions of the chart points never change
+        for i in range(CHART_POINTS_NUM + 1):
+            self.xs[i] = i * (1024 // CHART_POINTS_NUM)
+
     def refer_chart_cubic_bezier(self):
-        for i in range(CHART_POINTS_NUM+1):
-            t = i * (1024 // CHART_POINTS_NUM)
-            step = lv.bezier3(t, 0, self.p1, self.p2, 1024)
-            self.chart.set_series_value_by_id2(self.ser1, i, t, step)
-            self.chart.refresh()
+        # Same function as anim_path_bezier3_cb, so the chart shows the path
+        # the animation follows; one chart refresh for all points
+        p1 = self.p1
+        p2 = self.p2
+        xs = self.xs
+        ys = self.ys
+        with self.batch:
+            for i in range(CHART_POINTS_NUM + 1):
+                ys[i] = lv.bezier3(xs[i], 0, p1, p2, 1024)
 
     def slider_event_cb(self,e):
-        slider = lv.slider()
+        slider = lv.slider.__cast__(e.get_target())
         
         if slider == self.p1_slider:
             label = self.p1_label;
@@ -104,9 +126,16 @@ class LvExampleAnim_3():
         else:
             label = self.p2_label
             self.p2 = slider.get_value()
-            label.set_text("p1: {:d}".format(self.p2))
+            label.set_text("p2: {:d}".format(self.p2))
 
         self.refer_chart_cubic_bezier()
+
+    def slider_drag_event_cb(self, e):
+        # Report how many chart refreshes one slider drag caused
+        if e.get_code() == lv.EVENT.PRESSED:
+            self.drag_start = self.batch.refreshes
+        else:
+            print("chart refreshes during drag:", self.batch.refreshes - self.drag_start)
         
 
     def run_btn_event_handler(self,e):
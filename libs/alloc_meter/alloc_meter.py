@@ -0,0 +1,87 @@
+# alloc_meter.py - heap bytes allocated by an event callback per frame
+#
+# Draw callbacks run for every point on every frame, so even one small
+# allocation inside them adds up to frequent garbage collections. AllocMeter
+# wraps a callback, pauses automatic GC while it runs, counts the bytes it
+# allocated from the gc.mem_alloc() delta, sums them per frame and prints
+# them periodically.
+#
+# Copy this file to the device's /lib next to display_driver.py, then:
+#     meter = AllocMeter("chart")
+#     chart.add_event_cb(meter.wrap(draw_event_cb), lv.EVENT.DRAW_TASK_ADDED, None)
+#     chart.add_event_cb(meter.frame_end_cb, lv.EVENT.DRAW_POST_END, None)
+#     chart.add_flag(lv.obj.FLAG.SEND_DRAW_TASK_EVENTS)
+
+import gc
+
+
+class AllocMeter:
+    """
+    name: label used when printing
+    report_frames: print every this many frames, 0 to never print
+    """
+
+    def __init__(self, name, report_frames=60):
+        self.name = name
+        self.report_frames = report_frames
+
+        self._frame_bytes = 0
+        self._frame_calls = 0
+        self._window_bytes = 0
+        self._window_frames = 0
+
+        # Statistics
+        self.frames = 0
+        self.calls = 0
+        self.last_frame_bytes = 0
+        self.max_frame_bytes = 0
+        self.total_bytes = 0
+
+    def wrap(self, cb):
+        def measured(e):
+            enabled = gc.isenabled()
+            gc.disable()
+            before = gc.mem_alloc()
+            try:
+                return cb(e)
+            finally:
+                self._frame_bytes += gc.mem_alloc() - before
+                self._frame_calls += 1
+                if enabled:
+                    gc.enable()
+        return measured
+
+    def frame_end_cb(self, e):
+        self.frame_end()
+
+    def frame_end(self):
+        """Call when a frame has finished drawing"""
+        if self._frame_calls == 0:
+            return
+        nbytes = self._frame_bytes
+        self.frames += 1
+        self.calls += self._frame_calls
+        self.last_frame_bytes = nbytes
+        self.total_bytes += nbytes
+        if nbytes > self.max_frame_bytes:
+            self.max_frame_bytes = nbytes
+        self._window_bytes += nbytes
+        self._window_frames += 1
+        self._frame_bytes = 0
+        self._frame_calls = 0
+
+        if self.report_frames and self._window_frames >= self.report_frames:
+            print("{}: {} B/frame avg, {} B max, {} calls".format(
+                self.name, self._window_bytes // self._window_frames,
+                self.max_frame_bytes, self.calls))
+            self._window_bytes = 0
+            self._window_frames = 0
+
+    def get_stats(self):
+        return {
+            'frames': self.frames,
+            'calls': self.calls,
+            'last_frame_bytes': self.last_frame_bytes,
+            'max_frame_bytes': self.max_frame_bytes,
+            'avg_frame_bytes': self.total_bytes // self.frames if self.frames else 0,
+        }
@@ -0,0 +1,77 @@
+# chart_batch.py - batch chart writes and refresh once at the end
+#
+# set_value_by_id / set_series_value_by_id2 refresh the chart on every call,
+# so writing N points one by one invalidates it N times. ChartBatch binds
+# external arrays it owns to the series (set_ext_x_array / set_ext_y_array);
+# writing to them triggers no refresh at all. Write freely between begin()
+# and commit(); the outermost commit() calls chart.refresh() once.
+#
+# Copy this file to the device's /lib next to display_driver.py, then:
+#     batch = ChartBatch(chart)
+#     xs, ys = batch.arrays(series, scatter=True)
+#     with batch:
+#         for i in range(n):
+#             xs[i] = ...
+#             ys[i] = ...
+
+from array import array
+
+
+class ChartBatch:
+    """
+    chart: lv.chart
+    coord: type of the external arrays; 'i' (int32) on LVGL v9, 'h' for v8's lv_coord_t
+    """
+
+    def __init__(self, chart, coord='i'):
+        self.chart = chart
+        self.coord = coord
+        self._arrays = []   # keep the external arrays alive
+        self._depth = 0
+
+        # Statistics
+        self.commits = 0
+        self.refreshes = 0
+
+    def arrays(self, series, scatter=False):
+        """
+        Allocate external arrays (current point count long), bind them to
+        the series and return (xs, ys); xs is None unless scatter is set.
+        Call again after the point count changes.
+        """
+        count = self.chart.get_point_count()
+        ys = array(self.coord, [0]) * count
+        self.chart.set_ext_y_array(series, ys)
+        xs = None
+        if scatter:
+            xs = array(self.coord, [0]) * count
+            self.chart.set_ext_x_array(series, xs)
+        self._arrays.append((xs, ys))
+        return xs, ys
+
+    def begin(self):
+        self._depth += 1
+        return self
+
+    def commit(self):
+        """End one begin(); the outermost commit refreshes the chart once"""
+        self.commits += 1
+        if self._depth > 0:
+            self._depth -= 1
+        if self._depth == 0:
+            self.refreshes += 1
+            self.chart.refresh()
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.commit()
+        return False
+
+    def get_stats(self):
+        return {
+            'commits': self.commits,
+            'refreshes': self.refreshes,
+            'depth': self._depth,
+        }
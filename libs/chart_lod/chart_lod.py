@@ -0,0 +1,181 @@
+# chart_lod.py - min/max level of detail for large line charts
+#
+# lv_example_chart_5 used to hand all ~1000 samples to the chart and zoom
+# with set_zoom_x, so every frame walked the whole series whatever the zoom.
+# Here a min/max pyramid is built once (each level merges `factor` adjacent
+# entries) and, for the current zoom and scroll position, the matching level
+# is decimated into the chart's external array for the visible range only.
+# The work per redraw scales with the chart's point count, not the series
+# length, so a 100k-sample recording still zooms and pans smoothly.
+#
+# Copy this file to the device's /lib next to display_driver.py, then:
+#     lod = ChartLOD(samples, points=200)
+#     lod.bind(chart, series)
+#     lod.set_zoom(512)              # same scale as set_zoom_x, 256 = 1x
+#     lod.pan(-dx, chart_width)      # pan by the dragged pixels
+
+from array import array
+
+
+class MinMaxPyramid:
+    """
+    samples: raw samples (array, or a list which is converted to an array)
+    factor: merge factor between adjacent levels
+    typecode: array type of every level; must hold the sample values
+    """
+
+    def __init__(self, samples, factor=4, typecode='h'):
+        if not isinstance(samples, array):
+            samples = array(typecode, samples)
+        self.samples = samples
+        self.factor = factor
+        self.n = len(samples)
+        self._itemsize = len(bytes(array(typecode, [0])))
+
+        # levels[k] = (bucket size, mins, maxs); level 0 is the raw samples
+        raw = memoryview(samples)
+        self.levels = [(1, raw, raw)]
+        bucket = 1
+        prev_min = prev_max = raw
+        while len(prev_min) > factor:
+            count = (len(prev_min) + factor - 1) // factor
+            mins = array(typecode, [0]) * count
+            maxs = array(typecode, [0]) * count
+            last = len(prev_min)
+            for j in range(count):
+                lo = j * factor
+                hi = lo + factor if lo + factor < last else last
+                mins[j] = min(prev_min[lo:hi])
+                maxs[j] = max(prev_max[lo:hi])
+            bucket *= factor
+            prev_min = memoryview(mins)
+            prev_max = memoryview(maxs)
+            self.levels.append((bucket, prev_min, prev_max))
+
+    def level_for(self, samples_per_bucket):
+        """Highest level whose bucket size does not exceed samples_per_bucket"""
+        k = 0
+        while k + 1 < len(self.levels) and self.levels[k + 1][0] <= samples_per_bucket:
+            k += 1
+        return k
+
+    def nbytes(self):
+        """Bytes used by all levels except the raw samples"""
+        return sum(len(mins) * self._itemsize * 2 for _, mins, _ in self.levels[1:])
+
+
+class ChartLOD:
+    """
+    samples: raw samples
+    points: chart point count (even; each bucket yields a min and a max point)
+    factor: pyramid merge factor per level
+    coord: type of the chart's external array; 'i' (int32) on LVGL v9, 'h' for v8's lv_coord_t
+    """
+
+    def __init__(self, samples, points=200, factor=4, coord='i', typecode='h'):
+        self.pyramid = MinMaxPyramid(samples, factor, typecode)
+        self.points = points & ~1
+        self._out = array(coord, [0]) * self.points
+        self._chart = None
+        self.zoom = 256
+        self.start = 0
+
+        # Statistics: entries read by the last update and the level used
+        self.visited = 0
+        self.level = 0
+        self.updates = 0
+
+    def bind(self, chart, series):
+        self._chart = chart
+        chart.set_point_count(self.points)
+        chart.set_ext_y_array(series, self._out)
+        self.update()
+
+    def span(self):
+        """Number of samples currently visible"""
+        n = self.pyramid.n
+        span = n * 256 // self.zoom
+        return span if span > 1 else 1
+
+    def _clamp(self):
+        limit = self.pyramid.n - self.span()
+        if self.start > limit:
+            self.start = limit
+        if self.start < 0:
+            self.start = 0
+
+    def set_zoom(self, zoom):
+        """Zoom around the visible centre; same scale as set_zoom_x (256 = all samples fit)"""
+        if zoom < 256:
+            zoom = 256
+        centre = self.start + self.span() // 2
+        self.zoom = zoom
+        self.start = centre - self.span() // 2
+        self._clamp()
+        self.update()
+
+    def scroll_to(self, start):
+        self.start = start
+        self._clamp()
+        self.update()
+
+    def pan(self, dx, width):
+        """Pan right by dx pixels of a chart content area width pixels wide"""
+        step = dx * self.span() // width
+        if step:
+            self.scroll_to(self.start + step)
+
+    def update(self):
+        out = self._out
+        points = self.points
+        start = self.start
+        span = self.span()
+        samples = self.pyramid.samples
+
+        if span <= points:
+            # Zoomed in past one sample per point: take the nearest sample
+            for i in range(points):
+                out[i] = samples[start + i * span // points]
+            self.visited = points
+            self.level = 0
+        else:
+            pairs = points // 2
+            k = self.pyramid.level_for(span // pairs)
+            bucket, mins, maxs = self.pyramid.levels[k]
+            visited = 0
+            prev = samples[start]
+            for j in range(pairs):
+                lo = (start + j * span // pairs) // bucket
+                hi = (start + (j + 1) * span // pairs - 1) // bucket + 1
+                vmin = min(mins[lo:hi])
+                vmax = max(maxs[lo:hi])
+                visited += hi - lo
+                # Emit the end closer to the previous point first so the line does not cross back
+                o = j * 2
+                if prev - vmin <= vmax - prev:
+                    out[o] = vmin
+                    out[o + 1] = vmax
+                    prev = vmax
+                else:
+                    out[o] = vmax
+                    out[o + 1] = vmin
+                    prev = vmin
+            self.visited = visited
+            self.level = k
+
+        self.updates += 1
+        if self._chart is not None:
+            self._chart.refresh()
+
+    def values(self):
+        return self._out
+
+    def get_stats(self):
+        return {
+            'samples': self.pyramid.n,
+            'levels': len(self.pyramid.levels),
+            'pyramid_bytes': self.pyramid.nbytes(),
+            'level': self.level,
+            'visited': self.visited,
+            'updates': self.updates,
+        }
@@ -0,0 +1,105 @@
+# circular_series.py - chart series written in a circle with O(1) appends
+#
+# Used by lv_example_chart_9 (circular line chart with a gap) and
+# lv_example_chart_7 (rolling scatter chart). x/y live in arrays bound to the
+# series with set_ext_x_array / set_ext_y_array, so appending a point writes
+# one slot instead of shifting Python lists. The `gap` points after the write
+# position are set to the empty value to form the gap, and a line chart only
+# invalidates the columns that changed.
+#
+# Copy this file to the device's /lib next to display_driver.py, then:
+#     circ = CircularSeries(30, gap=2)
+#     circ.bind(chart, series)
+#     circ.append(y)
+
+from array import array
+
+POINT_NONE = 0x7FFFFFFF  # LV_CHART_POINT_NONE (LVGL v9, int32)
+
+
+class CircularSeries:
+    """
+    count: number of points
+    gap: points left empty after the write position (0 for no gap)
+    scatter: also keep an x array (scatter charts)
+    coord: array type; 'i' (int32) on LVGL v9, 'h' for v8's lv_coord_t
+    none: value of an empty point (lv.CHART_POINT.NONE differs between v8 and v9)
+    margin: extra pixels invalidated on each side of the changed columns (markers, line width)
+    """
+
+    def __init__(self, count, gap=2, scatter=False, coord='i', none=POINT_NONE, margin=6):
+        self.count = count
+        self.gap = gap if gap < count else count - 1
+        self.none = none
+        self.margin = margin
+        self.ys = array(coord, [none]) * count
+        self.xs = array(coord, [0]) * count if scatter else None
+        self.head = 0   # next write position, which is also the oldest point
+        self._chart = None
+        self._area = None
+
+        # Statistics
+        self.appends = 0
+        self.invalidations = 0
+
+    def bind(self, chart, series):
+        """Set the point count and bind the external arrays; rebind after recreating the chart"""
+        import lvgl as lv
+
+        self._chart = chart
+        self._area = lv.area_t()
+        chart.set_point_count(self.count)
+        chart.set_ext_y_array(series, self.ys)
+        if self.xs is not None:
+            chart.set_ext_x_array(series, self.xs)
+        chart.refresh()
+
+    def append(self, y, x=0):
+        """Write one point and return its index in the arrays"""
+        pos = self.head
+        count = self.count
+        self.ys[pos] = y
+        if self.xs is not None:
+            self.xs[pos] = x
+        for k in range(1, self.gap + 1):
+            i = pos + k
+            self.ys[i - count if i >= count else i] = self.none
+        self.head = pos + 1 if pos + 1 < count else 0
+        self.appends += 1
+        self._invalidate(pos)
+        return pos
+
+    def age(self, index):
+        """Age of the point at index: 0 is the oldest, count - 1 the newest"""
+        return (index - self.head) % self.count
+
+    def _invalidate(self, pos):
+        chart = self._chart
+        if chart is None:
+            return
+        self.invalidations += 1
+        count = self.count
+        if self.xs is not None or count < 2:
+            # Scatter points are placed by x, not in fixed columns
+            chart.invalidate()
+            return
+
+        lo = pos - 1 if pos > 0 else 0
+        hi = pos + self.gap + 1
+        if hi > count - 1:
+            # The gap wrapped around: its tail is at the left edge
+            self._invalidate_columns(0, hi - count)
+            hi = count - 1
+        self._invalidate_columns(lo, hi)
+
+    def _invalidate_columns(self, lo, hi):
+        # Point i of a line chart sits at content.x1 + i * width / (count - 1)
+        chart = self._chart
+        count = self.count
+        area = self._area
+        chart.get_content_coords(area)
+        x1 = area.x1
+        w = area.x2 - area.x1
+        area.x1 = x1 + w * lo // (count - 1) - self.margin
+        area.x2 = x1 + w * hi // (count - 1) + self.margin
+        chart.invalidate_area(area)
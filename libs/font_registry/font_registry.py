@@ -0,0 +1,205 @@
+# font_registry.py - fonts shared by logical name
+#
+# The examples and the smartwatch app each used to register the S: drive and
+# call lv.binfont_create behind their own try/except ladders, so the same font
+# could be loaded several times. Logical names such as "cn-16" or
+# "montserrat-22" map to files under assets/font/:
+#   - Montserrat sizes compiled into the firmware use lv.font_montserrat_N
+#   - other fonts are loaded on first use and shared afterwards
+#   - owners record which screens use a font; unload_unused() frees fonts no
+#     live screen uses any more
+# Load time and heap delta are recorded per font (see get_stats()).
+#
+# Copy this file to the device's /lib next to display_driver.py, then:
+#     import font_registry
+#     font = font_registry.get("montserrat-22")
+
+import gc
+import time
+import lvgl as lv
+
+FONT_DIR = "assets/font"
+
+# logical name -> file name relative to FONT_DIR; montserrat-N maps by size
+_FILES = {
+    "cn-16": "lv_font_simsun_16_cjk.fnt",
+    "cn-20": "font-PHT-cn-20.fnt",
+    "en-20": "font-PHT-en-20.fnt",
+    "jp-20": "font-PHT-jp-20.fnt",
+}
+
+_fs_drv = None
+
+
+def ensure_fs(letter="S"):
+    """Register the file system driver once if it is not registered yet"""
+    global _fs_drv
+    if _fs_drv is not None or (hasattr(lv, "fs_is_ready") and lv.fs_is_ready(letter)):
+        return
+    import fs_driver
+    _fs_drv = lv.fs_drv_t()
+    fs_driver.fs_register(_fs_drv, letter)
+
+
+def _load_file(path):
+    if hasattr(lv, "binfont_create"):
+        return lv.binfont_create(path)
+    return lv.font_load(path)  # LVGL v8
+
+
+def _free_font(font):
+    if hasattr(lv, "binfont_destroy"):
+        lv.binfont_destroy(font)
+    else:
+        lv.font_free(font)
+
+
+class _Font:
+    def __init__(self, name, paths):
+        self.name = name
+        self.paths = paths
+        self.font = None
+        self.builtin = False
+        self.path = None
+        self.owners = []
+        self.pinned = False
+
+        # Statistics
+        self.loads = 0
+        self.load_ms = 0
+        self.bytes = 0
+
+
+class FontRegistry:
+    """
+    font_dir: directory logical names resolve to (without drive letter)
+    drive: LVGL file system drive letter
+    """
+
+    def __init__(self, font_dir=FONT_DIR, drive="S"):
+        self.font_dir = font_dir
+        self.drive = drive
+        self._fonts = {}
+
+    def register(self, name, paths):
+        """
+        Register or replace a logical name. paths is one path or a list in
+        order of preference; the first file that loads is used.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        entry = self._fonts.get(name)
+        if entry is not None and entry.font is not None and not entry.builtin:
+            _free_font(entry.font)
+        self._fonts[name] = _Font(name, paths)
+
+    def _entry(self, name):
+        entry = self._fonts.get(name)
+        if entry is not None:
+            return entry
+        if name in _FILES:
+            paths = [self.font_dir + "/" + _FILES[name]]
+        elif name.startswith("montserrat-"):
+            paths = [self.font_dir + "/" + name + ".fnt"]
+        else:
+            raise KeyError("unknown font: " + name)
+        entry = _Font(name, paths)
+        self._fonts[name] = entry
+        return entry
+
+    def _load(self, entry):
+        # Sizes compiled into the firmware need no loading
+        if entry.name.startswith("montserrat-"):
+            builtin = getattr(lv, "font_" + entry.name.replace("-", "_"), None)
+            if builtin is not None:
+                entry.font = builtin
+                entry.builtin = True
+                return
+
+        ensure_fs(self.drive)
+        for path in entry.paths:
+            start = time.ticks_ms()
+            mem_before = gc.mem_free()
+            try:
+                font = _load_file(self.drive + ":" + path)
+            except Exception:
+                font = None
+            if font is None:
+                continue
+            entry.font = font
+            entry.path = path
+            entry.loads += 1
+            entry.load_ms = time.ticks_diff(time.ticks_ms(), start)
+            entry.bytes = mem_before - gc.mem_free()
+            return
+        raise OSError("font {} not found: {}".format(entry.name, entry.paths))
+
+    def get(self, name, owner=None, default=None):
+        """
+        Return the font, loading it on first use. owner is the screen using
+        it; without an owner the font stays loaded. If no candidate file
+        loads, return default, or raise OSError when default is None.
+        """
+        entry = self._entry(name)
+        if entry.font is None:
+            try:
+                self._load(entry)
+            except OSError:
+                if default is None:
+                    raise
+                print("Warning: font {} not found".format(name))
+                return default
+        if owner is None:
+            entry.pinned = True
+        elif owner not in entry.owners:
+            entry.owners.append(owner)
+        return entry.font
+
+    def unload_unused(self):
+        """Free loaded fonts no live screen uses; a cleaned screen counts as unused"""
+        freed = 0
+        for entry in self._fonts.values():
+            if entry.font is None or entry.builtin or entry.pinned:
+                continue
+            entry.owners = [s for s in entry.owners if s.is_valid() and s.get_child_count() > 0]
+            if entry.owners:
+                continue
+            _free_font(entry.font)
+            entry.font = None
+            freed += entry.bytes
+        return freed
+
+    def get_stats(self):
+        stats = {}
+        for name, entry in self._fonts.items():
+            stats[name] = {
+                'loaded': entry.font is not None,
+                'builtin': entry.builtin,
+                'path': entry.path,
+                'loads': entry.loads,
+                'load_ms': entry.load_ms,
+                'bytes': entry.bytes,
+                'owners': len(entry.owners),
+            }
+        return stats
+
+
+# Default registry shared by the examples
+registry = FontRegistry()
+
+
+def get(name, owner=None, default=None):
+    return registry.get(name, owner, default)
+
+
+def register(name, paths):
+    registry.register(name, paths)
+
+
+def set_font_dir(path):
+    """Point at the repo's assets/font when an example runs from its own directory"""
+    registry.font_dir = path
+
+
+def unload_unused():
+    return registry.unload_unused()
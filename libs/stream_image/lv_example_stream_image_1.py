@@ -0,0 +1,17 @@
+#!/opt/bin/lv_micropython -i
+import sys
+import lvgl as lv
+import display_driver
+from stream_image import load, CF_ARGB8888
+
+# Decode the PNG row by row into a pixel buffer instead of
+# reading the whole compressed file into RAM first
+try:
+    wink_dsc, wink_buf = load('../png/wink.png', CF_ARGB8888)
+except OSError:
+    print("Could not find wink.png")
+    sys.exit()
+
+img = lv.image(lv.screen_active())
+img.set_src(wink_dsc)
+img.center()
@@ -0,0 +1,358 @@
+# stream_image.py - row-by-row PNG/BMP decoder
+#
+# The usual pattern
+#     png_data = open('wink.png', 'rb').read()
+#     lv.image_dsc_t({'data_size': len(png_data), 'data': png_data})
+# keeps the whole compressed file in RAM while LVGL decodes it into a second,
+# full-size buffer. StreamImage instead reads the file through a small scratch
+# window (two PNG scanlines or one BMP row plus a fixed read buffer) and writes
+# each row straight into the destination pixel buffer.
+#
+# Supported: 8-bit non-interlaced PNG (grey, grey+alpha, RGB, RGBA, palette)
+# and uncompressed / bitfield 16, 24 and 32-bit BMP.
+# Runs on MicroPython (deflate.DeflateIO or zlib.DecompIO) and on CPython
+# (zlib.decompressobj) so the same code can be benchmarked on a host.
+
+import struct
+
+try:
+    import deflate
+except ImportError:
+    deflate = None
+import zlib
+
+try:
+    import io
+    _IOBase = io.IOBase
+except (ImportError, AttributeError):
+    _IOBase = object
+
+CF_RGB565 = 0x12
+CF_RGB565A8 = 0x14
+CF_ARGB8888 = 0x10
+
+_BPP = {CF_RGB565: 2, CF_RGB565A8: 3, CF_ARGB8888: 4}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_READ_CHUNK = 512
+
+
+def buffer_size(width, height, cf):
+    """Bytes needed for a destination buffer in colour format cf"""
+    return width * height * _BPP[cf]
+
+
+class _IdatStream(_IOBase):
+    """Presents the payload of consecutive IDAT chunks as one byte stream"""
+
+    def __init__(self, f, first_len):
+        self._f = f
+        self._left = first_len
+        self._eof = False
+
+    def readinto(self, buf):
+        while self._left == 0:
+            if self._eof:
+                return 0
+            self._f.read(4)  # CRC
+            head = self._f.read(8)
+            if len(head) < 8 or head[4:] != b"IDAT":
+                self._eof = True
+                return 0
+            self._left = struct.unpack(">I", head[:4])[0]
+        n = len(buf) if len(buf) < self._left else self._left
+        got = self._f.readinto(memoryview(buf)[:n])
+        if not got:
+            self._eof = True
+            return 0
+        self._left -= got
+        return got
+
+    def read(self, n):
+        buf = bytearray(n)
+        got = self.readinto(buf)
+        return bytes(buf[:got])
+
+
+class _Inflater:
+    """Pulls exactly n decompressed bytes at a time"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        if deflate is not None:
+            self._io = deflate.DeflateIO(stream, deflate.ZLIB)
+            self._obj = None
+        elif hasattr(zlib, "DecompIO"):
+            self._io = zlib.DecompIO(stream)
+            self._obj = None
+        else:
+            self._io = None
+            self._obj = zlib.decompressobj()
+            self._pending = b""
+
+    def readinto(self, buf):
+        """Fill buf completely; returns the number of bytes written"""
+        n = len(buf)
+        pos = 0
+        if self._io is not None:
+            mv = memoryview(buf)
+            while pos < n:
+                got = self._io.readinto(mv[pos:])
+                if not got:
+                    break
+                pos += got
+            return pos
+
+        while pos < n:
+            if self._pending:
+                data = self._obj.decompress(self._pending, n - pos)
+                self._pending = self._obj.unconsumed_tail
+            else:
+                raw = self._stream.read(_READ_CHUNK)
+                if not raw:
+                    break
+                data = self._obj.decompress(raw, n - pos)
+                self._pending = self._obj.unconsumed_tail
+            buf[pos:pos + len(data)] = data
+            pos += len(data)
+        return pos
+
+
+class StreamImage:
+    """
+    Usage:
+        img = StreamImage("wink.png")
+        buf = bytearray(buffer_size(img.width, img.height, CF_ARGB8888))
+        img.decode_into(buf, CF_ARGB8888)
+        img.close()
+    """
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self.peak_scratch = 0
+        magic = self._f.read(8)
+        if magic == _PNG_SIGNATURE:
+            self._open_png()
+        elif magic[:2] == b"BM":
+            self._open_bmp(magic)
+        else:
+            self._f.close()
+            raise ValueError("unknown image format: " + path)
+
+    def close(self):
+        self._f.close()
+
+    # ===== PNG =====
+
+    def _open_png(self):
+        self.kind = "png"
+        self._palette = None
+        self._trns = None
+        while True:
+            head = self._f.read(8)
+            if len(head) < 8:
+                raise ValueError("PNG without IDAT")
+            length = struct.unpack(">I", head[:4])[0]
+            tag = head[4:]
+            if tag == b"IDAT":
+                self._idat_len = length
+                break
+            body = self._f.read(length)
+            self._f.read(4)  # CRC
+            if tag == b"IHDR":
+                self.width, self.height, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", body)
+                if depth != 8 or interlace != 0 or ctype not in _PNG_CHANNELS:
+                    raise ValueError("only 8-bit non-interlaced PNG is supported")
+                self._ctype = ctype
+            elif tag == b"PLTE":
+                self._palette = body
+            elif tag == b"tRNS":
+                self._trns = body
+
+    def _decode_png(self, emit):
+        bpp = _PNG_CHANNELS[self._ctype]
+        stride = self.width * bpp
+        # Scratch: filter byte + current line, previous line
+        line = bytearray(stride + 1)
+        prev = bytearray(stride + 1)
+        self.peak_scratch = 2 * (stride + 1) + _READ_CHUNK
+        inflater = _Inflater(_IdatStream(self._f, self._idat_len))
+
+        for y in range(self.height):
+            if inflater.readinto(line) != stride + 1:
+                raise ValueError("truncated PNG data")
+            ftype = line[0]
+            # Index 0 of both buffers is the filter byte; pixels start at 1
+            if ftype == 1:
+                for i in range(1 + bpp, stride + 1):
+                    line[i] = (line[i] + line[i - bpp]) & 0xFF
+            elif ftype == 2:
+                for i in range(1, stride + 1):
+                    line[i] = (line[i] + prev[i]) & 0xFF
+            elif ftype == 3:
+                for i in range(1, stride + 1):
+                    left = line[i - bpp] if i > bpp else 0
+                    line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+            elif ftype == 4:
+                for i in range(1, stride + 1):
+                    a = line[i - bpp] if i > bpp else 0
+                    b = prev[i]
+                    c = prev[i - bpp] if i > bpp else 0
+                    p = a + b - c
+                    pa = p - a if p > a else a - p
+                    pb = p - b if p > b else b - p
+                    pc = p - c if p > c else c - p
+                    if pa <= pb and pa <= pc:
+                        line[i] = (line[i] + a) & 0xFF
+                    elif pb <= pc:
+                        line[i] = (line[i] + b) & 0xFF
+                    else:
+                        line[i] = (line[i] + c) & 0xFF
+            elif ftype != 0:
+                raise ValueError("bad PNG filter type")
+            emit(y, line, 1)
+            line, prev = prev, line
+
+    def _png_pixel(self, line, pos, x):
+        ctype = self._ctype
+        if ctype == 6:
+            i = pos + x * 4
+            return line[i], line[i + 1], line[i + 2], line[i + 3]
+        if ctype == 2:
+            i = pos + x * 3
+            return line[i], line[i + 1], line[i + 2], 255
+        if ctype == 3:
+            idx = line[pos + x]
+            pal = self._palette
+            trns = self._trns
+            a = trns[idx] if trns is not None and idx < len(trns) else 255
+            return pal[idx * 3], pal[idx * 3 + 1], pal[idx * 3 + 2], a
+        if ctype == 4:
+            i = pos + x * 2
+            v = line[i]
+            return v, v, v, line[i + 1]
+        v = line[pos + x]
+        return v, v, v, 255
+
+    # ===== BMP =====
+
+    def _open_bmp(self, magic):
+        self.kind = "bmp"
+        rest = self._f.read(62)
+        head = magic + rest
+        self._offset = struct.unpack("<I", head[10:14])[0]
+        header_size, width, height, _, bpp, compression = struct.unpack("<IiiHHI", head[14:34])
+        if bpp not in (16, 24, 32):
+            raise ValueError("only 16/24/32-bit BMP is supported")
+        if compression in (3, 6):
+            masks = struct.unpack("<III", head[54:66])
+            alpha = struct.unpack("<I", head[66:70])[0] if header_size >= 56 else 0
+        elif compression == 0:
+            masks = (0x7C00, 0x03E0, 0x001F) if bpp == 16 else (0xFF0000, 0x00FF00, 0x0000FF)
+            alpha = 0
+        else:
+            raise ValueError("compressed BMP is not supported")
+
+        self.width = width
+        self.height = -height if height < 0 else height
+        self._top_down = height < 0
+        self._bpp = bpp
+        self._fields = []
+        for m in masks + (alpha,):
+            shift = 0
+            if m:
+                while not (m >> shift) & 1:
+                    shift += 1
+            self._fields.append((shift, m >> shift))
+
+    def _decode_bmp(self, emit):
+        stride = (self.width * self._bpp + 31) // 32 * 4
+        row = bytearray(stride)
+        self.peak_scratch = stride
+        for y in range(self.height):
+            src_y = y if self._top_down else self.height - 1 - y
+            self._f.seek(self._offset + src_y * stride)
+            if self._f.readinto(row) != stride:
+                raise ValueError("truncated BMP data")
+            emit(y, row, 0)
+
+    def _bmp_pixel(self, row, pos, x):
+        step = self._bpp // 8
+        i = pos + x * step
+        if step == 3:
+            return row[i + 2], row[i + 1], row[i], 255
+        if step == 2:
+            value = row[i] | row[i + 1] << 8
+        else:
+            value = row[i] | row[i + 1] << 8 | row[i + 2] << 16 | row[i + 3] << 24
+        out = []
+        for shift, maxval in self._fields:
+            out.append((value >> shift & maxval) * 255 // maxval if maxval else 255)
+        return out[0], out[1], out[2], out[3]
+
+    # ===== Output =====
+
+    def decode_into(self, dest, cf=CF_ARGB8888):
+        """
+        Decode the whole image into dest (bytearray or writable memoryview of at
+        least buffer_size(width, height, cf) bytes), one row at a time.
+        """
+        w = self.width
+        h = self.height
+        if len(dest) < buffer_size(w, h, cf):
+            raise ValueError("destination buffer too small")
+        pixel = self._png_pixel if self.kind == "png" else self._bmp_pixel
+
+        def emit(y, src, pos):
+            if cf == CF_ARGB8888:
+                d = y * w * 4
+                for x in range(w):
+                    r, g, b, a = pixel(src, pos, x)
+                    dest[d] = b
+                    dest[d + 1] = g
+                    dest[d + 2] = r
+                    dest[d + 3] = a
+                    d += 4
+            else:
+                d = y * w * 2
+                alpha = w * h * 2 + y * w
+                for x in range(w):
+                    r, g, b, a = pixel(src, pos, x)
+                    c = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+                    dest[d] = c & 0xFF
+                    dest[d + 1] = c >> 8
+                    d += 2
+                    if cf == CF_RGB565A8:
+                        dest[alpha + x] = a
+
+        if self.kind == "png":
+            self._decode_png(emit)
+        else:
+            self._decode_bmp(emit)
+
+
+def load(path, cf=CF_ARGB8888):
+    """
+    Decode path into a new buffer and return (lv.image_dsc_t, buffer).
+    Keep the buffer referenced for as long as the image is displayed.
+    """
+    import lvgl as lv
+
+    img = StreamImage(path)
+    try:
+        buf = bytearray(buffer_size(img.width, img.height, cf))
+        img.decode_into(buf, cf)
+    finally:
+        img.close()
+    dsc = lv.image_dsc_t({
+        'header': {
+            'magic': lv.IMAGE_HEADER_MAGIC,
+            'cf': cf,
+            'w': img.width,
+            'h': img.height,
+            'stride': img.width * (4 if cf == CF_ARGB8888 else 2),
+        },
+        'data_size': len(buf),
+        'data': buf,
+    })
+    return dsc, buf
@@ -0,0 +1,229 @@
+# chart_source.py - 环形缓冲的图表数据源
+#
+# 原来心率页每秒用 set_next_value 推一个随机值，真实的 PPG/ECG 传感器每秒
+# 会给出 100~500 个样本，逐点 set_next_value 每个样本都会让图表失效重绘。
+# 这里把样本成块写入预分配的 array('h') 环形缓冲，刷新时把最近一个窗口
+# 的样本按桶抽取成图表的点数：每个桶输出最小值和最大值 (按出现顺序)，
+# 尖峰不会被平均掉。图表通过 set_ext_y_array 直接读取输出数组，
+# 每次刷新只调用一次 chart.refresh()，并限制两次刷新的最小间隔 (一帧)。
+#
+# 用法：
+#     ecg = RingChartSource(capacity=500, points=60)
+#     ecg.bind(chart, series)        # 图表点数需与 points 一致
+#     ecg.push(block)                # 传感器数据块 (array('h'))
+#     ecg.flush()                    # 每帧调用，有新数据时才刷新
+
+import math
+import time
+from array import array
+
+try:
+    _ticks_ms = time.ticks_ms
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError:
+    # 主机上运行 tools/bench_chart_source.py 时使用
+    def _ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def _ticks_us():
+        return int(time.monotonic() * 1000000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+POINT_NONE = 0x7FFFFFFF  # LV_CHART_POINT_NONE (LVGL v9, int32)
+
+
+class RingChartSource:
+    """
+    capacity: 环形缓冲区样本数
+    points: 图表点数 (chart.set_point_count 的值)
+    window: 图表显示的最近样本数，默认等于 capacity
+    min_interval_ms: 两次刷新图表的最小间隔，默认约一帧
+    """
+
+    def __init__(self, capacity=512, points=60, window=None, min_interval_ms=33):
+        self.capacity = capacity
+        self.points = points
+        self.window = capacity if window is None else min(window, capacity)
+        self.min_interval_ms = min_interval_ms
+
+        self._ring = array('h', [0]) * capacity
+        self._head = 0      # 下一个写入位置
+        self._count = 0     # 已有样本数 (不超过 capacity)
+        self._out = array('i', [POINT_NONE]) * points
+        self._chart = None
+        self._dirty = False
+        self._last_flush = None
+
+        # 统计信息
+        self.samples = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flush_us = 0
+
+    def bind(self, chart, series):
+        """把输出数组挂到图表序列上；图表重建后需要重新绑定"""
+        self._chart = chart
+        chart.set_ext_y_array(series, self._out)
+        self._dirty = True
+
+    def unbind(self):
+        self._chart = None
+
+    def push(self, block, n=None):
+        """写入一块样本；只更新缓冲区，不触碰图表"""
+        if n is None:
+            n = len(block)
+        if n <= 0:
+            return
+        if not isinstance(block, array):
+            block = array('h', block)
+        ring = self._ring
+        cap = self.capacity
+        self.samples += n
+
+        if n >= cap:
+            # 一次送来的样本超过缓冲区，只保留最新的 cap 个
+            ring[0:cap] = block[n - cap:n]
+            self.dropped += n - cap
+            self._head = 0
+            self._count = cap
+        else:
+            h = self._head
+            first = cap - h
+            if first >= n:
+                ring[h:h + n] = block[0:n] if n < len(block) else block
+            else:
+                ring[h:cap] = block[0:first]
+                ring[0:n - first] = block[first:n]
+            self._head = (h + n) % cap
+            if self._count + n < cap:
+                self._count += n
+            else:
+                self.dropped += self._count + n - cap
+                self._count = cap
+        self._dirty = True
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+        self._dirty = True
+
+    def _decimate(self):
+        ring = self._ring
+        out = self._out
+        cap = self.capacity
+        win = self.window
+        n = self._count if self._count < win else win
+        missing = win - n                   # 窗口开头还没有数据的样本数
+        start = (self._head - n) % cap      # 窗口内最旧样本的位置
+        buckets = self.points // 2
+
+        for b in range(buckets):
+            lo = b * win // buckets - missing
+            hi = (b + 1) * win // buckets - missing
+            o = b * 2
+            if hi <= 0:
+                out[o] = POINT_NONE
+                out[o + 1] = POINT_NONE
+                continue
+            if lo < 0:
+                lo = 0
+            i = start + lo
+            if i >= cap:
+                i -= cap
+            vmin = vmax = ring[i]
+            imin = imax = 0
+            for k in range(1, hi - lo):
+                i += 1
+                if i == cap:
+                    i = 0
+                v = ring[i]
+                if v < vmin:
+                    vmin = v
+                    imin = k
+                elif v > vmax:
+                    vmax = v
+                    imax = k
+            # 按出现先后写入，保持波形方向
+            if imin <= imax:
+                out[o] = vmin
+                out[o + 1] = vmax
+            else:
+                out[o] = vmax
+                out[o + 1] = vmin
+
+        if self.points & 1:
+            out[self.points - 1] = ring[(self._head - 1) % cap] if n else POINT_NONE
+
+    def flush(self, force=False):
+        """有新数据且距上次刷新超过 min_interval_ms 时重新抽取并刷新图表，返回是否刷新"""
+        if not self._dirty:
+            return False
+        now = _ticks_ms()
+        if not force and self._last_flush is not None \
+                and _ticks_diff(now, self._last_flush) < self.min_interval_ms:
+            return False
+        start = _ticks_us()
+        self._decimate()
+        if self._chart is not None:
+            self._chart.refresh()
+        self.flush_us += _ticks_diff(_ticks_us(), start)
+        self.flushes += 1
+        self._last_flush = now
+        self._dirty = False
+        return True
+
+    def values(self):
+        """当前输出到图表的点 (array('i'))"""
+        return self._out
+
+    def get_stats(self):
+        return {
+            'samples': self.samples,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+            'flush_us': self.flush_us // self.flushes if self.flushes else 0,
+            'fill': self._count,
+        }
+
+
+class EcgSimulator:
+    """
+    替身传感器：按采样率输出类似 ECG 的周期波形 (0~100，与心率页的 Y 轴一致)。
+    一个心跳周期的波形在构造时算好，read() 只做查表复制。
+    """
+
+    def __init__(self, rate_hz=250, bpm=75, baseline=25):
+        self.rate_hz = rate_hz
+        period = rate_hz * 60 // bpm
+        beat = array('h', [0]) * period
+        # P 波、QRS 波群、T 波用高斯峰叠加近似 (位置, 宽度, 幅度)，位置和宽度为周期的比例
+        waves = ((0.16, 0.025, 6), (0.27, 0.008, -6), (0.30, 0.010, 60),
+                 (0.33, 0.008, -10), (0.55, 0.045, 12))
+        for i in range(period):
+            t = i / period
+            v = baseline
+            for pos, width, amp in waves:
+                d = (t - pos) / width
+                v += amp * math.exp(-0.5 * d * d)
+            beat[i] = int(v)
+        self._beat = beat
+        self._pos = 0
+
+    def read(self, block):
+        """用后续样本填满 block，返回样本数"""
+        beat = self._beat
+        period = len(beat)
+        pos = self._pos
+        n = len(block)
+        i = 0
+        while i < n:
+            k = period - pos if period - pos < n - i else n - i
+            block[i:i + k] = beat[pos:pos + k]
+            i += k
+            pos = (pos + k) % period
+        self._pos = pos
+        return n
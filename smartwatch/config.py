@@ -30,6 +30,10 @@ TIMEZONES = [
 ]
 DEFAULT_TZ_INDEX = 0
 
+# ===== 字体配置 =====
+# 界面字体子集之外的字从该完整字库按需读取 (lv_font_conv 生成的未压缩 binfont)
+FONT_CN_FALLBACK = "assets/font/lv_font_simsun_16_cjk.fnt"
+
 # ===== API 接口信息 =====
 # 如果有其它 API (如豆包、汇率等)，可以在此添加
 EXCHANGE_RATE_API = "https://api.exchangerate-api.com/v4/latest/USD"
@@ -57,7 +57,8 @@ class CST816S(pointer_framework.PointerDriver):
         reset_pin=None,
         touch_cal=None,
         startup_rotation=None,
-        debug=False
+        debug=False,
+        irq_pin=None
     ):
         # Buffer para lectura individual
         self._rx_buf = bytearray(1)
@@ -70,6 +71,21 @@ class CST816S(pointer_framework.PointerDriver):
         # Estado del controlador
         self._is_suspended = False
         self._last_gesture = GESTURE_NONE
+
+        # Contadores de transacciones I2C (para medir el tráfico del bus)
+        self.bus_reads = 0
+        self.bus_writes = 0
+
+        # Modo IRQ: el pin INT del chip marca "datos listos" y entre pulsos
+        # se devuelve la última muestra sin tocar el bus
+        self._data_ready = True
+        self._cached_coords = None
+        if irq_pin is not None:
+            if isinstance(irq_pin, int):
+                irq_pin = machine.Pin(irq_pin, machine.Pin.IN, machine.Pin.PULL_UP)
+            self._irq_pin = irq_pin
+        else:
+            self._irq_pin = None
         
         # Configurar pin de reset
         if reset_pin is not None:
@@ -91,6 +107,9 @@ class CST816S(pointer_framework.PointerDriver):
         # Reset e inicialización
         self._initialize_chip()
         
+        if self._irq_pin is not None:
+            self._irq_pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=self._irq_handler)
+
         # Inicializar clase base
         try:
             super().__init__(
@@ -147,8 +166,23 @@ class CST816S(pointer_framework.PointerDriver):
             
         return True
 
+    def _irq_handler(self, pin):
+        """Handler de interrupción: solo marca que hay datos nuevos"""
+        self._data_ready = True
+
+    @property
+    def irq_mode(self):
+        """True si la lectura está guiada por el pin INT"""
+        return self._irq_pin is not None
+
+    @property
+    def data_ready(self):
+        """True si llegó un pulso INT que aún no se ha leído (siempre False sin IRQ)"""
+        return self._irq_pin is not None and self._data_ready
+
     def _read_reg(self, reg):
         """Leer registro individual con manejo robusto de errores"""
+        self.bus_reads += 1
         try:
             self._device.writeto(I2C_ADDR, bytes([reg]), False)
             self._device.readfrom_into(I2C_ADDR, self._rx_buf)
@@ -160,6 +194,7 @@ class CST816S(pointer_framework.PointerDriver):
 
     def _write_reg(self, reg, value):
         """Escribir registro con manejo robusto de errores"""
+        self.bus_writes += 1
         try:
             self._device.writeto(I2C_ADDR, bytes([reg, value]))
             return True
@@ -172,6 +207,7 @@ class CST816S(pointer_framework.PointerDriver):
         """
         Lectura optimizada de datos de touch - Lee todos los registros necesarios en una operación
         """
+        self.bus_reads += 1
         try:
             # Leer registros 0x01 a 0x06 de una sola vez
             self._device.writeto(I2C_ADDR, bytes([_GestureID]), False)
@@ -197,16 +233,26 @@ class CST816S(pointer_framework.PointerDriver):
         """
         if self._is_suspended:
             return None
-        
+
+        # En modo IRQ, sin pulso nuevo el estado no ha cambiado
+        if self._irq_pin is not None:
+            if not self._data_ready:
+                return self._cached_coords
+            self._data_ready = False
+
         # Lectura optimizada de todos los datos
         data = self._read_touch_data()
         if data is None:
+            # Reintentar en la siguiente llamada en vez de quedarse con datos viejos
+            self._data_ready = True
+            self._cached_coords = None
             return None
             
         gesture, finger_num, xh, xl, yh, yl = data
         
         # Verificar si hay touch
         if finger_num == 0:
+            self._cached_coords = None
             return None
         
         # Procesar coordenadas
@@ -216,8 +262,14 @@ class CST816S(pointer_framework.PointerDriver):
         # Almacenar gesto para posible uso futuro
         if gesture != GESTURE_NONE:
             self._last_gesture = gesture
-        
-        return self.PRESSED, x, y
+
+        self._cached_coords = (self.PRESSED, x, y)
+        return self._cached_coords
+
+    def reset_bus_stats(self):
+        """Reiniciar contadores de transacciones I2C"""
+        self.bus_reads = 0
+        self.bus_writes = 0
 
     # === MÉTODOS DE CONTROL BÁSICOS ===
     
@@ -228,6 +280,8 @@ class CST816S(pointer_framework.PointerDriver):
     def resume(self):
         """Reanudar detección de touch"""
         self._is_suspended = False
+        # Puede haberse perdido el pulso de liberación mientras estaba suspendido
+        self._data_ready = True
 
     def hw_reset(self):
         """Reset hardware del chip"""
@@ -1,4 +1,7 @@
 # display_driver.py
+import math
+import time
+from array import array
 import lvgl as lv
 import gc9a01
 import lcd_bus
@@ -25,8 +28,328 @@ _I2C_ID = const(0)
 _I2C_SCL = const(8)
 _I2C_SDA = const(9)
 _TOUCH_RST = const(11)
+_TOUCH_INT = const(-1)  # GPIO of the CST816S INT line, -1 = not wired (polling)
+
+# Buffering modes for init_display()
+BUFFER_SINGLE = const(0)  # one partial strip buffer
+BUFFER_DOUBLE = const(1)  # two partial strip buffers, DMA ping-pong
+BUFFER_FULL = const(2)    # one full-frame buffer (needs PSRAM)
+
+_DEFAULT_STRIP_HEIGHT = const(40)
+_BYTES_PER_PIXEL = const(2)  # RGB565
+
+_display = None
+
+
+class RoundMask:
+    """
+    Visible disc of the round panel.
+
+    Keeps the first visible column of every row, so clipping an area is a
+    walk over its rows with no floating point at runtime.
+    """
+
+    def __init__(self, width=_WIDTH, height=_HEIGHT):
+        self.width = width
+        self.height = height
+        self._left = array('h', bytes(2 * height))
+
+        cx = width / 2
+        cy = height / 2
+        radius = min(cx, cy)
+        for y in range(height):
+            dy = y + 0.5 - cy
+            half = math.sqrt(max(0.0, radius * radius - dy * dy))
+            left = int(math.ceil(cx - half - 0.5))
+            # Rows with no visible pixel get an empty span (left > right)
+            self._left[y] = left if half > 0 else width
+
+    def row_span(self, y):
+        left = self._left[y]
+        return left, self.width - 1 - left
+
+    def clip(self, x1, y1, x2, y2):
+        """Return the bounding box of area & disc, or None when nothing is visible."""
+        if y1 < 0:
+            y1 = 0
+        if y2 >= self.height:
+            y2 = self.height - 1
+
+        min_x = self.width
+        max_x = -1
+        min_y = -1
+        max_y = -1
+        left = self._left
+        last = self.width - 1
+        for y in range(y1, y2 + 1):
+            l = left[y]
+            r = last - l
+            if l < x1:
+                l = x1
+            if r > x2:
+                r = x2
+            if l > r:
+                continue
+            if min_y < 0:
+                min_y = y
+            max_y = y
+            if l < min_x:
+                min_x = l
+            if r > max_x:
+                max_x = r
+
+        if min_y < 0:
+            return None
+        return min_x, min_y, max_x, max_y
+
+    def visible_rows(self, x1, y1, x2, y2):
+        """Return the first and last row of the area that touch the disc."""
+        area = self.clip(x1, y1, x2, y2)
+        if area is None:
+            return None
+        return area[1], area[3]
+
+
+def _area_size(a):
+    return (a[2] - a[0] + 1) * (a[3] - a[1] + 1)
+
+
+def _areas_touch(a, b):
+    return a[0] <= b[2] + 1 and b[0] <= a[2] + 1 and a[1] <= b[3] + 1 and b[1] <= a[3] + 1
+
+
+def _area_union(a, b):
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def coalesce(areas):
+    """
+    Merge overlapping or adjacent areas when the union is no larger than the
+    two parts together, the same rule LVGL uses when joining invalid areas.
+    """
+    areas = list(areas)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(areas)):
+            for j in range(i + 1, len(areas)):
+                a = areas[i]
+                b = areas[j]
+                if not _areas_touch(a, b):
+                    continue
+                union = _area_union(a, b)
+                if _area_size(union) <= _area_size(a) + _area_size(b):
+                    areas[i] = union
+                    del areas[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return areas
+
+
+class GC9A01Display(gc9a01.GC9A01):
+    """
+    GC9A01 driver that records per-flush byte counts and render/transfer timings.
+
+    render_us is the time LVGL spent drawing between the end of the previous
+    flush call and the start of this one; transfer_us is the time from the
+    start of a flush until the bus signals that the DMA transfer finished.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._mask = None
+        self._pending_areas = []
+        self._requested_areas = []
+        self.reset_flush_stats()
+        super().__init__(*args, **kwargs)
+
+    def enable_round_clip(self):
+        """
+        Clip invalidated areas to the visible disc and merge adjacent ones.
+
+        Areas are shrunk in LV_EVENT_INVALIDATE_AREA before LVGL renders them,
+        and each flush drops the strip rows that fall outside the disc.
+        """
+        if self._mask is not None:
+            return
+        self._mask = RoundMask(_WIDTH, _HEIGHT)
+        self._disp_drv.add_event_cb(self._invalidate_area_cb, lv.EVENT.INVALIDATE_AREA, None)
+        self._disp_drv.add_event_cb(self._refr_ready_cb, lv.EVENT.REFR_READY, None)
+
+    def _invalidate_area_cb(self, e):
+        area = lv.area_t.__cast__(e.get_param())
+        self._requested_areas.append((area.x1, area.y1, area.x2, area.y2))
+
+        clipped = self._mask.clip(area.x1, area.y1, area.x2, area.y2)
+        if clipped is None:
+            self.areas_dropped += 1
+            if self._pending_areas:
+                # LVGL skips an area that lies inside one it already has
+                area.x1, area.y1, area.x2, area.y2 = self._pending_areas[0]
+            else:
+                # Nothing to hide it in yet: one corner pixel, which
+                # _flush_round drops without touching the bus
+                area.x1, area.y1, area.x2, area.y2 = 0, 0, 0, 0
+            return
+
+        # Grow the area over pending ones it can absorb; LVGL then joins
+        # the smaller areas into it when the frame is refreshed
+        i = 0
+        while i < len(self._pending_areas):
+            other = self._pending_areas[i]
+            if _areas_touch(clipped, other):
+                union = _area_union(clipped, other)
+                if _area_size(union) <= _area_size(clipped) + _area_size(other):
+                    clipped = union
+                    del self._pending_areas[i]
+                    i = 0
+                    continue
+            i += 1
+        self._pending_areas.append(clipped)
+
+        area.x1, area.y1, area.x2, area.y2 = clipped
+
+    def _refr_ready_cb(self, e):
+        # Count both sides after merging, so an area invalidated twice or
+        # lying inside another one is only counted once
+        requested = 0
+        for a in coalesce(self._requested_areas):
+            requested += _area_size(a)
+        sent = 0
+        for a in coalesce(self._pending_areas):
+            sent += _area_size(a)
+        saved = requested - sent
+        if saved < 0:
+            saved = 0
+        self.last_frame_saved_px = saved
+        self.pixels_saved += saved
+        self.frames += 1
+        self._requested_areas = []
+        self._pending_areas = []
+
+    def reset_flush_stats(self):
+        self.flush_count = 0
+        self.flush_bytes = 0
+        self.last_flush_bytes = 0
+        self.render_us = 0
+        self.transfer_us = 0
+        self.total_render_us = 0
+        self.total_transfer_us = 0
+        self.frames = 0
+        self.pixels_saved = 0
+        self.last_frame_saved_px = 0
+        self.flush_rows_skipped = 0
+        self.areas_dropped = 0
+        self._flush_start = 0
+        self._flush_end = time.ticks_us()
+
+    def get_flush_stats(self):
+        count = self.flush_count or 1
+        return {
+            'flushes': self.flush_count,
+            'bytes': self.flush_bytes,
+            'last_bytes': self.last_flush_bytes,
+            'render_us': self.render_us,
+            'transfer_us': self.transfer_us,
+            'avg_render_us': self.total_render_us // count,
+            'avg_transfer_us': self.total_transfer_us // count,
+            'frames': self.frames,
+            'pixels_saved': self.pixels_saved,
+            'last_frame_saved_px': self.last_frame_saved_px,
+            'rows_skipped': self.flush_rows_skipped,
+            'areas_dropped': self.areas_dropped,
+        }
+
+    def _flush_cb(self, disp_drv, area, color_p):
+        self._flush_start = time.ticks_us()
+        self.render_us = time.ticks_diff(self._flush_start, self._flush_end)
+        self.total_render_us += self.render_us
+
+        if self._mask is None:
+            size = (area.x2 - area.x1 + 1) * (area.y2 - area.y1 + 1) * _BYTES_PER_PIXEL
+            self._count_flush(size)
+            super()._flush_cb(disp_drv, area, color_p)
+        else:
+            self._flush_round(disp_drv, area, color_p)
+        self._flush_end = time.ticks_us()
+
+    def _count_flush(self, size):
+        self.flush_count += 1
+        self.flush_bytes += size
+        self.last_flush_bytes = size
+
+    def _flush_round(self, disp_drv, area, color_p):
+        x1 = area.x1
+        y1 = area.y1
+        x2 = area.x2
+        y2 = area.y2
+        row_bytes = (x2 - x1 + 1) * _BYTES_PER_PIXEL
+
+        rows = self._mask.visible_rows(x1, y1, x2, y2)
+        if rows is None:
+            # The whole strip is in an invisible corner: nothing to send
+            self.flush_rows_skipped += y2 - y1 + 1
+            self._count_flush(0)
+            disp_drv.flush_ready()
+            return
+
+        top, bottom = rows
+        self.flush_rows_skipped += (top - y1) + (y2 - bottom)
+        # Rows are contiguous in the strip buffer, so trimming is a zero-copy slice
+        data_view = color_p.__dereference__(row_bytes * (y2 - y1 + 1))
+        data_view = data_view[(top - y1) * row_bytes:(bottom - y1 + 1) * row_bytes]
+        self._count_flush(len(data_view))
+
+        x1 += self._offset_x
+        x2 += self._offset_x
+        top += self._offset_y
+        bottom += self._offset_y
+        self._set_memory_location(x1, top, x2, bottom)
+        self._data_bus.tx_color(
+            self._ramwr, data_view, x1, top, x2, bottom,
+            self._rotation, disp_drv.flush_is_last()
+        )
+
+    def _flush_ready_cb(self, *args):
+        self.transfer_us = time.ticks_diff(time.ticks_us(), self._flush_start)
+        self.total_transfer_us += self.transfer_us
+        super()._flush_ready_cb(*args)
+
+
+def _allocate_buffers(display_bus, mode, strip_height, use_psram):
+    if mode == BUFFER_FULL:
+        size = _WIDTH * _HEIGHT * _BYTES_PER_PIXEL
+        # A full 240x240 RGB565 frame is 115 KB and only fits in PSRAM
+        return display_bus.allocate_framebuffer(size, lcd_bus.MEMORY_SPIRAM), None
+
+    size = _WIDTH * strip_height * _BYTES_PER_PIXEL
+    if use_psram:
+        caps = lcd_bus.MEMORY_SPIRAM
+    else:
+        caps = lcd_bus.MEMORY_INTERNAL | lcd_bus.MEMORY_DMA
+
+    buf1 = display_bus.allocate_framebuffer(size, caps)
+    buf2 = None
+    if mode == BUFFER_DOUBLE:
+        # Second buffer lets LVGL render the next strip while DMA sends this one
+        buf2 = display_bus.allocate_framebuffer(size, caps)
+    return buf1, buf2
+
+
+def init_display(mode=BUFFER_DOUBLE, strip_height=_DEFAULT_STRIP_HEIGHT, use_psram=False,
+                 round_clip=True):
+    global _display
+
+    # Buffers are allocated once; later calls return the existing driver
+    if _display is not None:
+        return _display
+
+    if mode not in (BUFFER_SINGLE, BUFFER_DOUBLE, BUFFER_FULL):
+        raise ValueError("invalid buffer mode: {}".format(mode))
+    if strip_height < 1 or strip_height > _HEIGHT:
+        raise ValueError("strip_height must be 1-{}".format(_HEIGHT))
 
-def init_display():
     # Initialize the SPI bus
     spi_bus = SPI.Bus(
         host=_SPI_HOST,
@@ -43,8 +366,12 @@ def init_display():
         freq=_LCD_FREQ
     )
 
-    # Initialize and return the GC9A01 display driver
-    return gc9a01.GC9A01(
+    frame_buffer1, frame_buffer2 = _allocate_buffers(
+        display_bus, mode, strip_height, use_psram
+    )
+
+    # Initialize the GC9A01 display driver
+    _display = GC9A01Display(
         data_bus=display_bus,
         display_width=_WIDTH,
         display_height=_HEIGHT,
@@ -57,26 +384,49 @@ def init_display():
         offset_y=0,
         color_space=lv.COLOR_FORMAT.RGB565,
         color_byte_order=gc9a01.BYTE_ORDER_BGR,
-        rgb565_byte_swap=True
+        rgb565_byte_swap=True,
+        frame_buffer1=frame_buffer1,
+        frame_buffer2=frame_buffer2
     )
 
-def init_touch():
+    if mode == BUFFER_FULL:
+        _display._disp_drv.set_render_mode(lv.DISPLAY_RENDER_MODE.FULL)
+    elif round_clip:
+        # Full-frame mode always redraws the whole screen, so clipping only
+        # pays off with partial strips
+        _display.enable_round_clip()
+
+    return _display
+
+def init_touch(irq_pin=_TOUCH_INT, recognizer=None):
     # Initialize the I2C bus for touch
     i2c = machine.I2C(_I2C_ID, scl=machine.Pin(_I2C_SCL), sda=machine.Pin(_I2C_SDA), freq=400000)
-    
+
+    # With the INT line wired, the driver only reads the chip after a pulse
+    if irq_pin is not None and irq_pin < 0:
+        irq_pin = None
+
     # Initialize the CST816S touch driver
-    touch = CST816S(i2c, reset_pin=machine.Pin(_TOUCH_RST, machine.Pin.OUT))
+    touch = CST816S(
+        i2c,
+        reset_pin=machine.Pin(_TOUCH_RST, machine.Pin.OUT),
+        irq_pin=irq_pin
+    )
     touch.auto_sleep = False
 
     # Register the touch driver with LVGL
     def touch_read(indev, data):
         coords = touch._get_coords()
         if coords:
-            data.point.x = coords[0]
-            data.point.y = coords[1]
+            data.point.x = coords[1]
+            data.point.y = coords[2]
             data.state = lv.INDEV_STATE.PRESSED
+            if recognizer is not None:
+                recognizer.feed(True, coords[1], coords[2])
         else:
             data.state = lv.INDEV_STATE.RELEASED
+            if recognizer is not None:
+                recognizer.feed(False)
         return False
 
     indev = lv.indev_create()
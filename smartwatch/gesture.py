@@ -0,0 +1,181 @@
+# gesture.py - 基于 CST816S 原始坐标的软件手势识别
+#
+# 芯片自带的手势寄存器只在手指抬起一段时间后才更新，而且不给速度信息，
+# 所以这里直接消费 touch_read 得到的点序列，在抬起的同一帧给出结果。
+
+import time
+from cst816s import (
+    GESTURE_NONE, GESTURE_SWIPE_UP, GESTURE_SWIPE_DOWN, GESTURE_SWIPE_LEFT,
+    GESTURE_SWIPE_RIGHT, GESTURE_SINGLE_CLICK, GESTURE_DOUBLE_CLICK, GESTURE_LONG_PRESS
+)
+
+try:
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+except AttributeError:
+    # 主机上回放录制的坐标序列时使用
+    def _ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+_HISTORY = 8  # 用于计算抬起速度的最近采样点数量
+
+
+class GestureRecognizer:
+    """
+    从原始触摸点流识别滑动、甩动速度、长按和双击。
+
+    每次读取触摸数据后调用 feed()，识别到的手势放入队列，由 pop_event() 取出。
+    事件为 (gesture, vx, vy)，gesture 沿用 cst816s 的 GESTURE_* 常量，
+    vx / vy 是抬起时的速度 (像素/秒)，非滑动手势为 0。
+    """
+
+    def __init__(
+        self,
+        swipe_min_px=40,
+        tap_slop_px=10,
+        fling_min_px=20,
+        fling_velocity=400,
+        long_press_ms=600,
+        double_tap_ms=300,
+        velocity_window_ms=80
+    ):
+        self.swipe_min_px = swipe_min_px
+        self.tap_slop_px = tap_slop_px
+        self.fling_min_px = fling_min_px
+        self.fling_velocity = fling_velocity
+        self.long_press_ms = long_press_ms
+        self.double_tap_ms = double_tap_ms
+        self.velocity_window_ms = velocity_window_ms
+
+        self._events = []
+        self._pressed = False
+        self._start_x = 0
+        self._start_y = 0
+        self._start_t = 0
+        self._moved = False
+        self._long_fired = False
+        self._last_tap_t = None
+        self._last_tap_x = 0
+        self._last_tap_y = 0
+
+        # 最近采样点环形缓冲 (x, y, t)
+        self._hx = [0] * _HISTORY
+        self._hy = [0] * _HISTORY
+        self._ht = [0] * _HISTORY
+        self._hlen = 0
+        self._hpos = 0
+
+    def reset(self):
+        self._events = []
+        self._pressed = False
+        self._last_tap_t = None
+        self._hlen = 0
+
+    def _push_sample(self, x, y, t):
+        i = self._hpos
+        self._hx[i] = x
+        self._hy[i] = y
+        self._ht[i] = t
+        self._hpos = (i + 1) % _HISTORY
+        if self._hlen < _HISTORY:
+            self._hlen += 1
+
+    def _velocity(self, t_end):
+        # 取速度窗口内最早的点与最后一点之间的平均速度
+        last = (self._hpos - 1) % _HISTORY
+        first = last
+        for n in range(1, self._hlen):
+            i = (last - n) % _HISTORY
+            if _ticks_diff(t_end, self._ht[i]) > self.velocity_window_ms:
+                break
+            first = i
+        dt = _ticks_diff(self._ht[last], self._ht[first])
+        if dt <= 0:
+            return 0, 0
+        vx = (self._hx[last] - self._hx[first]) * 1000 // dt
+        vy = (self._hy[last] - self._hy[first]) * 1000 // dt
+        return vx, vy
+
+    def feed(self, pressed, x=0, y=0, t=None):
+        """送入一次触摸读取结果；释放时 x / y 可省略"""
+        if t is None:
+            t = _ticks_ms()
+
+        if pressed:
+            if not self._pressed:
+                self._pressed = True
+                self._start_x = x
+                self._start_y = y
+                self._start_t = t
+                self._moved = False
+                self._long_fired = False
+                self._hlen = 0
+            self._push_sample(x, y, t)
+
+            dx = x - self._start_x
+            dy = y - self._start_y
+            if abs(dx) > self.tap_slop_px or abs(dy) > self.tap_slop_px:
+                self._moved = True
+
+            # 长按在按住期间触发，不必等待抬起
+            if (not self._moved and not self._long_fired
+                    and _ticks_diff(t, self._start_t) >= self.long_press_ms):
+                self._long_fired = True
+                self._last_tap_t = None
+                self._events.append((GESTURE_LONG_PRESS, 0, 0))
+            return
+
+        if not self._pressed:
+            return
+        self._pressed = False
+        if self._long_fired:
+            return
+
+        last = (self._hpos - 1) % _HISTORY
+        dx = self._hx[last] - self._start_x
+        dy = self._hy[last] - self._start_y
+
+        if self._moved:
+            self._last_tap_t = None
+            vx, vy = self._velocity(t)
+            gesture = self._classify_swipe(dx, dy, vx, vy)
+            if gesture != GESTURE_NONE:
+                self._events.append((gesture, vx, vy))
+            return
+
+        # 单击立即上报；若与上一次单击足够近，再补一个双击事件
+        if (self._last_tap_t is not None
+                and _ticks_diff(self._start_t, self._last_tap_t) <= self.double_tap_ms
+                and abs(self._start_x - self._last_tap_x) <= self.swipe_min_px
+                and abs(self._start_y - self._last_tap_y) <= self.swipe_min_px):
+            self._last_tap_t = None
+            self._events.append((GESTURE_DOUBLE_CLICK, 0, 0))
+            return
+
+        self._last_tap_t = t
+        self._last_tap_x = self._start_x
+        self._last_tap_y = self._start_y
+        self._events.append((GESTURE_SINGLE_CLICK, 0, 0))
+
+    def _classify_swipe(self, dx, dy, vx, vy):
+        horizontal = abs(dx) >= abs(dy)
+        dist = abs(dx) if horizontal else abs(dy)
+        speed = abs(vx) if horizontal else abs(vy)
+
+        # 距离足够，或者距离较短但甩动速度够快
+        if dist < self.swipe_min_px:
+            if dist < self.fling_min_px or speed < self.fling_velocity:
+                return GESTURE_NONE
+
+        if horizontal:
+            return GESTURE_SWIPE_RIGHT if dx > 0 else GESTURE_SWIPE_LEFT
+        return GESTURE_SWIPE_DOWN if dy > 0 else GESTURE_SWIPE_UP
+
+    def pop_event(self):
+        """取出最早的手势事件，没有则返回 None"""
+        if self._events:
+            return self._events.pop(0)
+        return None
@@ -0,0 +1,295 @@
+# glyph_cache.py - 按需从 flash 读取字形的 LRU 缓存字体
+#
+# 界面固定文字用的汉字由 tools/font_subset.py 裁剪成小字库常驻内存；接口返回
+# 的天气描述等动态文字可能用到子集之外的字。这里不把完整字库载入内存，而是
+# 保留文件句柄，缺字时只读取该字的字形，解包后放入按字节数限额的 LRU 缓存。
+#
+# CachedFont.font 是一个 lv.font_t，挂到子集字体的 fallback 上即可：
+#     font_cn.fallback = CachedFont("assets/font/xxx.fnt").font
+#
+# 只支持未压缩 (compression_id == 0) 的 lv_font_conv 二进制字体。
+
+import struct
+import time
+from array import array
+
+_HEAD_FORMAT = "<IHHHhHhHhhHHBBBBBBBBBBhH"
+
+# cmap 子表格式
+_CMAP_FORMAT0_FULL = 0
+_CMAP_SPARSE_FULL = 1
+_CMAP_FORMAT0_TINY = 2
+_CMAP_SPARSE_TINY = 3
+
+_ENTRY_OVERHEAD = 48  # 每个缓存条目除位图外的估算开销 (字节)
+
+
+class BinFontReader:
+    """只解析字体头、cmap 和 loca 位置，字形在需要时才从文件读取"""
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self._tables = {}
+        pos = 0
+        while True:
+            self._f.seek(pos)
+            head = self._f.read(8)
+            if len(head) < 8:
+                break
+            size, tag = struct.unpack("<I4s", head)
+            self._tables[tag] = (pos, size)
+            pos += size
+
+        start, _ = self._tables[b"head"]
+        self._f.seek(start + 8)
+        h = struct.unpack(_HEAD_FORMAT, self._f.read(struct.calcsize(_HEAD_FORMAT)))
+        self.font_size = h[2]
+        self.min_y = h[8]
+        self.max_y = h[9]
+        self.default_adv_w = h[10]
+        self._loca_u32 = h[12] == 1
+        self._adv_fp = h[14] == 1
+        self.bpp = h[15]
+        self._xy_bits = h[16]
+        self._wh_bits = h[17]
+        self._adv_bits = h[18]
+        if h[19] != 0:
+            raise ValueError("compressed fonts are not supported")
+
+        self._read_cmap()
+        self._loca_start = self._tables[b"loca"][0] + 12
+        self._glyf_start, self._glyf_size = self._tables[b"glyf"]
+
+    def close(self):
+        self._f.close()
+
+    def _read_cmap(self):
+        start, _ = self._tables[b"cmap"]
+        self._f.seek(start + 8)
+        count = struct.unpack("<I", self._f.read(4))[0]
+        headers = [struct.unpack("<IIHHHBB", self._f.read(16)) for _ in range(count)]
+        self._cmaps = []
+        for offset, range_start, range_length, gid_start, entries, fmt, _ in headers:
+            self._f.seek(start + offset)
+            if fmt == _CMAP_FORMAT0_FULL:
+                data = self._f.read(range_length)
+                ids = None
+            elif fmt in (_CMAP_SPARSE_TINY, _CMAP_SPARSE_FULL):
+                data = array("H", self._f.read(entries * 2))
+                ids = array("H", self._f.read(entries * 2)) if fmt == _CMAP_SPARSE_FULL else None
+            else:
+                data = ids = None
+            self._cmaps.append((range_start, range_length, gid_start, fmt, data, ids))
+
+    def glyph_id(self, letter):
+        """码点 -> 字形编号，没有该字时返回 0"""
+        for range_start, range_length, gid_start, fmt, data, ids in self._cmaps:
+            rcp = letter - range_start
+            if rcp < 0 or rcp >= range_length:
+                continue
+            if fmt == _CMAP_FORMAT0_TINY:
+                return gid_start + rcp
+            if fmt == _CMAP_FORMAT0_FULL:
+                if data[rcp] == 0 and rcp != 0:
+                    continue
+                return gid_start + data[rcp]
+            # 稀疏表按码点升序排列，二分查找
+            lo, hi = 0, len(data)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if data[mid] < rcp:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < len(data) and data[lo] == rcp:
+                return gid_start + (ids[lo] if ids is not None else lo)
+        return 0
+
+    def _loca(self, gid):
+        width = 4 if self._loca_u32 else 2
+        self._f.seek(self._loca_start + gid * width)
+        raw = self._f.read(width * 2)
+        if len(raw) < width * 2:
+            return struct.unpack("<I" if self._loca_u32 else "<H", raw[:width])[0], self._glyf_size
+        return struct.unpack("<II" if self._loca_u32 else "<HH", raw)
+
+    def read_glyph(self, gid):
+        """
+        返回 (adv_w, box_w, box_h, ofs_x, ofs_y, bitmap)；adv_w 单位为 1/16 像素，
+        bitmap 为按 bpp 紧密排列的位图 (与 LVGL 内置字体相同)。
+        """
+        begin, end = self._loca(gid)
+        self._f.seek(self._glyf_start + begin)
+        blob = self._f.read(end - begin)
+
+        pos = 0
+
+        def bits(n):
+            nonlocal pos
+            value = 0
+            for _ in range(n):
+                value = (value << 1) | ((blob[pos >> 3] >> (7 - (pos & 7))) & 1)
+                pos += 1
+            return value
+
+        def signed(n):
+            v = bits(n)
+            return v - (1 << n) if v & (1 << (n - 1)) else v
+
+        if self._adv_bits == 0:
+            adv_w = self.default_adv_w
+        else:
+            adv_w = bits(self._adv_bits)
+            if not self._adv_fp:
+                adv_w *= 16
+        ofs_x = signed(self._xy_bits)
+        ofs_y = signed(self._xy_bits)
+        box_w = bits(self._wh_bits)
+        box_h = bits(self._wh_bits)
+
+        nbits = box_w * box_h * self.bpp
+        bitmap = bytearray((nbits + 7) // 8)
+        if pos & 7 == 0:
+            bitmap[:] = blob[pos >> 3:(pos >> 3) + len(bitmap)]
+        else:
+            # 位图紧跟在度量字段之后，不一定字节对齐，逐字节移位拼出
+            shift = pos & 7
+            base = pos >> 3
+            for i in range(len(bitmap)):
+                hi = blob[base + i] if base + i < len(blob) else 0
+                lo = blob[base + i + 1] if base + i + 1 < len(blob) else 0
+                bitmap[i] = ((hi << shift) | (lo >> (8 - shift))) & 0xFF
+        return adv_w, box_w, box_h, ofs_x, ofs_y, bitmap
+
+
+def expand_a8(bitmap, bpp, box_w, box_h, out, stride):
+    """把按 bpp 紧密排列的位图展开为每像素一字节的 A8，按 stride 逐行写入 out"""
+    mask = (1 << bpp) - 1
+    scale = 255 // mask
+    bit = 0
+    for y in range(box_h):
+        row = y * stride
+        for x in range(box_w):
+            out[row + x] = ((bitmap[bit >> 3] >> (8 - bpp - (bit & 7))) & mask) * scale
+            bit += bpp
+
+
+class GlyphCache:
+    """
+    reader: BinFontReader
+    max_bytes: 缓存位图总量上限 (含估算开销)
+    """
+
+    def __init__(self, reader, max_bytes=8 * 1024):
+        self.reader = reader
+        self.max_bytes = max_bytes
+        self._entries = {}  # 码点 -> [字形, 大小, 最近使用序号]
+        self._use_counter = 0
+        self.bytes = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.read_us = 0
+
+    def get(self, letter):
+        """返回字形元组，字库中没有该字时返回 None"""
+        self._use_counter += 1
+        entry = self._entries.get(letter)
+        if entry is not None:
+            self.hits += 1
+            entry[2] = self._use_counter
+            return entry[0]
+
+        self.misses += 1
+        gid = self.reader.glyph_id(letter)
+        if gid == 0:
+            return None
+        start = time.ticks_us()
+        glyph = self.reader.read_glyph(gid)
+        self.read_us += time.ticks_diff(time.ticks_us(), start)
+
+        size = len(glyph[5]) + _ENTRY_OVERHEAD
+        while self._entries and self.bytes + size > self.max_bytes:
+            self._evict()
+        self._entries[letter] = [glyph, size, self._use_counter]
+        self.bytes += size
+        return glyph
+
+    def peek(self, letter):
+        """只查缓存，不计入统计、不读文件"""
+        entry = self._entries.get(letter)
+        return entry[0] if entry is not None else None
+
+    def _evict(self):
+        victim = None
+        oldest = None
+        for letter, entry in self._entries.items():
+            if oldest is None or entry[2] < oldest:
+                victim = letter
+                oldest = entry[2]
+        self.bytes -= self._entries.pop(victim)[1]
+        self.evictions += 1
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'glyphs': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits * 100 // lookups if lookups else 0,
+            'evictions': self.evictions,
+            'read_us': self.read_us,
+        }
+
+
+class CachedFont:
+    """把 GlyphCache 包装成 lv.font_t，供 LVGL 作为 fallback 字体使用"""
+
+    def __init__(self, path, max_bytes=8 * 1024):
+        import lvgl as lv
+
+        self.cache = GlyphCache(BinFontReader(path), max_bytes)
+        reader = self.cache.reader
+        if reader.bpp not in (1, 2, 4, 8):
+            raise ValueError("unsupported bpp: {}".format(reader.bpp))
+        # 与 lv_font_fmt_txt 相同，位图总是展开为 A8 写入 LVGL 提供的 draw_buf
+        self._format = lv.FONT_GLYPH_FORMAT.A8
+
+        font = lv.font_t()
+        font.line_height = reader.max_y - reader.min_y
+        font.base_line = -reader.min_y
+        font.subpx = lv.FONT_SUBPX.NONE
+        font.get_glyph_dsc = self._get_glyph_dsc
+        font.get_glyph_bitmap = self._get_glyph_bitmap
+        self.font = font
+
+    def _get_glyph_dsc(self, font, dsc, letter, letter_next):
+        glyph = self.cache.get(letter)
+        if glyph is None:
+            return False
+        adv_w, box_w, box_h, ofs_x, ofs_y, bitmap = glyph
+        dsc.adv_w = (adv_w + 8) >> 4
+        dsc.box_w = box_w
+        dsc.box_h = box_h
+        dsc.ofs_x = ofs_x
+        dsc.ofs_y = ofs_y
+        dsc.format = self._format
+        dsc.is_placeholder = False
+        dsc.gid.index = letter
+        return True
+
+    def _get_glyph_bitmap(self, dsc, draw_buf):
+        # get_glyph_dsc 刚把该字放入缓存，这里不重复计数
+        glyph = self.cache.peek(dsc.gid.index)
+        if glyph is None:
+            glyph = self.cache.get(dsc.gid.index)
+        if glyph is None:
+            return None
+        adv_w, box_w, box_h, ofs_x, ofs_y, bitmap = glyph
+        stride = draw_buf.header.stride
+        out = draw_buf.data.__dereference__(stride * box_h)
+        expand_a8(bitmap, self.cache.reader.bpp, box_w, box_h, out, stride)
+        return draw_buf
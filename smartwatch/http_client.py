@@ -0,0 +1,343 @@
+# http_client.py - 基于 asyncio 的非阻塞 HTTP 客户端
+#
+# urequests 在 LVGL 回调里同步阻塞，网络慢时整个界面冻结。这里的请求以协程
+# 方式与主循环 (scheduler.MainLoop.run_async) 协同运行，等待网络期间触摸和
+# 动画照常处理。接口兼容 MicroPython asyncio / uasyncio。
+#
+# 使用 HTTP/1.1 keep-alive：每个 (主机, 端口, 是否 TLS) 维护一个小连接池，
+# 读完正文的连接放回池中复用，省掉重复的 TCP 握手和 TLS 握手 (后者在 ESP32
+# 上耗时和占用内存都远大于请求本身)。空闲超时的连接会被关闭。
+
+import json
+import time
+from json_stream import JsonPathReader
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+_READ_CHUNK = 256
+_IDLE_TIMEOUT_MS = 30000   # 空闲连接最长保留时间
+_MAX_IDLE_PER_HOST = 1
+_DRAIN_LIMIT = 2048        # 关闭时最多丢弃这么多未读正文以便复用连接
+_IDEMPOTENT = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+# (secure, host, port) -> [(reader, writer, 放回池的时间)]
+_pool = {}
+
+# 统计信息
+stats = {
+    'requests': 0,
+    'connections_opened': 0,
+    'connections_reused': 0,
+}
+
+
+class HttpError(Exception):
+    pass
+
+
+class _NoResponse(HttpError):
+    """连接在收到任何响应字节之前就被关闭 (通常是服务器已关掉的空闲连接)"""
+
+
+def _parse_url(url):
+    if url.startswith("https://"):
+        secure = True
+        rest = url[8:]
+    elif url.startswith("http://"):
+        secure = False
+        rest = url[7:]
+    else:
+        raise HttpError("unsupported URL: " + url)
+
+    slash = rest.find("/")
+    if slash < 0:
+        host, path = rest, "/"
+    else:
+        host, path = rest[:slash], rest[slash:]
+
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    else:
+        port = 443 if secure else 80
+    return secure, host, port, path
+
+
+class Response:
+    """
+    timeout: 每次读取正文的最长等待时间 (秒)，None 表示不限制。
+    超时后连接被关闭 (不放回池中)，并抛出 asyncio.TimeoutError。
+    """
+
+    def __init__(self, conn_key, reader, writer, status, headers, keep_alive, timeout=None):
+        self._conn_key = conn_key
+        self._reader = reader
+        self._writer = writer
+        self._keep_alive = keep_alive
+        self._timeout = timeout
+        self.status_code = status
+        self.headers = headers
+
+        self._chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        self._chunk_left = 0
+        length = headers.get("content-length")
+        if self._chunked:
+            self._remaining = -1
+        elif length is not None:
+            self._remaining = int(length)
+        else:
+            # 没有长度信息只能读到连接关闭，连接不可复用
+            self._remaining = -1
+            self._keep_alive = False
+
+    async def _wait(self, coro):
+        if self._timeout is None:
+            return await coro
+        try:
+            return await asyncio.wait_for(coro, self._timeout)
+        except asyncio.TimeoutError:
+            # 连接里可能还留着半个响应，不能再复用
+            self._abort()
+            raise
+
+    async def _read(self, size):
+        return await self._wait(self._reader.read(size))
+
+    async def _readline(self):
+        return await self._wait(self._reader.readline())
+
+    def _abort(self):
+        writer = self._writer
+        self._writer = None
+        self._reader = None
+        self._keep_alive = False
+        self._remaining = 0
+        if writer is not None:
+            writer.close()
+
+    async def _read_chunk_size(self):
+        line = await self._readline()
+        if not line:
+            return 0
+        return int(line.split(b";", 1)[0].strip(), 16)
+
+    async def read_chunk(self, size=_READ_CHUNK):
+        """读取最多 size 字节的正文，读完返回 b''"""
+        if self._remaining == 0 or self._reader is None:
+            return b""
+
+        if self._chunked:
+            if self._chunk_left == 0:
+                self._chunk_left = await self._read_chunk_size()
+                if self._chunk_left == 0:
+                    # 最后一个块：跳过 trailer 直到空行
+                    while True:
+                        line = await self._readline()
+                        if not line or line == b"\r\n":
+                            break
+                    self._remaining = 0
+                    return b""
+            if size > self._chunk_left:
+                size = self._chunk_left
+            data = await self._read(size)
+            if not data:
+                self._remaining = 0
+                self._keep_alive = False
+                return b""
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                await self._readline()  # 块末尾的 CRLF
+            return data
+
+        if self._remaining > 0 and size > self._remaining:
+            size = self._remaining
+        data = await self._read(size)
+        if self._remaining > 0:
+            self._remaining -= len(data)
+        if not data:
+            self._remaining = 0
+            self._keep_alive = False
+        return data
+
+    async def read(self):
+        parts = []
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                break
+            parts.append(chunk)
+        return b"".join(parts)
+
+    async def json(self):
+        return json.loads(await self.read())
+
+    async def json_paths(self, paths):
+        """
+        流式解析正文，只构建 paths 中列出的字段，返回 {路径: 值}。
+        所需字段都已取到时不再读取剩余正文。
+        """
+        reader = JsonPathReader(paths)
+        while not reader.done:
+            chunk = await self.read_chunk()
+            if not chunk:
+                break
+            reader.feed(chunk)
+        return reader.finish()
+
+    async def close(self):
+        """正文已完整读完且服务器允许时把连接放回池中，否则关闭"""
+        if self._writer is None:
+            return
+        if self._keep_alive and self._remaining != 0:
+            # json_paths 可能提前停止读取；剩余正文不多时读掉，保留连接
+            drained = 0
+            try:
+                while drained < _DRAIN_LIMIT:
+                    chunk = await self.read_chunk()
+                    if not chunk:
+                        break
+                    drained += len(chunk)
+            except (OSError, asyncio.TimeoutError):
+                self._keep_alive = False
+            if self._writer is None:
+                return
+        reader = self._reader
+        writer = self._writer
+        self._writer = None
+        self._reader = None
+        if self._keep_alive and self._remaining == 0:
+            _release(self._conn_key, reader, writer)
+        else:
+            await _close_writer(writer)
+
+
+async def _close_writer(writer):
+    try:
+        writer.close()
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+def _release(key, reader, writer):
+    idle = _pool.get(key)
+    if idle is None:
+        idle = []
+        _pool[key] = idle
+    if len(idle) >= _MAX_IDLE_PER_HOST:
+        writer.close()
+        return
+    idle.append((reader, writer, time.ticks_ms()))
+
+
+def _acquire(key):
+    """从池中取一个未超时的空闲连接，没有则返回 None"""
+    idle = _pool.get(key)
+    now = time.ticks_ms()
+    while idle:
+        reader, writer, since = idle.pop()
+        if time.ticks_diff(now, since) < _IDLE_TIMEOUT_MS:
+            return reader, writer
+        writer.close()
+    return None
+
+
+def close_idle():
+    """关闭所有空闲连接 (例如 WiFi 断开前)"""
+    for key in _pool:
+        for reader, writer, since in _pool[key]:
+            writer.close()
+    _pool.clear()
+
+
+async def _read_head(reader):
+    line = await reader.readline()
+    if not line:
+        raise _NoResponse("connection closed")
+    parts = line.split(None, 2)
+    if len(parts) < 2:
+        raise HttpError("bad status line")
+    status = int(parts[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line or line == b"\r\n":
+            break
+        key, _, value = line.decode().partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _send(reader, writer, method, host, path, data, headers):
+    head = "{} {} HTTP/1.1\r\nHost: {}\r\nConnection: keep-alive\r\n".format(method, path, host)
+    if headers:
+        for key in headers:
+            head += "{}: {}\r\n".format(key, headers[key])
+    if data is not None:
+        head += "Content-Length: {}\r\n".format(len(data))
+    head += "\r\n"
+
+    writer.write(head.encode())
+    if data is not None:
+        writer.write(data)
+    await writer.drain()
+    return await _read_head(reader)
+
+
+async def _request(method, url, data, headers, timeout):
+    secure, host, port, path = _parse_url(url)
+    key = (secure, host, port)
+    if isinstance(data, str):
+        data = data.encode()
+    stats['requests'] += 1
+
+    conn = _acquire(key)
+    if conn is not None:
+        reader, writer = conn
+        try:
+            status, resp_headers = await _send(reader, writer, method, host, path, data, headers)
+            stats['connections_reused'] += 1
+        except (OSError, _NoResponse):
+            # 服务器可能已关闭空闲连接。请求可能已经被处理，只有幂等方法
+            # 才换新连接重试一次，POST 不重发，由调用方决定
+            writer.close()
+            if method not in _IDEMPOTENT:
+                raise
+            conn = None
+        except BaseException:
+            # 包括超时和任务取消：连接里的状态未知，不能再放回池中
+            writer.close()
+            raise
+
+    if conn is None:
+        reader, writer = await asyncio.open_connection(host, port, ssl=secure or None)
+        stats['connections_opened'] += 1
+        try:
+            status, resp_headers = await _send(reader, writer, method, host, path, data, headers)
+        except BaseException:
+            writer.close()
+            raise
+
+    keep_alive = resp_headers.get("connection", "").lower() != "close"
+    return Response(key, reader, writer, status, resp_headers, keep_alive, timeout)
+
+
+async def request(method, url, data=None, headers=None, timeout=10):
+    """
+    发起请求并返回 Response (正文尚未读取，用完需 await close())。
+    timeout (秒) 限制建立连接加读取响应头的时间，之后读取正文时每次读取
+    也各自受它限制，服务器中途停止发送不会让调用方一直等下去。
+    """
+    return await asyncio.wait_for(_request(method, url, data, headers, timeout), timeout)
+
+
+async def get(url, headers=None, timeout=10):
+    return await request("GET", url, None, headers, timeout)
+
+
+async def post(url, data=None, headers=None, timeout=10):
+    return await request("POST", url, data, headers, timeout)
@@ -0,0 +1,116 @@
+# icon_atlas.py - 从预转换的 RGB565A8 图集加载天气图标
+#
+# 图集由 tools/build_weather_atlas.py 在电脑上生成：weather_atlas.bin 依次存放
+# 每个图标的 RGB565A8 数据，weather_atlas.json 记录 代码 -> [偏移, 宽, 高]。
+# 这里按偏移只读取需要的那一张到预先分配的缓冲区，包装成 lv.image_dsc_t，
+# LVGL 直接显示，不再经文件系统驱动和 PNG 解码器。
+#
+# 两个缓冲区轮流使用：新图标写入当前没有显示的那个，切换过程中不会花屏。
+
+import json
+import time
+import lvgl as lv
+
+
+class IconAtlas:
+    """
+    atlas_path / index_path: 图集和索引文件路径
+    索引缺失时 available 为 False，调用方应退回 PNG 文件
+    """
+
+    def __init__(self, atlas_path="weather_incons/weather_atlas.bin",
+                 index_path="weather_incons/weather_atlas.json"):
+        self.atlas_path = atlas_path
+        self.icons = {}
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if index.get("format") == "RGB565A8":
+                self.icons = index["icons"]
+        except (OSError, ValueError) as e:
+            print(f"Icon atlas unavailable: {e}")
+
+        self._bufs = None
+        self._dscs = [None, None]
+        self._slot = 0
+        self._codes = [None, None]
+
+        # 统计信息
+        self.loads = 0
+        self.last_load_us = 0
+        self.max_load_us = 0
+
+    @property
+    def available(self):
+        return bool(self.icons)
+
+    def _alloc(self):
+        # 按最大图标分配，之后不再为图标分配内存
+        size = 0
+        for offset, w, h in self.icons.values():
+            if w * h * 3 > size:
+                size = w * h * 3
+        self._bufs = [bytearray(size), bytearray(size)]
+
+    def get(self, code):
+        """返回图标的 lv.image_dsc_t；没有该代码或读取失败时返回 None"""
+        code = str(code)
+        entry = self.icons.get(code)
+        if entry is None:
+            return None
+        # 已在某个缓冲区中 (通常就是当前显示的那张)
+        for i in (0, 1):
+            if self._codes[i] == code:
+                return self._dscs[i]
+
+        if self._bufs is None:
+            self._alloc()
+
+        start = time.ticks_us()
+        offset, w, h = entry
+        size = w * h * 3
+        slot = self._slot ^ 1
+        buf = self._bufs[slot]
+        try:
+            with open(self.atlas_path, "rb") as f:
+                f.seek(offset)
+                if f.readinto(memoryview(buf)[:size]) != size:
+                    return None
+        except OSError as e:
+            print(f"Icon atlas read error: {e}")
+            return None
+
+        old = self._dscs[slot]
+        if old is not None and hasattr(lv, 'image_cache_drop'):
+            # 缓冲区内容已变，丢弃 LVGL 对旧描述符的缓存
+            lv.image_cache_drop(old)
+
+        dsc = lv.image_dsc_t({
+            'header': {
+                'magic': lv.IMAGE_HEADER_MAGIC,
+                'cf': lv.COLOR_FORMAT.RGB565A8,
+                'w': w,
+                'h': h,
+                'stride': w * 2,
+            },
+            'data_size': size,
+            'data': buf,
+        })
+        self._dscs[slot] = dsc
+        self._codes[slot] = code
+        self._slot = slot
+
+        self.loads += 1
+        self.last_load_us = time.ticks_diff(time.ticks_us(), start)
+        if self.last_load_us > self.max_load_us:
+            self.max_load_us = self.last_load_us
+        return dsc
+
+    def get_stats(self):
+        return {
+            'icons': len(self.icons),
+            'loads': self.loads,
+            'last_load_us': self.last_load_us,
+            'max_load_us': self.max_load_us,
+            'buffer_bytes': 0 if self._bufs is None else 2 * len(self._bufs[0]),
+        }
@@ -0,0 +1,154 @@
+# json_stream.py - 按路径提取字段的流式 JSON 读取器
+#
+# res.json() 需要先把整个响应读进内存，再构建完整的 dict 树，而界面只用到其中
+# 几个字段。这里逐块喂入字节，只跟踪当前所在路径，仅把请求的路径对应的值
+# (标量或子树) 交给 json.loads 构建，其余内容读过即丢。
+#
+# 路径写法："results.0.now.temperature"，数组下标直接写数字。
+# 已被整体捕获的子树内部不再单独匹配更深的路径。
+
+import json
+
+_WS = b" \t\r\n"
+_QUOTE = 0x22      # "
+_BACKSLASH = 0x5C  # \
+_LBRACE = 0x7B     # {
+_RBRACE = 0x7D     # }
+_LBRACKET = 0x5B   # [
+_RBRACKET = 0x5D   # ]
+_COMMA = 0x2C      # ,
+_COLON = 0x3A      # :
+
+
+class JsonPathReader:
+    """
+    用法：
+        reader = JsonPathReader(["results.0.now"])
+        reader.feed(chunk) ...   # 可在 reader.done 为 True 时提前停止
+        reader.results           # {"results.0.now": {...}}
+    """
+
+    def __init__(self, paths):
+        self._wanted = {}
+        for p in paths:
+            self._wanted[tuple(p.split("."))] = p
+        self.results = {}
+        self.bytes_fed = 0
+
+        self._stack = []           # 容器类型：{ 或 [
+        self._path = []            # 当前路径：键 (str) 或下标 (int)
+        self._expect_key = False
+
+        self._in_str = False
+        self._escape = False
+        self._str_is_key = False
+        self._key = bytearray()
+        self._in_scalar = False
+
+        self._cap = None           # 正在捕获的值的原始字节
+        self._cap_depth = 0
+        self._cap_name = None
+
+    @property
+    def done(self):
+        return len(self.results) == len(self._wanted)
+
+    def _begin_value(self, c):
+        if self._cap is None and self._wanted:
+            key = tuple([str(p) for p in self._path])
+            name = self._wanted.get(key)
+            if name is not None:
+                self._cap = bytearray()
+                self._cap_depth = len(self._stack)
+                self._cap_name = name
+        if self._cap is not None:
+            self._cap.append(c)
+
+    def _end_value(self):
+        if self._cap is not None and len(self._stack) == self._cap_depth:
+            self.results[self._cap_name] = json.loads(bytes(self._cap))
+            self._cap = None
+            self._cap_name = None
+
+    def feed(self, data):
+        self.bytes_fed += len(data)
+        for c in data:
+            if self._in_str:
+                if self._cap is not None:
+                    self._cap.append(c)
+                if self._escape:
+                    self._escape = False
+                    if self._str_is_key:
+                        self._key.append(c)
+                elif c == _BACKSLASH:
+                    self._escape = True
+                    if self._str_is_key:
+                        self._key.append(c)
+                elif c == _QUOTE:
+                    self._in_str = False
+                    if self._str_is_key:
+                        self._path[-1] = bytes(self._key).decode()
+                    else:
+                        self._end_value()
+                elif self._str_is_key:
+                    self._key.append(c)
+                continue
+
+            if self._in_scalar:
+                if c in _WS or c == _COMMA or c == _RBRACE or c == _RBRACKET:
+                    self._in_scalar = False
+                    self._end_value()
+                else:
+                    if self._cap is not None:
+                        self._cap.append(c)
+                    continue
+
+            if c in _WS:
+                continue
+
+            if c == _QUOTE:
+                self._in_str = True
+                if self._stack and self._stack[-1] == _LBRACE and self._expect_key:
+                    self._str_is_key = True
+                    self._key = bytearray()
+                    if self._cap is not None:
+                        self._cap.append(c)
+                else:
+                    self._str_is_key = False
+                    self._begin_value(c)
+            elif c == _LBRACE or c == _LBRACKET:
+                self._begin_value(c)
+                self._stack.append(c)
+                if c == _LBRACE:
+                    self._path.append(None)
+                    self._expect_key = True
+                else:
+                    self._path.append(0)
+            elif c == _RBRACE or c == _RBRACKET:
+                if self._cap is not None:
+                    self._cap.append(c)
+                self._stack.pop()
+                self._path.pop()
+                self._expect_key = False
+                self._end_value()
+            elif c == _COLON:
+                if self._cap is not None:
+                    self._cap.append(c)
+                self._expect_key = False
+            elif c == _COMMA:
+                if self._cap is not None:
+                    self._cap.append(c)
+                if self._stack[-1] == _LBRACE:
+                    self._expect_key = True
+                else:
+                    self._path[-1] += 1
+            else:
+                self._in_scalar = True
+                self._begin_value(c)
+
+    def finish(self):
+        """输入结束；顶层是裸标量时需要调用以结束最后一个值"""
+        if self._in_scalar:
+            self._in_scalar = False
+            self._end_value()
+        return self.results
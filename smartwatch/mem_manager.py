@@ -0,0 +1,92 @@
+# mem_manager.py - 集中式垃圾回收策略
+#
+# ESP32-S3 + PSRAM 上一次完整 gc.collect() 需要数毫秒，在动画过程中执行会造成卡顿。
+# 各模块不再直接调用 gc.collect()，而是通过 request() 登记"需要回收"，
+# 由主循环在空闲帧里统一执行，并记录每次回收耗时。
+
+import gc
+import time
+
+
+class MemoryManager:
+    """
+    budget: 距上次回收累计分配超过该字节数时，在下一个空闲帧回收
+    low_water: 剩余内存低于该值时不等空闲帧，立即回收
+    min_idle_ms: 空闲时间不足该值的帧不做常规回收
+    """
+
+    def __init__(self, budget=32768, low_water=16384, min_idle_ms=8):
+        self.budget = budget
+        self.low_water = low_water
+        self.min_idle_ms = min_idle_ms
+
+        self._pending = False
+        self._alloc_base = gc.mem_alloc()
+
+        # 统计信息
+        self.collections = 0
+        self.last_us = 0
+        self.max_us = 0
+        self.total_us = 0
+        self.last_reason = None
+
+        # 兜底：分配失控时 MicroPython 自行回收 (预算的两倍)
+        try:
+            gc.threshold(budget * 2)
+        except AttributeError:
+            pass
+
+    def allocated_since_collect(self):
+        alloc = gc.mem_alloc()
+        if alloc < self._alloc_base:
+            # MicroPython 自行回收过 (例如达到 gc.threshold)，从回收后的用量重新计算
+            self._alloc_base = alloc
+        return alloc - self._alloc_base
+
+    def request(self):
+        """登记一次回收请求，推迟到下一个空闲帧执行"""
+        self._pending = True
+
+    def collect(self, reason="explicit"):
+        """立即回收 (仅用于马上需要大块连续内存的场合)"""
+        start = time.ticks_us()
+        gc.collect()
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+
+        self._pending = False
+        self._alloc_base = gc.mem_alloc()
+        self.collections += 1
+        self.last_us = elapsed
+        self.total_us += elapsed
+        if elapsed > self.max_us:
+            self.max_us = elapsed
+        self.last_reason = reason
+        return elapsed
+
+    def idle(self, idle_ms):
+        """由主循环在空闲帧调用；idle_ms 为预计空闲时间"""
+        if gc.mem_free() < self.low_water:
+            self.collect("low")
+            return True
+
+        if idle_ms < self.min_idle_ms:
+            return False
+
+        if self.allocated_since_collect() >= self.budget:
+            self.collect("budget")
+            return True
+        if self._pending:
+            self.collect("request")
+            return True
+        return False
+
+    def get_stats(self):
+        count = self.collections or 1
+        return {
+            'collections': self.collections,
+            'last_us': self.last_us,
+            'max_us': self.max_us,
+            'avg_us': self.total_us // count,
+            'since_collect': self.allocated_since_collect(),
+            'reason': self.last_reason,
+        }
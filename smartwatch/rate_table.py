@@ -0,0 +1,93 @@
+# rate_table.py - 本地计算任意币种对的交叉汇率
+#
+# 逐对调用汇率接口时，8 种货币最多对应 56 次远程请求。这里只拉取一张以
+# 某一货币 (config.EXCHANGE_RATE_API 为美元) 为基准的汇率表，存入
+# ResponseCache，任意两种货币的汇率在本地用 rates[to] / rates[from] 算出。
+# 汇率表过期时由调用方决定是刷新还是退回逐对查询。
+
+import math
+import http_client
+
+
+def round_sig(x, digits=6):
+    """按有效数字四舍五入 (小额汇率如 JPY->USD 也能保留足够精度)"""
+    if x == 0:
+        return 0.0
+    return round(x, digits - 1 - int(math.floor(math.log10(abs(x)))))
+
+
+class RateTable:
+    """
+    cache: ResponseCache 实例
+    url: 基准汇率表接口，返回 {"base": ..., "rates": {币种: 汇率}}
+    currencies: 需要的币种；只解析这些字段，其余读过即丢
+    ttl: 汇率表有效期 (秒)
+    """
+
+    def __init__(self, cache, url, currencies, ttl=6 * 3600):
+        self.cache = cache
+        self.url = url
+        self.currencies = currencies
+        self.ttl = ttl
+        self.base = None
+        self.rates = None
+
+        # 统计信息
+        self.local_hits = 0
+        self.refreshes = 0
+
+    def load(self):
+        """从缓存载入汇率表 (可能已过期)；返回是否有可用的表"""
+        data = self.cache.get_stale(self.url)
+        if data is not None:
+            self.base, self.rates = data
+        return self.rates is not None
+
+    def is_fresh(self):
+        if self.rates is None:
+            return False
+        age = self.cache.age(self.url)
+        return age is not None and age < self.ttl
+
+    def rate(self, from_coin, to_coin):
+        """1 from_coin 可兑换多少 to_coin；表中没有对应币种时返回 None"""
+        if self.rates is None:
+            return None
+        src = self.rates.get(from_coin)
+        dst = self.rates.get(to_coin)
+        if not src or dst is None:
+            return None
+        self.local_hits += 1
+        # 直接用两个基准汇率相除，中间结果不做舍入，只在最后舍入一次
+        return round_sig(dst / src)
+
+    def convert(self, amount, from_coin, to_coin):
+        r = self.rate(from_coin, to_coin)
+        if r is None:
+            return None
+        return round_sig(amount * r)
+
+    async def refresh(self, timeout=10):
+        """拉取汇率表并写入缓存；成功返回 True"""
+        paths = ["base"] + ["rates." + c for c in self.currencies]
+        res = await http_client.get(self.url, timeout=timeout)
+        try:
+            if res.status_code != 200:
+                print(f"Rate table API Error: {res.status_code}")
+                return False
+            data = await res.json_paths(paths)
+        finally:
+            await res.close()
+
+        rates = {}
+        for c in self.currencies:
+            value = data.get("rates." + c)
+            if value is not None:
+                rates[c] = value
+        if not rates:
+            return False
+        self.base = data.get("base")
+        self.rates = rates
+        self.cache.put(self.url, [self.base, rates])
+        self.refreshes += 1
+        return True
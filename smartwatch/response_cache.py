@@ -0,0 +1,126 @@
+# response_cache.py - 带 TTL 的持久化响应缓存
+#
+# 天气每小时刷新一次、切换城市时立即刷新，汇率页面每次点击都请求接口，
+# 同一城市/币种对在短时间内会被反复查询。这里按键 (URL 或参数组合) 缓存
+# 解析后的结果，每类接口各自指定 TTL；结果写入 flash，重启后在网络就绪前
+# 就能先显示上次的数据 (即使已过期)。
+#
+# 每个键一个小文件，内容为紧凑 JSON：[写入时间, 键, 值]。
+# 时间来源通过 clock 注入，便于在主机上用假时钟验证过期逻辑。
+
+import json
+import os
+import time
+
+_DEFAULT_DIR = "/cache"
+
+
+def _key_hash(key):
+    # FNV-1a 32 位，用作文件名
+    h = 0x811C9DC5
+    for c in key.encode():
+        h = ((h ^ c) * 0x01000193) & 0xFFFFFFFF
+    return "{:08x}".format(h)
+
+
+class ResponseCache:
+    """
+    directory: 缓存文件目录；为 None 时只缓存在内存中
+    clock: 返回当前时间 (秒) 的函数，默认 time.time
+    """
+
+    def __init__(self, directory=_DEFAULT_DIR, clock=None):
+        self.directory = directory
+        self.clock = clock if clock is not None else time.time
+        self._mem = {}  # 键 -> (写入时间, 值)
+
+        # 统计信息
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        if directory is not None:
+            try:
+                os.mkdir(directory)
+            except OSError:
+                pass  # 目录已存在
+
+    def _path(self, key):
+        return "{}/{}.json".format(self.directory, _key_hash(key))
+
+    def _load(self, key):
+        entry = self._mem.get(key)
+        if entry is not None or self.directory is None:
+            return entry
+        try:
+            with open(self._path(key)) as f:
+                stamp, stored_key, value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored_key != key:
+            return None  # 哈希冲突
+        entry = (stamp, value)
+        self._mem[key] = entry
+        return entry
+
+    def age(self, key):
+        """距写入的秒数；没有缓存或时钟回拨 (例如 NTP 尚未同步) 时返回 None"""
+        entry = self._load(key)
+        if entry is None:
+            return None
+        age = self.clock() - entry[0]
+        return age if age >= 0 else None
+
+    def get(self, key, ttl):
+        """未过期时返回缓存值，否则返回 None"""
+        entry = self._load(key)
+        if entry is not None:
+            age = self.clock() - entry[0]
+            if 0 <= age < ttl:
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        return None
+
+    def get_stale(self, key):
+        """不论是否过期都返回缓存值 (用于启动时或离线时先行显示)"""
+        entry = self._load(key)
+        if entry is None:
+            return None
+        self.stale_hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        stamp = self.clock()
+        self._mem[key] = (stamp, value)
+        self.writes += 1
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = path + ".tmp"
+        try:
+            # 先写临时文件再改名，写入途中掉电不会留下半个文件
+            with open(tmp, "w") as f:
+                json.dump([stamp, key, value], f)
+            os.rename(tmp, path)
+        except OSError as e:
+            print(f"Cache write error: {e}")
+
+    def invalidate(self, key):
+        self._mem.pop(key, None)
+        if self.directory is None:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'entries': len(self._mem),
+        }
@@ -0,0 +1,194 @@
+# scheduler.py - 事件驱动主循环
+#
+# 原来的主循环固定 5ms 唤醒一次。这里改为询问 LVGL 距离下一个定时器
+# 还有多久 (lv.timer_handler 的返回值)，睡到那时或被触摸中断提前唤醒，
+# 并用真实的单调时钟推进 lv.tick。
+#
+# run_async() 是同一循环的协程版本：睡眠期间让出给 asyncio 任务
+# (例如网络请求)，任务通过 post() 把结果交回 UI，post() 同时结束当前睡眠，
+# 回调在这次唤醒中执行；没有 post() 时一直睡到下一个 LVGL 定时器。
+
+import gc
+import time
+import lvgl as lv
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+_NO_TIMER_READY = 0xFFFFFFFF  # LV_NO_TIMER_READY
+
+
+class MainLoop:
+    """
+    自适应睡眠的主循环。
+
+    wake_cb: 返回 True 时提前结束睡眠 (例如触摸 IRQ 已置位)，可为 None
+    before_cb: 每次唤醒后、运行 LVGL 定时器前调用 (手势处理)
+    idle_cb: 参数为本次预计空闲毫秒数，在睡眠前调用 (GC、预加载等)
+    """
+
+    def __init__(
+        self,
+        wake_cb=None,
+        before_cb=None,
+        idle_cb=None,
+        min_sleep_ms=1,
+        max_sleep_ms=500,
+        poll_ms=10,
+        report_ms=5000
+    ):
+        self.wake_cb = wake_cb
+        self.before_cb = before_cb
+        self.idle_cb = idle_cb
+        self.min_sleep_ms = min_sleep_ms
+        self.max_sleep_ms = max_sleep_ms
+        self.poll_ms = poll_ms
+        self.report_ms = report_ms
+
+        self._posted = []
+        self._posted_event = asyncio.Event()
+        self._last_tick = time.ticks_ms()
+        self._window_start = self._last_tick
+        self._window_wakeups = 0
+        self._window_busy_us = 0
+
+        # 最近一个统计窗口的结果
+        self.wakeups_per_s = 0
+        self.busy_pct = 0
+        self.total_wakeups = 0
+
+    def _advance_tick(self):
+        now = time.ticks_ms()
+        elapsed = time.ticks_diff(now, self._last_tick)
+        if elapsed > 0:
+            lv.tick_inc(elapsed)
+            self._last_tick = now
+        return now
+
+    def _sleep(self, ms):
+        if self.wake_cb is None:
+            time.sleep_ms(ms)
+            return
+
+        # 分片睡眠，每片检查一次唤醒条件 (只读标志位，不访问总线)
+        deadline = time.ticks_add(time.ticks_ms(), ms)
+        while not self.wake_cb():
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                break
+            time.sleep_ms(remaining if remaining < self.poll_ms else self.poll_ms)
+
+    def _update_stats(self, now):
+        window = time.ticks_diff(now, self._window_start)
+        if window < self.report_ms:
+            return
+        self.wakeups_per_s = self._window_wakeups * 1000 // window
+        self.busy_pct = self._window_busy_us // (window * 10)
+        self._window_start = now
+        self._window_wakeups = 0
+        self._window_busy_us = 0
+
+    def post(self, cb, *args):
+        """
+        把回调交给 UI 执行 (在下一次唤醒、运行 LVGL 定时器之前)。
+        供 asyncio 任务使用，避免在任务中途直接修改控件。
+        """
+        self._posted.append((cb, args))
+        self._posted_event.set()
+
+    def _run_posted(self):
+        while self._posted:
+            cb, args = self._posted.pop(0)
+            try:
+                cb(*args)
+            except Exception as e:
+                print(f"Posted callback error: {e}")
+
+    def _step(self):
+        """执行一次唤醒的全部工作，返回还需睡眠的毫秒数"""
+        busy_start = time.ticks_us()
+        now = self._advance_tick()
+
+        self._run_posted()
+        if self.before_cb is not None:
+            self.before_cb()
+
+        next_ms = lv.timer_handler()
+        if next_ms == _NO_TIMER_READY or next_ms > self.max_sleep_ms:
+            next_ms = self.max_sleep_ms
+        elif next_ms < self.min_sleep_ms:
+            next_ms = self.min_sleep_ms
+
+        if self.idle_cb is not None:
+            self.idle_cb(next_ms)
+
+        self._window_busy_us += time.ticks_diff(time.ticks_us(), busy_start)
+        self._window_wakeups += 1
+        self.total_wakeups += 1
+        self._update_stats(now)
+
+        # 空闲回调可能已用掉一部分时间，只睡剩下的
+        spent = time.ticks_diff(time.ticks_ms(), now)
+        return next_ms - spent if next_ms > spent else 0
+
+    def run_once(self):
+        ms = self._step()
+        if ms > 0:
+            self._sleep(ms)
+
+    async def _wait_posted(self, ms):
+        """睡眠 ms 毫秒，期间有 post() 时提前返回 True"""
+        try:
+            await asyncio.wait_for(self._posted_event.wait(), ms / 1000)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _sleep_async(self, ms):
+        if self._posted:
+            return
+        self._posted_event.clear()
+        if self.wake_cb is None:
+            # 只有 post() 能提前唤醒，一次睡到下一个定时器
+            await self._wait_posted(ms)
+            return
+
+        # 触摸 IRQ 只置标志位，需要分片检查
+        deadline = time.ticks_add(time.ticks_ms(), ms)
+        while not self.wake_cb():
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                break
+            if await self._wait_posted(remaining if remaining < self.poll_ms else self.poll_ms):
+                break
+
+    def get_stats(self):
+        return {
+            'wakeups_per_s': self.wakeups_per_s,
+            'busy_pct': self.busy_pct,
+            'total_wakeups': self.total_wakeups,
+        }
+
+    def run(self):
+        while True:
+            try:
+                self.run_once()
+            except MemoryError:
+                print("CRITICAL: Memory low, performing emergency GC")
+                gc.collect()
+
+    async def run_async(self):
+        while True:
+            try:
+                ms = self._step()
+            except MemoryError:
+                print("CRITICAL: Memory low, performing emergency GC")
+                gc.collect()
+                ms = 0
+            # 即使不需要睡眠也要让出一次，保证网络任务能推进
+            if ms > 0:
+                await self._sleep_async(ms)
+            else:
+                await asyncio.sleep_ms(0)
@@ -0,0 +1,219 @@
+# screen_registry.py - 屏幕注册表与 LRU 缓存
+#
+# 每个屏幕登记一个构建函数、估算内存占用和保活优先级。切换时按需构建，
+# 已构建屏幕的估算总占用超过预算时，按"优先级低者先、最久未用者先"清理，
+# 这样在心率/运动之间来回滑动不会每次都重建。
+#
+# 构建函数可以写成生成器：每个 yield 是一个切片点。空闲帧里预热相邻屏幕时
+# 只执行到时间片用完，下一帧从断点继续；真正切换过去时再一次性补完。
+
+import gc
+import time
+import lvgl as lv
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+PRIORITY_PINNED = 3  # 永不清理 (时间、天气等常驻页面)
+
+
+class _Entry:
+    def __init__(self, name, screen, builder, cost, priority):
+        self.name = name
+        self.screen = screen
+        self.builder = builder
+        self.cost = cost
+        self.priority = priority
+        self.builds = 0
+        self.last_used = 0
+        self.pending = None  # 未完成的生成器构建函数
+
+
+class ScreenRegistry:
+    """
+    budget: 已构建屏幕估算占用之和的上限 (字节)，固定页面不计入
+    on_evict: 清理一个屏幕后调用 (例如登记一次 GC)
+    low_water: 剩余内存低于该值时取消正在进行的预热
+    max_slice_ms: 每个空闲帧用于预热的最长时间
+    """
+
+    def __init__(self, budget=48 * 1024, on_evict=None, low_water=24 * 1024, max_slice_ms=8):
+        self.budget = budget
+        self.on_evict = on_evict
+        self.low_water = low_water
+        self.max_slice_ms = max_slice_ms
+        self._entries = []
+        self._use_counter = 0
+        self._warm = []
+
+        # 统计信息
+        self.switches = 0
+        self.evictions = 0
+        self.last_switch_us = 0
+        self.max_switch_us = 0
+        self.warmups = 0
+        self.warmups_cancelled = 0
+
+    def register(self, name, screen, builder=None, cost=0, priority=PRIORITY_NORMAL):
+        self._entries.append(_Entry(name, screen, builder, cost, priority))
+
+    def _find(self, screen):
+        for entry in self._entries:
+            if entry.screen == screen:
+                return entry
+        return None
+
+    def is_built(self, screen):
+        entry = self._find(screen)
+        if entry is None or entry.builder is None:
+            return True
+        return entry.pending is None and entry.screen.get_child_count() > 0
+
+    def _run_builder(self, entry, deadline=None):
+        """
+        执行 (或继续执行) 构建函数。deadline 为 ticks_us 截止时间，
+        None 表示一次执行完。返回 True 表示构建已完成。
+        """
+        if entry.pending is None:
+            result = entry.builder()
+            if not hasattr(result, 'send'):
+                # 普通函数，已经一次构建完成
+                entry.builds += 1
+                return True
+            entry.pending = result
+
+        try:
+            while True:
+                next(entry.pending)
+                if deadline is not None and time.ticks_diff(deadline, time.ticks_us()) <= 0:
+                    return False
+        except StopIteration:
+            entry.pending = None
+            entry.builds += 1
+            return True
+
+    def _cancel(self, entry):
+        entry.pending.close()
+        entry.pending = None
+        entry.screen.clean()
+        self.warmups_cancelled += 1
+
+    def ensure(self, screen):
+        """确保屏幕已构建，并标记为最近使用"""
+        entry = self._find(screen)
+        if entry is None:
+            return
+        self._use_counter += 1
+        entry.last_used = self._use_counter
+        if entry.builder is None:
+            return
+        if entry.pending is not None or entry.screen.get_child_count() == 0:
+            self._run_builder(entry)
+
+    def show(self, screen, load_cb=None):
+        """
+        构建 (如需要) 并加载屏幕，然后按预算清理其它屏幕。
+        load_cb 可替换默认的 lv.screen_load (例如带动画的切换)。
+        """
+        start = time.ticks_us()
+        self.ensure(screen)
+        if load_cb is not None:
+            load_cb(screen)
+        else:
+            lv.screen_load(screen)
+        self.last_switch_us = time.ticks_diff(time.ticks_us(), start)
+        if self.last_switch_us > self.max_switch_us:
+            self.max_switch_us = self.last_switch_us
+        self.switches += 1
+        self.evict(keep=screen)
+
+    def built_cost(self):
+        total = 0
+        for entry in self._entries:
+            if entry.priority != PRIORITY_PINNED and entry.builder is not None \
+                    and entry.screen.get_child_count() > 0:
+                total += entry.cost
+        return total
+
+    def evict(self, keep=None):
+        """清理屏幕直到估算占用不超过预算；keep 和当前活动屏幕不会被清理"""
+        active = lv.screen_active()
+        total = self.built_cost()
+        while total > self.budget:
+            victim = None
+            for entry in self._entries:
+                if entry.priority == PRIORITY_PINNED or entry.builder is None:
+                    continue
+                if entry.screen == keep or entry.screen == active:
+                    continue
+                if entry.screen.get_child_count() == 0:
+                    continue
+                if victim is None or entry.priority < victim.priority or \
+                        (entry.priority == victim.priority and entry.last_used < victim.last_used):
+                    victim = entry
+            if victim is None:
+                break
+            if victim.pending is not None:
+                victim.pending.close()
+                victim.pending = None
+            victim.screen.clean()
+            total -= victim.cost
+            self.evictions += 1
+            print(f"Memory Cleanup: Screen {victim.name} unloaded")
+            if self.on_evict is not None:
+                self.on_evict()
+
+    def prefetch(self, screens):
+        """设置需要在空闲时预热的屏幕 (通常是左右相邻页面)"""
+        self._warm = [s for s in screens if s != lv.screen_active()]
+
+    def cancel_warm_up(self):
+        for entry in self._entries:
+            if entry.pending is not None:
+                self._cancel(entry)
+
+    def idle(self, idle_ms):
+        """
+        在空闲帧里推进一个预热目标的构建，最多占用 max_slice_ms。
+        返回 True 表示本帧做了预热工作。
+        """
+        if not self._warm or idle_ms <= 1:
+            return False
+
+        if gc.mem_free() < self.low_water:
+            self.cancel_warm_up()
+            return False
+
+        for screen in self._warm:
+            entry = self._find(screen)
+            if entry is None or entry.builder is None:
+                continue
+            if entry.pending is None:
+                if entry.screen.get_child_count() > 0:
+                    continue
+                # 预热不应挤掉别的页面：放不下就不预热
+                if self.built_cost() + entry.cost > self.budget:
+                    continue
+
+            slice_ms = idle_ms - 1 if idle_ms - 1 < self.max_slice_ms else self.max_slice_ms
+            deadline = time.ticks_add(time.ticks_us(), slice_ms * 1000)
+            if self._run_builder(entry, deadline):
+                self.warmups += 1
+            return True
+        return False
+
+    def get_stats(self):
+        builds = {}
+        for entry in self._entries:
+            if entry.builder is not None:
+                builds[entry.name] = entry.builds
+        return {
+            'switches': self.switches,
+            'evictions': self.evictions,
+            'last_switch_us': self.last_switch_us,
+            'max_switch_us': self.max_switch_us,
+            'built_cost': self.built_cost(),
+            'warmups': self.warmups,
+            'warmups_cancelled': self.warmups_cancelled,
+            'builds': builds,
+        }
@@ -11,18 +11,33 @@ gc.collect()
 
 import lvgl as lv
 import time
-import urequests
-import json
 import ntptime
-import fs_driver
 import random 
 import math
+from array import array
 try:
     import neopixel
 except ImportError:
     neopixel = None
 from display_driver import init_display, init_touch
 from cst816s import GESTURE_SWIPE_LEFT, GESTURE_SWIPE_RIGHT, GESTURE_SWIPE_UP, GESTURE_SWIPE_DOWN
+from gesture import GestureRecognizer
+from scheduler import MainLoop
+from mem_manager import MemoryManager
+from screen_registry import ScreenRegistry, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH, PRIORITY_PINNED
+from transition import SnapshotTransition, TRANSITION_SLIDE
+from response_cache import ResponseCache
+from rate_table import RateTable
+from wifi_manager import WifiManager
+from icon_atlas import IconAtlas
+from glyph_cache import CachedFont
+from chart_source import RingChartSource, EcgSimulator
+import font_registry  # libs/font_registry/，与示例共用，需放到设备的 /lib
+import http_client
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 import config # 导入配置文件
 
 # ===== 配置信息 (从 config.py 加载) =====
@@ -36,31 +51,50 @@ WEATHER_KEY = config.WEATHER_KEY
 WEATHER_URL = f"{config.WEATHER_API_URL}?key={WEATHER_KEY}&location={CITY}&language=zh-Hans&unit=c"
 huilv_aip_key = config.HUILV_API_KEY
 
+# 集中式内存管理：常规回收只在主循环空闲帧执行
+mem = MemoryManager()
+
+# 接口响应缓存 (保存在 flash，重启后先显示上次结果)
+cache = ResponseCache()
+WEATHER_TTL = 1800   # 天气缓存 30 分钟
+EXCHANGE_TTL = 600   # 汇率缓存 10 分钟
+
+# 心电图：2 秒窗口按最小/最大值抽取到图表的 60 个点
+# 没有接真实 PPG/ECG 传感器时用 EcgSimulator 代替，接入后替换 ecg_sensor 即可
+ECG_RATE_HZ = 250
+ECG_BLOCKS_PER_S = 10
+ecg = RingChartSource(capacity=2 * ECG_RATE_HZ, points=60)
+ecg_sensor = EcgSimulator(ECG_RATE_HZ)
+ecg_block = array('h', [0]) * (ECG_RATE_HZ // ECG_BLOCKS_PER_S)
+
 # ===== 初始化显示与输入 =====
 lv.init()
 display = init_display()
-touch = init_touch()
-
-# 注册文件系统以便加载字体 (参考 watch_th.py)
-try:
-    fs_drv = lv.fs_drv_t()
-    fs_driver.fs_register(fs_drv, 'S')
-    # 尝试加载中文字体，优先尝试 assets 中的字体
-    # 如果 watch_th.py 中的 myfont_18.bin 存在于根目录或 S: 盘，也可以尝试
+# 软件手势识别：抬起手指的同一帧给出滑动方向，无需冷却时间防连跳
+gestures = GestureRecognizer()
+touch = init_touch(recognizer=gestures)
+
+# 中文字体：优先使用按界面文字裁剪的子集 (tools/font_subset.py 生成)，
+# 其次是 watch_th.py 的 myfont_16/18.bin，最后是完整的 PHT 字库
+font_registry.register("cn-ui", [
+    "font_cn_16.bin",
+    "myfont_16.bin",
+    "myfont_18.bin",
+    "assets/font/font-PHT-cn-20.fnt",
+])
+font_registry.ensure_fs()  # 下拉框箭头等图片也从 S: 盘读取
+font_cn = font_registry.get("cn-ui", default=lv.font_montserrat_16)
+font_loaded = font_cn is not lv.font_montserrat_16
+
+# 子集之外的字 (如接口返回的天气描述) 从完整字库按需读取，LRU 缓存限额 8KB
+glyph_font = None
+if font_loaded:
     try:
-        font_cn = lv.binfont_create("S:myfont_16.bin")
-    except:
-        try:
-            font_cn = lv.binfont_create("S:myfont_18.bin")
-        except:
-            try:
-                font_cn = lv.binfont_create("S:assets/font/font-PHT-cn-20.fnt")
-            except:
-                font_cn = lv.font_montserrat_16 # 备选
-                print("Warning: Chinese font not found, using Montserrat")
-except Exception as e:
-    print(f"FS/Font init error: {e}")
-    font_cn = lv.font_montserrat_16
+        glyph_font = CachedFont(config.FONT_CN_FALLBACK)
+        font_cn.fallback = glyph_font.font
+    except Exception as e:
+        print(f"Glyph cache unavailable: {e}")
+        glyph_font = None
 
 # ===== 华为手表风格全局样式 =====
 # 参考华为设计规范：https://developer.huawei.com/consumer/cn/doc/design-guides-V1/color-0000001053699747-V1
@@ -149,8 +183,6 @@ except Exception as e:
 # ===== 全局状态 =====
 screens = []
 current_screen_idx = 0
-last_swipe_time = 0
-swipe_cooldown = 800 # 增加冷却时间到 800ms，防止连跳
 current_brightness = 100
 last_weather_code = -1 # 缓存上次的天气代码
 current_led_mode = 0 # 0:常亮, 1:爆闪, 2:呼吸, 3:彩虹, 4:渐进 (待生效)
@@ -172,77 +204,56 @@ sport_duration = 0 # 秒
 is_sporting = False
 
 # ===== 网络功能 (参考 watch_th.py) =====
-def connect_wifi():
-    if not sta_if.isconnected():
-        gc.collect() # 激活前清理内存
-        print("Connecting to WiFi...")
-        try:
-            sta_if.active(True)
-            sta_if.connect(SSID, PASSWORD)
-        except OSError as e:
-            print(f"WiFi Activation Error: {e}")
-            return False
-            
-        max_wait = 15 # 增加等待时间
-        while max_wait > 0:
-            status = sta_if.status()
-            if status == network.STAT_GOT_IP or sta_if.isconnected():
-                print("WiFi Connected. IP:", sta_if.ifconfig()[0])
-                gc.collect()
-                return True
-            elif status == network.STAT_WRONG_PASSWORD:
-                print("WiFi: Wrong Password")
-                return False
-            elif status == network.STAT_NO_AP_FOUND:
-                print("WiFi: AP not found")
-            
-            max_wait -= 1
-            time.sleep(1)
-        print("WiFi Connection Timeout")
-        return False
-    return True
+# 连接在后台状态机中推进 (见 wifi_tick_cb)，射频只在需要时打开
+# 射频关闭且没有需求时 timer_wifi 暂停，有新需求时由 on_wake 恢复
+wifi = WifiManager(
+    sta_if, SSID, PASSWORD,
+    before_connect=lambda: mem.collect("wifi"), # 激活前清理内存
+    on_offline=http_client.close_idle,
+    on_wake=lambda: timer_wifi.resume()
+)
 
 def sync_time():
-    if connect_wifi():
-        try:
-            print("Syncing time via NTP...")
-            ntptime.settime()
-            gc.collect() # 同步后清理
-            
-            # 默认同步北京时间到 RTC
-            utc_ticks = time.time()
-            local_ticks = utc_ticks + TIMEZONES[0]['offset']
-            t = time.localtime(local_ticks)
-            
-            rtc.datetime((t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0))
-            print("Time synced with Beijing offset")
-            return True
-        except Exception as e:
-            print("NTP error:", e)
+    try:
+        print("Syncing time via NTP...")
+        ntptime.settime()
+        mem.request() # 同步后清理
+        
+        # 默认同步北京时间到 RTC
+        utc_ticks = time.time()
+        local_ticks = utc_ticks + TIMEZONES[0]['offset']
+        t = time.localtime(local_ticks)
+        
+        rtc.datetime((t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0))
+        print("Time synced with Beijing offset")
+        return True
+    except Exception as e:
+        print("NTP error:", e)
     return False
 
-def fetch_weather_data():
-    if connect_wifi():
+def weather_cache_key():
+    return "weather:" + CITY
+
+async def fetch_weather_data():
+    if await wifi.wait_online():
         res = None
         try:
             print("Fetching weather...")
-            res = urequests.get(WEATHER_URL, timeout=10) # 增加超时
+            res = await http_client.get(WEATHER_URL, timeout=10) # 增加超时
             if res.status_code == 200:
-                data = res.json()
-                res.close()
-                res = None
-                result = data["results"][0]["now"]
-                del data
-                gc.collect()
-                return result
+                # 只构建 results[0].now，其余字段读过即丢
+                data = await res.json_paths(["results.0.now"])
+                weather = data.get("results.0.now")
+                if weather:
+                    cache.put(weather_cache_key(), weather)
+                return weather
             else:
                 print(f"Weather API Error: {res.status_code}")
-                if res: res.close()
         except Exception as e:
             print(f"Weather Fetch Error: {e}")
-            if res: res.close()
         finally:
-            gc.collect()
+            if res: await res.close()
+            mem.request()
     return None
 
 # ===== UI 组件创建 =====
@@ -282,6 +293,8 @@ label_w_city.set_text(city_name_cn)
 label_w_city.add_style(style_title, 0)
 label_w_city.align(lv.ALIGN.TOP_MID, 0, 30)
 
+# 天气图标图集 (tools/build_weather_atlas.py 生成)
+icon_atlas = IconAtlas()
 img_w_icon = lv.image(screen_weather)
 img_w_icon.align(lv.ALIGN.CENTER, 0, -30)
 img_w_icon.set_size(64, 64)
@@ -320,6 +333,7 @@ def init_screen_heart():
     label_h_unit.set_text("BPM")
     label_h_unit.add_style(style_subtext, 0)
     label_h_unit.align_to(label_h_val, lv.ALIGN.OUT_RIGHT_BOTTOM, 5, -10)
+    yield
     
     # 心电图 Chart
     global chart_ecg, ser_ecg
@@ -335,7 +349,8 @@ def init_screen_heart():
     chart_ecg.set_style_bg_opa(0, 0)
     chart_ecg.set_style_border_opa(0, 0)
     ser_ecg = chart_ecg.add_series(COLOR_HUAWEI_WARNING, lv.chart.AXIS.PRIMARY_Y)
-    gc.collect()
+    ecg.bind(chart_ecg, ser_ecg)
+    mem.request()
 
 # 4. 运动屏幕
 screen_sport = lv.obj()
@@ -375,7 +390,7 @@ def init_screen_sport():
     btn_start_label.set_style_text_font(font_cn, 0)
     btn_start_label.center()
     btn_start_sport.add_event_cb(start_sport_event_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # 5. 正在运动子页面
 screen_sport_running = lv.obj()
@@ -406,7 +421,7 @@ def init_screen_sport_running():
     btn_stop_label.set_style_text_font(font_cn, 0)
     btn_stop_label.center()
     btn_stop_sport.add_event_cb(stop_sport_event_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 def start_sport_event_cb(e):
     global is_sporting, sport_duration, sport_steps, sport_calories, sport_distance
@@ -416,21 +431,21 @@ def start_sport_event_cb(e):
     sport_calories = 0
     sport_distance = 0.0
     
-    # 确保子页面已初始化
-    init_screen_sport_running()
-    
-    label_duration.set_text("00:00")
     # 检查 UI 对象是否存在（由于延迟加载）
     if 'label_steps' in globals():
         label_steps.set_text("步数: 0")
         label_calories.set_text("消耗: 0 kcal")
         label_distance.set_text("距离: 0.00 km")
-    lv.screen_load(screen_sport_running)
+
+    # 确保子页面已初始化
+    registry.ensure(screen_sport_running)
+    label_duration.set_text("00:00")
+    registry.show(screen_sport_running)
 
 def stop_sport_event_cb(e):
     global is_sporting
     is_sporting = False
-    lv.screen_load(screen_sport)
+    registry.show(screen_sport)
 
 # 6. 汇率查询屏幕
 screen_exchange = lv.obj()
@@ -444,7 +459,7 @@ def init_screen_exchange():
     label_exc_title.add_style(style_title, 0)
     label_exc_title.align(lv.ALIGN.TOP_MID, 0, 30)
     
-    currency_options = "CNY\nUSD\nEUR\nJPY\nHKD\nGBP\nAUD\nCAD"
+    currency_options = "\n".join(CURRENCIES)
     
     global dd_from, dd_to, label_exc_status
     dd_from = lv.dropdown(screen_exchange)
@@ -458,6 +473,7 @@ def init_screen_exchange():
     dd_from.set_style_text_font(font_cn, 0)
     dd_from_list = dd_from.get_list()
     if dd_from_list: dd_from_list.set_style_text_font(font_cn, 0)
+    yield
     
     dd_to = lv.dropdown(screen_exchange)
     dd_to.set_options(currency_options)
@@ -471,6 +487,7 @@ def init_screen_exchange():
     dd_to.set_style_text_font(font_cn, 0)
     dd_to_list = dd_to.get_list()
     if dd_to_list: dd_to_list.set_style_text_font(font_cn, 0)
+    yield
     
     label_arrow = lv.label(screen_exchange)
     label_arrow.set_text("→")
@@ -492,7 +509,7 @@ def init_screen_exchange():
     label_exc_status.add_style(style_subtext, 0)
     label_exc_status.set_style_text_color(lv.color_hex(0xFFD700), 0) # 金色提示
     label_exc_status.align(lv.ALIGN.BOTTOM_MID, 0, -20)
-    gc.collect()
+    mem.request()
 
 # 6.5 汇率结果屏幕
 screen_exchange_result = lv.obj()
@@ -529,12 +546,24 @@ def init_screen_exchange_result():
     btn_res_back_lbl.set_style_text_font(font_cn, 0)
     btn_res_back_lbl.center()
     btn_res_back.add_event_cb(back_to_exchange_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 def back_to_exchange_cb(e):
-    lv.screen_load(screen_exchange)
+    registry.show(screen_exchange)
+
+exchange_task = None
+
+# 汇率查询页面支持的货币；交叉汇率由一张美元基准表本地计算
+CURRENCIES = ["CNY", "USD", "EUR", "JPY", "HKD", "GBP", "AUD", "CAD"]
+rate_table = RateTable(cache, config.EXCHANGE_RATE_API, CURRENCIES)
+rate_table.load()
 
 def query_exchange_event_cb(e):
+    global exchange_task
+    # 上一次查询尚未结束时忽略重复点击
+    if exchange_task is not None:
+        return
+
     # 获取选中的货币字符串 (增加缓冲区大小并检查)
     from_buf = " "*16
     dd_from.get_selected_str(from_buf, len(from_buf))
@@ -547,7 +576,7 @@ def query_exchange_event_cb(e):
     # 立即清理缓冲区字符串
     del from_buf
     del to_buf
-    gc.collect()
+    mem.request()
     
     # 调试打印，检查获取到的货币代码
     print("Debug - From: [{}], To: [{}]".format(from_coin, to_coin))
@@ -556,8 +585,53 @@ def query_exchange_event_cb(e):
         label_exc_status.set_text("错误: 货币选择无效")
         return
     
+    # 汇率表未过期时本地计算，立即显示结果
+    if rate_table.is_fresh():
+        rate = rate_table.rate(from_coin, to_coin)
+        if rate is not None:
+            show_exchange_result(from_coin, to_coin, rate, rate)
+            return
+
+    # 同一币种对在缓存有效期内直接显示，不再请求接口
+    cached = cache.get(exchange_cache_key(from_coin, to_coin), EXCHANGE_TTL)
+    if cached is not None:
+        show_exchange_result(from_coin, to_coin, cached[0], cached[1])
+        return
+
     label_exc_status.set_text("正在查询...")
+    # 请求在后台协程中进行，等待期间界面和触摸照常响应
+    exchange_task = asyncio.create_task(query_exchange_task(from_coin, to_coin))
+
+def exchange_cache_key(from_coin, to_coin):
+    return "fxrate:{}:{}".format(from_coin, to_coin)
+
+def set_exchange_status(text):
+    # 协程返回结果时查询页面可能已被清理
+    if registry.is_built(screen_exchange):
+        label_exc_status.set_text(text)
+
+def show_exchange_result(from_coin, to_coin, val, rate):
+    # 用户已离开查询页面时不再强制跳转
+    if lv.screen_active() != screen_exchange:
+        return
+
+    # 主显示：1 CNY = 0.1437 USD
+    main_text = "1 {} = {} {}".format(from_coin, val, to_coin)
+    # 副显示：汇率: 0.1437
+    rate_text = "汇率: {}".format(rate)
     
+    # 确保结果页面已初始化
+    registry.ensure(screen_exchange_result)
+    
+    # 分别设置到两个 Label
+    label_res_val.set_text(main_text)
+    label_res_rate.set_text(rate_text)
+    
+    label_exc_status.set_text("") # 清空查询页面的状态
+    registry.show(screen_exchange_result)
+
+async def query_exchange_task(from_coin, to_coin):
+    global exchange_task
     url = "https://apis.tianapi.com/fxrate/index"
     api_key = huilv_aip_key
     # POST 参数使用 x-www-form-urlencoded 格式
@@ -566,18 +640,33 @@ def query_exchange_event_cb(e):
     
     print("Exchange API Request: {} data={}".format(url, params))
     
-    if connect_wifi():
+    try:
+        if not await wifi.wait_online():
+            main_loop.post(set_exchange_status, "请先连接 WiFi")
+            return
+
+        # 先刷新汇率表 (一次请求覆盖所有币种对)，失败再逐对查询
+        try:
+            if await rate_table.refresh():
+                rate = rate_table.rate(from_coin, to_coin)
+                if rate is not None:
+                    main_loop.post(show_exchange_result, from_coin, to_coin, rate, rate)
+                    return
+        except Exception as ex:
+            print("Rate table refresh error: {}".format(ex))
+        finally:
+            mem.request()
+
         retry_count = 2
-        success = False
-        while retry_count >= 0 and not success:
+        while retry_count >= 0:
+            res = None
             try:
-                gc.collect() # 请求前清理内存
-                res = urequests.post(url, data=params, headers=headers, timeout=10)
+                mem.collect() # 请求前清理内存
+                res = await http_client.post(url, data=params, headers=headers, timeout=10)
                 print("Response Status: {} (Retries left: {})".format(res.status_code, retry_count))
                 
-                # 分步解析以减少内存峰值
-                data_all = res.json()
-                res.close()
+                # 流式解析，只保留需要的三个字段
+                data_all = await res.json_paths(["code", "msg", "result"])
                 
                 if data_all.get("code") == 200:
                     result = data_all.get("result")
@@ -588,42 +677,38 @@ def query_exchange_event_cb(e):
                         
                         if rate is None: rate = result.get("money")
                         if val is None: val = result.get("money")
-                        
-                        # 主显示：1 CNY = 0.1437 USD
-                        main_text = "1 {} = {} {}".format(from_coin, val, to_coin)
-                        # 副显示：汇率: 0.1437
-                        rate_text = "汇率: {}".format(rate)
-                        
-                        # 确保结果页面已初始化
-                        init_screen_exchange_result()
-                        
-                        # 分别设置到两个 Label
-                        label_res_val.set_text(main_text)
-                        label_res_rate.set_text(rate_text)
-                        
-                        label_exc_status.set_text("") # 清空查询页面的状态
-                        lv.screen_load(screen_exchange_result)
-                        success = True
+                        cache.put(exchange_cache_key(from_coin, to_coin), [val, rate])
+                        main_loop.post(show_exchange_result, from_coin, to_coin, val, rate)
                     else:
-                        label_exc_status.set_text("未获取到汇率结果")
-                        success = True 
+                        main_loop.post(set_exchange_status, "未获取到汇率结果")
                 else:
-                    label_exc_status.set_text("失败: {}".format(data_all.get('msg', '未知错误')))
-                    success = True 
+                    main_loop.post(set_exchange_status, "失败: {}".format(data_all.get('msg', '未知错误')))
                 
                 # 显式清理
                 del data_all
-                gc.collect()
+                return
             except Exception as ex:
                 print("Exchange Query Error: {} (Retries left: {})".format(ex, retry_count))
                 retry_count -= 1
                 if retry_count < 0:
-                    label_exc_status.set_text("网络连接中断\n请重试")
+                    # 网络不可用时退回到过期的缓存结果
+                    stale = cache.get_stale(exchange_cache_key(from_coin, to_coin))
+                    if stale is None:
+                        rate = rate_table.rate(from_coin, to_coin)
+                        if rate is not None:
+                            stale = [rate, rate]
+                    if stale is not None:
+                        main_loop.post(show_exchange_result, from_coin, to_coin, stale[0], stale[1])
+                    else:
+                        main_loop.post(set_exchange_status, "网络连接中断\n请重试")
                 else:
-                    time.sleep(1) # 等待一秒后重试
-                gc.collect()
-    else:
-        label_exc_status.set_text("请先连接 WiFi")
+                    main_loop.post(set_exchange_status, "正在重试 ({})...".format(2 - retry_count))
+                    await asyncio.sleep(1) # 等待一秒后重试，不阻塞界面
+            finally:
+                if res: await res.close()
+                mem.request()
+    finally:
+        exchange_task = None
 
 # 7. 二维码屏幕 (华为支付样式)
 screen_qr = lv.obj()
@@ -639,12 +724,13 @@ def init_screen_qr():
     qr_data = "https://lvgl.io"
     qr.update(qr_data, len(qr_data))
     qr.align(lv.ALIGN.CENTER, 0, -20)
+    yield
     
     label_qr = lv.label(screen_qr)
     label_qr.set_text("扫码支付")
     label_qr.add_style(style_title, 0)
     label_qr.align(lv.ALIGN.BOTTOM_MID, 0, -25)
-    gc.collect()
+    mem.request()
 
 # 7.5 豆包对话屏幕
 screen_doubao = lv.obj()
@@ -681,7 +767,7 @@ def init_screen_doubao():
         print(f"Microphone toggled: {'ON' if is_mic_on else 'OFF'}")
         
     btn_mic.add_event_cb(mic_event_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # 8. 系统信息屏幕
 screen_sys = lv.obj()
@@ -695,14 +781,30 @@ def init_screen_sys():
     label_sys_title.add_style(style_title, 0)
     label_sys_title.align(lv.ALIGN.TOP_MID, 0, 30)
 
-    global label_uptime, label_mem
+    global label_uptime, label_mem, label_gc, label_loop, label_glyph, label_font
     label_uptime = lv.label(screen_sys)
     label_uptime.add_style(style_subtext, 0)
-    label_uptime.align(lv.ALIGN.CENTER, 0, -15)
+    label_uptime.align(lv.ALIGN.CENTER, 0, -60)
 
     label_mem = lv.label(screen_sys)
     label_mem.add_style(style_subtext, 0)
-    label_mem.align(lv.ALIGN.CENTER, 0, 15)
+    label_mem.align(lv.ALIGN.CENTER, 0, -38)
+
+    label_gc = lv.label(screen_sys)
+    label_gc.add_style(style_subtext, 0)
+    label_gc.align(lv.ALIGN.CENTER, 0, -16)
+
+    label_loop = lv.label(screen_sys)
+    label_loop.add_style(style_subtext, 0)
+    label_loop.align(lv.ALIGN.CENTER, 0, 6)
+
+    label_glyph = lv.label(screen_sys)
+    label_glyph.add_style(style_subtext, 0)
+    label_glyph.align(lv.ALIGN.CENTER, 0, 28)
+
+    label_font = lv.label(screen_sys)
+    label_font.add_style(style_subtext, 0)
+    label_font.align(lv.ALIGN.CENTER, 0, 50)
 
     # 返回按钮
     btn_back = lv.button(screen_sys)
@@ -715,10 +817,10 @@ def init_screen_sys():
     lbl_back.center()
 
     def back_event_cb(e):
-        lv.screen_load(screen_settings)
+        registry.show(screen_settings)
 
     btn_back.add_event_cb(back_event_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # 9. 设置菜单主屏幕
 screen_settings = lv.obj()
@@ -765,10 +867,10 @@ def init_screen_settings():
     label_set_title.align(lv.ALIGN.TOP_MID, 0, 20)
 
     # 菜单项
-    create_menu_item(screen_settings, "城市设置", 65, lambda e: (init_screen_set_region(), lv.screen_load(screen_set_region)))
-    create_menu_item(screen_settings, "亮度设置", 115, lambda e: (init_screen_set_brightness(), lv.screen_load(screen_set_brightness)))
-    create_menu_item(screen_settings, "系统信息", 165, lambda e: (init_screen_sys(), lv.screen_load(screen_sys)))
-    gc.collect()
+    create_menu_item(screen_settings, "城市设置", 65, lambda e: registry.show(screen_set_region))
+    create_menu_item(screen_settings, "亮度设置", 115, lambda e: registry.show(screen_set_brightness))
+    create_menu_item(screen_settings, "系统信息", 165, lambda e: registry.show(screen_sys))
+    mem.request()
 
 # 9.1 区域设置子页面
 def init_screen_set_region():
@@ -795,6 +897,7 @@ def init_screen_set_region():
     
     dd_list = dd_city.get_list()
     if dd_list: dd_list.set_style_text_font(font_cn, 0)
+    yield
     
     for i, city in enumerate(CHINESE_CITIES):
         if city["id"] == CITY:
@@ -817,10 +920,10 @@ def init_screen_set_region():
         WEATHER_URL = f"{config.WEATHER_API_URL}?key={WEATHER_KEY}&location={CITY}&language=zh-Hans&unit=c"
         label_w_city.set_text(CHINESE_CITIES[selected_idx]["name"])
         update_weather_cb(None)
-        lv.screen_load(screen_settings)
+        registry.show(screen_settings)
 
     btn_save.add_event_cb(save_region_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # 9.2 亮度设置子页面
 def init_screen_set_brightness():
@@ -863,10 +966,10 @@ def init_screen_set_brightness():
         global current_brightness
         current_brightness = slider_brightness.get_value()
         set_screen_brightness(current_brightness)
-        lv.screen_load(screen_settings)
+        registry.show(screen_settings)
 
     btn_save.add_event_cb(save_bright_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # --- LED 控制页面 ---
 screen_led = lv.obj()
@@ -905,11 +1008,15 @@ def init_screen_led():
     dd_led_mode.set_style_text_font(font_cn, 0)
     dd_led_mode_list = dd_led_mode.get_list()
     if dd_led_mode_list: dd_led_mode_list.set_style_text_font(font_cn, 0)
+    yield
     
     global slider_led_r, label_val_r, slider_led_g, label_val_g, slider_led_b, label_val_b
     slider_led_r, label_val_r = create_led_slider(-15, 0xFF3B30, "R") # 红色调优
+    yield
     slider_led_g, label_val_g = create_led_slider(15, 0x34C759, "G") # 绿色调优
+    yield
     slider_led_b, label_val_b = create_led_slider(45, 0x007AFF, "B") # 蓝色调优
+    yield
 
     dd_led_mode.add_event_cb(dd_led_mode_event_cb, lv.EVENT.VALUE_CHANGED, None)
     slider_led_r.add_event_cb(sliders_led_event_cb, lv.EVENT.VALUE_CHANGED, None)
@@ -924,6 +1031,7 @@ def init_screen_led():
     label_val_b.set_text(str(active_led_b))
     rect_preview.set_style_bg_color(lv.color_make(active_led_r, active_led_g, active_led_b), 0)
     dd_led_mode.set_selected(active_led_mode)
+    yield
 
     cont_btns = lv.obj(screen_led)
     cont_btns.set_size(220, 50)
@@ -951,7 +1059,7 @@ def init_screen_led():
     btn_led_close_lbl.set_style_text_font(font_cn, 0)
     btn_led_close_lbl.center()
     btn_led_close.add_event_cb(led_close_event_cb, lv.EVENT.CLICKED, None)
-    gc.collect()
+    mem.request()
 
 # RGB 滑块辅助函数
 def create_led_slider(y_offset, color_hex, label_text):
@@ -1022,6 +1130,28 @@ def led_close_event_cb(e):
 # 移除了 screen_sys，它现在通过设置菜单进入
 screens = [screen_time, screen_weather, screen_heart, screen_sport, screen_exchange, screen_led, screen_qr, screen_doubao, screen_settings]
 
+# 滑动切换动画：只对两张 RGB565 快照做动画，帧开销与控件数量无关
+transition = SnapshotTransition(mode=TRANSITION_SLIDE, duration=250)
+
+# ===== 屏幕注册表 =====
+# 估算占用为经验值 (字节)；时间、天气页面启动时即已创建，常驻不清理
+# 含 yield 的构建函数可在空闲帧中分片预热
+registry = ScreenRegistry(budget=48 * 1024, on_evict=mem.request)
+registry.register("time", screen_time, priority=PRIORITY_PINNED)
+registry.register("weather", screen_weather, priority=PRIORITY_PINNED)
+registry.register("heart", screen_heart, init_screen_heart, 12 * 1024, PRIORITY_NORMAL)
+registry.register("sport", screen_sport, init_screen_sport, 6 * 1024, PRIORITY_NORMAL)
+registry.register("sport_running", screen_sport_running, init_screen_sport_running, 4 * 1024, PRIORITY_NORMAL)
+registry.register("exchange", screen_exchange, init_screen_exchange, 14 * 1024, PRIORITY_NORMAL)
+registry.register("exchange_result", screen_exchange_result, init_screen_exchange_result, 6 * 1024, PRIORITY_LOW)
+registry.register("led", screen_led, init_screen_led, 16 * 1024, PRIORITY_LOW)
+registry.register("qr", screen_qr, init_screen_qr, 10 * 1024, PRIORITY_LOW)
+registry.register("doubao", screen_doubao, init_screen_doubao, 8 * 1024, PRIORITY_LOW)
+registry.register("settings", screen_settings, init_screen_settings, 6 * 1024, PRIORITY_HIGH)
+registry.register("set_region", screen_set_region, init_screen_set_region, 10 * 1024, PRIORITY_LOW)
+registry.register("set_brightness", screen_set_brightness, init_screen_set_brightness, 5 * 1024, PRIORITY_LOW)
+registry.register("sys", screen_sys, init_screen_sys, 5 * 1024, PRIORITY_LOW)
+
 # ===== 逻辑处理 =====
 
 def update_time_cb(t):
@@ -1039,10 +1169,42 @@ def update_time_cb(t):
     except Exception as e:
         print(f"Time update error: {e}")
 
+weather_task = None
+
 def update_weather_cb(t):
+    global weather_task
+    # 城市变更时需要立即按新地址重新获取，取消仍在进行的旧请求
+    if weather_task is not None:
+        weather_task.cancel()
+        weather_task = None
+
+    key = weather_cache_key()
+    cached = cache.get(key, WEATHER_TTL)
+    if cached is not None:
+        apply_weather(cached)
+        return
+    # 缓存已过期：先显示旧数据，后台再刷新
+    stale = cache.get_stale(key)
+    if stale is not None:
+        apply_weather(stale)
+    weather_task = asyncio.create_task(update_weather_task(stale is not None))
+
+async def update_weather_task(have_stale=False):
+    global weather_task
+    # create_task 返回后才开始执行，此时 weather_task 就是本任务
+    task = weather_task
+    try:
+        weather = await fetch_weather_data()
+        # 获取失败但已显示旧数据时保留旧数据，不切换成"离线"
+        if weather or not have_stale:
+            main_loop.post(apply_weather, weather)
+    finally:
+        if weather_task is task:
+            weather_task = None
+
+def apply_weather(weather):
     global last_weather_code
     try:
-        weather = fetch_weather_data()
         if weather:
             label_w_temp.set_text(f"{weather['temperature']}°C")
             label_w_desc.set_text(weather['text'])
@@ -1052,8 +1214,20 @@ def update_weather_cb(t):
             if code == last_weather_code:
                 return
             
-            # 优化：在加载新图标前手动触发 GC，并检查文件是否存在
-            gc.collect()
+            # 优先从预转换的 RGB565A8 图集读取，不需要解码 PNG
+            dsc = None
+            if icon_atlas.available:
+                dsc = icon_atlas.get(code)
+                if dsc is None:
+                    dsc = icon_atlas.get(99) # 未知天气代码
+            if dsc is not None:
+                img_w_icon.set_src(dsc)
+                last_weather_code = code
+                print(f"Weather icon updated: {code} (atlas, {icon_atlas.last_load_us} us)")
+                return
+
+            # 没有图集时退回 PNG 文件：加载前手动触发 GC
+            mem.collect()
             
             # 使用文件系统路径直接设置图片源，减少 MicroPython 内存占用
             try:
@@ -1075,10 +1249,10 @@ def update_weather_cb(t):
                     lv.cache_drop_all(None)
             except:
                 pass
-            gc.collect() 
+            mem.request() 
         else:
             label_w_desc.set_text("离线")
-            gc.collect()
+            mem.request()
     except Exception as e:
         print(f"Weather update error: {e}")
 
@@ -1091,10 +1265,24 @@ def update_sys_cb(t):
     try:
         uptime_s = time.ticks_diff(time.ticks_ms(), start_ticks) // 1000
         label_uptime.set_text("运行时间: {}s".format(uptime_s))
-        gc.collect()
         mem_free = gc.mem_free()
-        mem_alloc = gc.mem_alloc()
         label_mem.set_text("内存剩余: {} KB".format(mem_free // 1024))
+        label_gc.set_text("GC: {}次 {}ms 峰值{}ms".format(
+            mem.collections, mem.last_us // 1000, mem.max_us // 1000))
+        label_loop.set_text("唤醒: {}/s 占用: {}%".format(main_loop.wakeups_per_s, main_loop.busy_pct))
+        if glyph_font is not None:
+            stats = glyph_font.cache.get_stats()
+            label_glyph.set_text("字形缓存: {}个 {}B 命中{}%".format(
+                stats['glyphs'], stats['bytes'], stats['hit_rate']))
+        else:
+            label_glyph.set_text("字形缓存: 未启用")
+        fonts = font_bytes = font_ms = 0
+        for info in font_registry.registry.get_stats().values():
+            if info['loaded'] and not info['builtin']:
+                fonts += 1
+                font_bytes += info['bytes']
+                font_ms += info['load_ms']
+        label_font.set_text("字体: {}个 {}KB 加载{}ms".format(fonts, font_bytes // 1024, font_ms))
     except Exception as e:
         print(f"System update error: {e}")
 
@@ -1110,17 +1298,20 @@ def update_heart_cb(t):
         if new_val < 60: new_val = 60
         if new_val > 100: new_val = 100
         label_h_val.set_text(str(new_val))
-        
-        # 模拟心电图波动
-        if random.random() > 0.8: # 20% 概率产生波动
-            ecg_val = random.randint(40, 90)
-        else:
-            ecg_val = random.randint(20, 30)
-        
-        chart_ecg.set_next_value(ser_ecg, ecg_val)
     except Exception as e:
         print(f"Heart rate update error: {e}")
 
+def update_ecg_cb(t):
+    # 传感器数据成块写入环形缓冲，图表每帧最多刷新一次
+    if lv.screen_active() != screen_heart:
+        return
+    try:
+        n = ecg_sensor.read(ecg_block)
+        ecg.push(ecg_block, n)
+        ecg.flush()
+    except Exception as e:
+        print(f"ECG update error: {e}")
+
 def update_sport_cb(t):
     global sport_steps, sport_calories, sport_distance, sport_duration
     if not is_sporting:
@@ -1210,22 +1401,41 @@ def update_led_effect_cb(t):
     except Exception as e:
         print(f"LED effect update error: {e}")
 
+def wifi_tick_cb(t):
+    # 推进 WiFi 连接状态机，每次只读一次状态
+    wifi.tick()
+    if wifi.sleeping:
+        timer_wifi.pause()
+
 # 创建定时器
 timer_time = lv.timer_create(update_time_cb, 500, None) # 降低刷新频率到 500ms
 timer_weather = lv.timer_create(update_weather_cb, 3600000, None) # 每小时更新一次
 timer_sys = lv.timer_create(update_sys_cb, 2000, None) # 降低到 2000ms，系统信息不需要频繁更新
 timer_heart = lv.timer_create(update_heart_cb, 1000, None) # 降低到 1000ms
+timer_ecg = lv.timer_create(update_ecg_cb, 1000 // ECG_BLOCKS_PER_S, None)
 timer_sport = lv.timer_create(update_sport_cb, 2000, None) # 降低到 2000ms
 timer_led = lv.timer_create(update_led_effect_cb, 200, None) # 降低到 200ms
+timer_wifi = lv.timer_create(wifi_tick_cb, 250, None)
+
+# 心电图只在心率页面显示：离开页面时暂停 10Hz 的 timer_ecg，回到页面时恢复
+def heart_screen_event_cb(e):
+    if e.get_code() == lv.EVENT.SCREEN_LOADED:
+        timer_ecg.resume()
+    else:
+        timer_ecg.pause()
+
+timer_ecg.pause()
+screen_heart.add_event_cb(heart_screen_event_cb, lv.EVENT.SCREEN_LOADED, None)
+screen_heart.add_event_cb(heart_screen_event_cb, lv.EVENT.SCREEN_UNLOADED, None)
 
 def switch_screen(direction):
     global current_screen_idx, is_mic_on
     
-    # 记录旧页面，用于后续清理
-    old_screen_idx = current_screen_idx
-    
+    # 快照实际显示的页面：可能是设置等子页面，不一定是 screens 中的一页
+    old_screen = lv.screen_active()
+
     # 如果当前页面是豆包页面，且即将切走，则重置 mic 状态
-    if screens[current_screen_idx] == screen_doubao:
+    if old_screen == screen_doubao:
         if 'is_mic_on' in globals() and is_mic_on:
             is_mic_on = False
             if 'btn_mic' in globals():
@@ -1240,42 +1450,15 @@ def switch_screen(direction):
     # 获取目标屏幕对象
     target_screen = screens[current_screen_idx]
     
-    # 延迟加载逻辑
-    if target_screen == screen_heart: init_screen_heart()
-    elif target_screen == screen_sport: init_screen_sport()
-    elif target_screen == screen_exchange: init_screen_exchange()
-    elif target_screen == screen_exchange_result: init_screen_exchange_result()
-    elif target_screen == screen_led: init_screen_led()
-    elif target_screen == screen_qr: init_screen_qr()
-    elif target_screen == screen_doubao: init_screen_doubao()
-    elif target_screen == screen_sys: init_screen_sys()
-    elif target_screen == screen_settings: init_screen_settings()
-    
-    lv.screen_load(target_screen)
-    
-    # --- 架构优化：动态卸载旧页面 ---
-    # 时间页面和天气页面通常保持常驻，其它页面切走时自动清理子对象
-    old_screen = screens[old_screen_idx]
-    if old_screen not in [screen_time, screen_weather, screen_settings]:
-        # 延迟一点清理，确保切换动画完成，且只有在页面不再活跃时才清理
-        def clean_old_screen_cb(t):
-            # 只有当旧页面确实不再是当前活动页面时，才进行清理
-            if lv.screen_active() != old_screen and hasattr(old_screen, 'get_child_count') and old_screen.get_child_count() > 0:
-                old_screen.clean()
-                print(f"Memory Cleanup: Screen {old_screen_idx} unloaded")
-                gc.collect()
-            if t: t.delete() # 执行完后删除定时器
-
-        # 修复：某些固件版本中 timer_create_basic 可能不支持链式调用
-        try:
-            cleanup_timer = lv.timer_create(clean_old_screen_cb, 1000, None)
-            cleanup_timer.set_repeat_count(1)
-        except Exception as e:
-            print(f"Cleanup timer creation failed: {e}")
-            # 如果定时器创建失败，直接手动触发一次 GC
-            gc.collect()
-    else:
-        gc.collect() 
+    # 按需构建并加载；超出内存预算时由注册表按 LRU 清理其它页面
+    # 滑动切换使用快照动画，方向与手势一致
+    registry.show(target_screen, lambda s: transition.start(old_screen, s, direction))
+    prefetch_neighbours()
+
+def prefetch_neighbours():
+    # 空闲时分片预热左右相邻页面，下次滑动只需 screen_load
+    n = len(screens)
+    registry.prefetch([screens[(current_screen_idx + 1) % n], screens[(current_screen_idx - 1) % n]])
 
 def switch_timezone(direction):
     global current_tz_idx
@@ -1286,56 +1469,41 @@ def switch_timezone(direction):
     update_time_cb(None)
 
 def check_gesture():
-    global last_swipe_time
-    
-    gesture = touch.get_gesture()
-    if gesture == 0: # 无手势
-        return
-
-    now = time.ticks_ms()
-    if time.ticks_diff(now, last_swipe_time) < swipe_cooldown:
+    # 每次抬手最多产生一个滑动事件，因此不再需要冷却时间
+    event = gestures.pop_event()
+    if event is None: # 无手势
         return
 
+    gesture = event[0]
     if gesture == GESTURE_SWIPE_RIGHT:
         switch_screen("prev")
-        last_swipe_time = now
     elif gesture == GESTURE_SWIPE_LEFT:
         switch_screen("next")
-        last_swipe_time = now
     elif gesture == GESTURE_SWIPE_UP:
         if lv.screen_active() == screen_time:
             switch_timezone("next")
-            last_swipe_time = now
     elif gesture == GESTURE_SWIPE_DOWN:
         if lv.screen_active() == screen_time:
             switch_timezone("prev")
-            last_swipe_time = now
 
 # ===== 初始化启动 =====
 lv.screen_load(screen_time)
-sync_time()
+prefetch_neighbours()
+# 先用缓存显示天气 (可能已过期)，不必等 WiFi 和 NTP
 update_weather_cb(None)
+wifi.when_online(sync_time)
 
 # --- 主循环 ---
-loop_count = 0
-while True:
-    try:
-        lv.tick_inc(5)
-        check_gesture()
-        lv.task_handler()
-        time.sleep_ms(5)
-        
-        # 每 50 次循环（约 0.25 秒）进行一次轻量级 GC
-        loop_count += 1
-        if loop_count >= 50:
-            gc.collect()
-            loop_count = 0
-            
-        # 激进内存回收：如果剩余内存过低，强制深度清理
-        if gc.mem_free() < 16384: # 低于 16KB
-            gc.collect()
-            
-    except MemoryError:
-        print("CRITICAL: Memory low, performing emergency GC")
-
-        gc.collect()
+# 睡眠时长由 LVGL 下一个定时器决定，触摸 IRQ 可提前唤醒
+# 空闲帧优先交给内存管理器回收，不需要回收时再预热相邻页面
+def loop_idle_cb(idle_ms):
+    if not mem.idle(idle_ms):
+        registry.idle(idle_ms)
+
+main_loop = MainLoop(
+    wake_cb=(lambda: touch.data_ready) if touch.irq_mode else None,
+    before_cb=check_gesture,
+    idle_cb=loop_idle_cb
+)
+# 以协程方式运行主循环，让网络请求在睡眠间隙中推进
+asyncio.run(main_loop.run_async())
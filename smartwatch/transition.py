@@ -0,0 +1,179 @@
+# transition.py - 基于快照的屏幕切换动画
+#
+# 直接对两个完整控件树做动画，每帧都要重绘所有控件，在 GC9A01 上会掉帧。
+# 这里把切出和切入的屏幕各截一次 RGB565 快照，动画期间只移动这两张位图，
+# 每帧开销固定，与屏幕上控件多少无关。
+#
+# 两张 240x240 RGB565 快照共约 230 KB，只在动画期间存在：每次切换开始时
+# 分配，结束后释放，平时不占内存。
+
+import time
+import lvgl as lv
+
+TRANSITION_NONE = 0
+TRANSITION_SLIDE = 1  # 两页一起平移
+TRANSITION_FADE = 2   # 新页面淡入
+TRANSITION_COVER = 3  # 新页面从侧面覆盖旧页面
+
+
+class SnapshotTransition:
+    """
+    mode: TRANSITION_* 之一
+    duration: 动画时长 (ms)
+    """
+
+    def __init__(self, width=240, height=240, mode=TRANSITION_SLIDE, duration=250):
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.duration = duration
+
+        # 过渡屏幕只在第一次使用时创建，之后复用；快照缓冲每次动画单独分配
+        self._buf_out = None
+        self._buf_in = None
+        self._screen = None
+        self._img_out = None
+        self._img_in = None
+
+        self._anim = None
+        self._target = None
+        self._direction = 1
+        self._last_frame = 0
+
+        # 帧时间统计 (最近一次动画)
+        self.frames = 0
+        self.avg_frame_ms = 0
+        self.max_frame_ms = 0
+        self._frame_total = 0
+
+    def _setup(self):
+        cf = lv.COLOR_FORMAT.RGB565
+        self._buf_out = lv.draw_buf_create(self.width, self.height, cf, 0)
+        self._buf_in = lv.draw_buf_create(self.width, self.height, cf, 0)
+        if self._buf_out is None or self._buf_in is None:
+            raise MemoryError("no memory for transition snapshots")
+
+        if self._screen is not None:
+            return
+        self._screen = lv.obj()
+        self._screen.set_style_bg_color(lv.color_hex(0x000000), 0)
+        self._screen.remove_flag(lv.obj.FLAG.SCROLLABLE)
+        self._screen.set_style_pad_all(0, 0)
+        self._img_out = lv.image(self._screen)
+        self._img_in = lv.image(self._screen)
+
+    def _release(self):
+        """释放快照缓冲；图片先改为空源，避免再引用已释放的缓冲"""
+        if self._img_out is not None:
+            self._img_out.set_src(None)
+            self._img_in.set_src(None)
+        for buf in (self._buf_out, self._buf_in):
+            if buf is not None:
+                lv.image_cache_drop(buf)
+                lv.draw_buf_destroy(buf)
+        self._buf_out = None
+        self._buf_in = None
+
+    def _snapshot(self, screen, buf):
+        res = lv.snapshot_take_to_draw_buf(screen, lv.COLOR_FORMAT.RGB565, buf)
+        return res == lv.RESULT.OK
+
+    def start(self, old_screen, new_screen, direction="next"):
+        """
+        从 old_screen 动画切换到 new_screen；new_screen 必须已构建。
+        快照失败或 mode 为 TRANSITION_NONE 时直接加载。
+        """
+        # 上一个动画还没结束，直接跳到终点；此时显示的是上一个目标页面
+        if self._anim is not None:
+            self._finish(cancel=True)
+        if old_screen == self._screen:
+            old_screen = lv.screen_active()
+
+        if self.mode == TRANSITION_NONE or old_screen == new_screen:
+            lv.screen_load(new_screen)
+            return
+
+        try:
+            self._setup()
+            ok = self._snapshot(old_screen, self._buf_out) and self._snapshot(new_screen, self._buf_in)
+        except Exception as e:
+            print(f"Transition snapshot error: {e}")
+            ok = False
+        if not ok:
+            self._release()
+            lv.screen_load(new_screen)
+            return
+
+        self._target = new_screen
+        self._direction = 1 if direction == "next" else -1
+
+        self._img_out.set_src(self._buf_out)
+        self._img_in.set_src(self._buf_in)
+        self._img_in.move_foreground()
+        self._apply(0)
+        lv.screen_load(self._screen)
+
+        self.frames = 0
+        self.max_frame_ms = 0
+        self._frame_total = 0
+        self._last_frame = time.ticks_ms()
+
+        a = lv.anim_t()
+        a.init()
+        a.set_var(self._screen)
+        a.set_values(0, 256)
+        a.set_duration(self.duration)
+        a.set_path_cb(lv.anim_t.path_ease_out)
+        a.set_custom_exec_cb(lambda a, v: self._anim_cb(v))
+        a.set_completed_cb(lambda a: self._finish())
+        self._anim = a
+        lv.anim_t.start(a)
+
+    def _apply(self, progress):
+        # progress: 0..256
+        w = self.width
+        d = self._direction
+        if self.mode == TRANSITION_SLIDE:
+            self._img_out.set_x(-d * w * progress // 256)
+            self._img_in.set_x(d * w * (256 - progress) // 256)
+            self._img_in.set_style_image_opa(lv.OPA.COVER, 0)
+        elif self.mode == TRANSITION_COVER:
+            self._img_out.set_x(0)
+            self._img_in.set_x(d * w * (256 - progress) // 256)
+            self._img_in.set_style_image_opa(lv.OPA.COVER, 0)
+        else:
+            self._img_out.set_x(0)
+            self._img_in.set_x(0)
+            self._img_in.set_style_image_opa(progress * 255 // 256, 0)
+
+    def _anim_cb(self, value):
+        now = time.ticks_ms()
+        frame_ms = time.ticks_diff(now, self._last_frame)
+        self._last_frame = now
+        if self.frames > 0:
+            self._frame_total += frame_ms
+            if frame_ms > self.max_frame_ms:
+                self.max_frame_ms = frame_ms
+        self.frames += 1
+        self._apply(value)
+
+    def _finish(self, cancel=False):
+        if self._anim is None:
+            return
+        if cancel:
+            # 动画正常结束时 LVGL 已将其移除，只有提前结束才需要删除
+            lv.anim_delete(self._screen, None)
+        self._anim = None
+        if self.frames > 1:
+            self.avg_frame_ms = self._frame_total // (self.frames - 1)
+        target = self._target
+        self._target = None
+        lv.screen_load(target)
+        self._release()
+
+    def get_stats(self):
+        return {
+            'frames': self.frames,
+            'avg_frame_ms': self.avg_frame_ms,
+            'max_frame_ms': self.max_frame_ms,
+        }
@@ -0,0 +1,238 @@
+# wifi_manager.py - 非阻塞 WiFi 连接管理
+#
+# 原来的 connect_wifi() 用 time.sleep(1) 轮询最多 15 秒，启动、每次刷新天气
+# 和每次查汇率都可能把界面卡住。这里改成状态机，由主循环定时调用 tick()
+# 推进：连接中只读一次 status() 就返回，失败后按指数退避重试。
+#
+# 射频只在有人需要网络时打开：when_online() / wait_online() 登记需求，
+# 最后一次使用后空闲 linger_ms 即断开并关闭射频，直到下一次定时同步。
+
+import time
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+try:
+    import network
+    STAT_GOT_IP = network.STAT_GOT_IP
+    STAT_WRONG_PASSWORD = network.STAT_WRONG_PASSWORD
+    STAT_NO_AP_FOUND = network.STAT_NO_AP_FOUND
+    STAT_CONNECT_FAIL = network.STAT_CONNECT_FAIL
+except (ImportError, AttributeError):
+    # 主机上用假的 WLAN 对象验证状态机时使用 (取值同 ESP32 端口)
+    STAT_GOT_IP = 1010
+    STAT_WRONG_PASSWORD = 202
+    STAT_NO_AP_FOUND = 201
+    STAT_CONNECT_FAIL = 203
+
+try:
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+    _ticks_add = time.ticks_add
+except AttributeError:
+    def _ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+    def _ticks_add(a, b):
+        return a + b
+
+STATE_OFF = 0         # 射频关闭
+STATE_CONNECTING = 1  # 已发起连接，等待获取 IP
+STATE_ONLINE = 2
+STATE_BACKOFF = 3     # 连接失败，等待下一次重试
+
+_STATE_NAMES = ("off", "connecting", "online", "backoff")
+
+
+class WifiManager:
+    """
+    wlan: network.WLAN(network.STA_IF) 或具有相同接口的对象
+    connect_timeout_ms: 单次连接的最长等待时间
+    backoff_min_ms / backoff_max_ms: 失败后重试间隔的下限和上限 (每次翻倍)
+    linger_ms: 最后一次使用网络后保持连接的时间，之后关闭射频
+    before_connect: 打开射频前调用 (例如先回收内存)
+    on_offline: 关闭射频或连接断开时调用 (例如关闭空闲的 HTTP 连接)
+    on_wake: 射频关闭期间有新的网络需求时调用 (例如恢复暂停的 tick 定时器)
+    """
+
+    def __init__(
+        self,
+        wlan,
+        ssid,
+        password,
+        connect_timeout_ms=15000,
+        backoff_min_ms=2000,
+        backoff_max_ms=300000,
+        linger_ms=60000,
+        before_connect=None,
+        on_offline=None,
+        on_wake=None
+    ):
+        self.wlan = wlan
+        self.ssid = ssid
+        self.password = password
+        self.connect_timeout_ms = connect_timeout_ms
+        self.backoff_min_ms = backoff_min_ms
+        self.backoff_max_ms = backoff_max_ms
+        self.linger_ms = linger_ms
+        self.before_connect = before_connect
+        self.on_offline = on_offline
+        self.on_wake = on_wake
+
+        self.state = STATE_OFF
+        self._callbacks = []
+        self._last_used = None
+        self._since = _ticks_ms()
+        self._backoff_ms = backoff_min_ms
+        self._retry_at = 0
+
+        # 统计信息
+        self.connects = 0
+        self.failures = 0
+        self.last_error = None
+
+    @property
+    def online(self):
+        return self.state == STATE_ONLINE
+
+    @property
+    def sleeping(self):
+        """射频关闭且没有网络需求：此时 tick() 什么都不做，可以暂停定时调用"""
+        return self.state == STATE_OFF and not self._wanted(_ticks_ms())
+
+    def request(self):
+        """登记一次网络需求：需要时打开射频，并推迟空闲关闭"""
+        self._last_used = _ticks_ms()
+        if self.state == STATE_OFF and self.on_wake is not None:
+            self.on_wake()
+
+    def when_online(self, cb):
+        """联网后调用 cb()；已联网时立即调用"""
+        self.request()
+        if self.state == STATE_ONLINE:
+            cb()
+        else:
+            self._callbacks.append(cb)
+
+    async def wait_online(self, timeout_ms=20000, poll_ms=100):
+        """协程中等待联网，超时或处于退避状态时返回 False"""
+        start = _ticks_ms()
+        while True:
+            self.request()
+            if self.state == STATE_ONLINE:
+                return True
+            if self.state == STATE_BACKOFF:
+                return False
+            if _ticks_diff(_ticks_ms(), start) >= timeout_ms:
+                return False
+            await asyncio.sleep(poll_ms / 1000)
+
+    def _wanted(self, now):
+        if self._callbacks:
+            return True
+        return self._last_used is not None and _ticks_diff(now, self._last_used) < self.linger_ms
+
+    def _set_state(self, state, now):
+        self.state = state
+        self._since = now
+
+    def _start(self, now):
+        if self.before_connect is not None:
+            self.before_connect()
+        try:
+            self.wlan.active(True)
+            if not self.wlan.isconnected():
+                self.wlan.connect(self.ssid, self.password)
+        except OSError as e:
+            self._fail(now, "activate: {}".format(e))
+            return
+        self._set_state(STATE_CONNECTING, now)
+
+    def _fail(self, now, reason):
+        self.failures += 1
+        self.last_error = reason
+        print("WiFi: {} (retry in {} ms)".format(reason, self._backoff_ms))
+        self._radio_off()
+        self._retry_at = _ticks_add(now, self._backoff_ms)
+        self._backoff_ms = min(self._backoff_ms * 2, self.backoff_max_ms)
+        self._set_state(STATE_BACKOFF, now)
+
+    def _radio_off(self):
+        try:
+            self.wlan.disconnect()
+            self.wlan.active(False)
+        except OSError:
+            pass
+        if self.on_offline is not None:
+            self.on_offline()
+
+    def _run_callbacks(self):
+        callbacks = self._callbacks
+        self._callbacks = []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception as e:
+                print(f"WiFi callback error: {e}")
+
+    def tick(self):
+        """推进状态机；由主循环定期调用，不会阻塞"""
+        now = _ticks_ms()
+        state = self.state
+
+        if state == STATE_OFF:
+            if self._wanted(now):
+                self._start(now)
+
+        elif state == STATE_CONNECTING:
+            status = self.wlan.status()
+            if status == STAT_GOT_IP or self.wlan.isconnected():
+                print("WiFi Connected. IP:", self.wlan.ifconfig()[0])
+                self.connects += 1
+                self._backoff_ms = self.backoff_min_ms
+                self._set_state(STATE_ONLINE, now)
+                self._run_callbacks()
+            elif status == STAT_WRONG_PASSWORD:
+                # 密码错误重试也没用，直接按最长间隔退避
+                self._backoff_ms = self.backoff_max_ms
+                self._fail(now, "wrong password")
+            elif status == STAT_NO_AP_FOUND:
+                self._fail(now, "AP not found")
+            elif status == STAT_CONNECT_FAIL:
+                self._fail(now, "connect failed")
+            elif _ticks_diff(now, self._since) >= self.connect_timeout_ms:
+                self._fail(now, "timeout")
+
+        elif state == STATE_ONLINE:
+            if not self.wlan.isconnected():
+                print("WiFi: connection lost")
+                if self.on_offline is not None:
+                    self.on_offline()
+                self._set_state(STATE_OFF, now)
+            elif self._callbacks:
+                self._run_callbacks()
+            elif not self._wanted(now):
+                print("WiFi: idle, radio off")
+                self._radio_off()
+                self._set_state(STATE_OFF, now)
+
+        elif state == STATE_BACKOFF:
+            if _ticks_diff(now, self._retry_at) >= 0:
+                if self._wanted(now):
+                    self._start(now)
+                else:
+                    self._set_state(STATE_OFF, now)
+
+    def get_stats(self):
+        return {
+            'state': _STATE_NAMES[self.state],
+            'connects': self.connects,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'backoff_ms': self._backoff_ms,
+        }
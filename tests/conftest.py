@@ -0,0 +1,24 @@
+# conftest.py - 主机测试的公共设置
+#
+# 与 tools/ 下的脚本一样把 smartwatch/ 加到 sys.path，并在导入被测模块
+# 之前装好 fakes 中的替身模块。
+
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.normpath(os.path.join(_HERE, ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, _HERE)
+
+import fakes
+
+fakes.install()
+
+
+@pytest.fixture
+def clock():
+    fakes.CLOCK.reset()
+    return fakes.CLOCK
@@ -0,0 +1,759 @@
+# fakes.py - 在主机上导入 smartwatch 模块所需的替身模块
+#
+# 设备上的 micropython、machine、network、lcd_bus、gc9a01、pointer_framework 和 lvgl
+# 在 CPython 里都不存在。install() 把这里的替身放进 sys.modules，并给 time
+# 模块补上 ticks_ms / ticks_us / sleep_ms，时间由 CLOCK 驱动，测试可以
+# 精确控制每一步经过的毫秒数。替身只实现被测代码用到的部分，并记录
+# 总线上的每一次传输，供测试断言和 tools/ 下的基准统计。
+
+import gc
+import sys
+import time
+import types
+
+
+class FakeClock:
+    """假时钟：只有调用 advance() / sleep_ms() 时才走动"""
+
+    def __init__(self):
+        self.us = 0
+
+    def reset(self):
+        self.us = 0
+
+    def advance(self, ms):
+        self.us += int(ms * 1000)
+
+    def ticks_ms(self):
+        return self.us // 1000
+
+    def ticks_us(self):
+        return self.us
+
+
+CLOCK = FakeClock()
+
+
+def _ticks_diff(a, b):
+    return a - b
+
+
+def _ticks_add(a, b):
+    return a + b
+
+
+# ---------------------------------------------------------------- micropython
+
+def _make_micropython():
+    mod = types.ModuleType("micropython")
+    mod.const = lambda x: x
+    mod.native = lambda f: f
+    mod.viper = lambda f: f
+    mod.mem_info = lambda *args: None
+    return mod
+
+
+# -------------------------------------------------------------------- machine
+
+class Pin:
+    IN = 1
+    OUT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
+
+    def __init__(self, pin_id, mode=None, pull=None, value=None):
+        self.id = pin_id
+        self.mode = mode
+        self._value = 1 if value is None else value
+        self._handler = None
+        self.irq_trigger = None
+        self.irqs = 0
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = v
+
+    def irq(self, trigger=None, handler=None):
+        self.irq_trigger = trigger
+        self._handler = handler
+
+    def pulse(self):
+        """模拟 INT 线上的一个下降沿"""
+        self.irqs += 1
+        if self._handler is not None:
+            self._handler(self)
+
+
+class FakeCST816S:
+    """
+    CST816S 寄存器替身，挂在 I2C 总线上。
+
+    writeto 写一个字节是选择寄存器，多写的字节写入寄存器；readfrom_into
+    从选中的寄存器开始连续读。每次 writeto / readfrom_into 计为一次总线
+    传输。touch() / release() 改变触摸寄存器，连接了 int_pin 时按芯片
+    行为在 INT 线上给出下降沿。
+    """
+
+    ADDR = 0x15
+
+    def __init__(self, chip_id=0xB5, int_pin=None):
+        self.regs = bytearray(256)
+        self.regs[0xA7] = chip_id
+        self.regs[0xA9] = 0x02
+        self.int_pin = int_pin
+        self._reg = 0
+        self.transactions = 0
+        self.reads = 0
+        self.writes = 0
+        self.fail = False
+
+    def touch(self, x, y, gesture=0):
+        r = self.regs
+        r[0x01] = gesture
+        r[0x02] = 1
+        r[0x03] = (x >> 8) & 0x0F
+        r[0x04] = x & 0xFF
+        r[0x05] = (y >> 8) & 0x0F
+        r[0x06] = y & 0xFF
+        if self.int_pin is not None:
+            self.int_pin.pulse()
+
+    def release(self):
+        self.regs[0x02] = 0
+        if self.int_pin is not None:
+            self.int_pin.pulse()
+
+    def writeto(self, addr, buf, stop=True):
+        self.transactions += 1
+        self.writes += 1
+        if self.fail or addr != self.ADDR:
+            raise OSError(19)  # ENODEV
+        self._reg = buf[0]
+        for i, b in enumerate(buf[1:]):
+            self.regs[(self._reg + i) & 0xFF] = b
+
+    def readfrom_into(self, addr, buf):
+        self.transactions += 1
+        self.reads += 1
+        if self.fail or addr != self.ADDR:
+            raise OSError(19)
+        for i in range(len(buf)):
+            buf[i] = self.regs[(self._reg + i) & 0xFF]
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.reads = 0
+        self.writes = 0
+
+
+class I2C:
+    """总线替身：把传输转给挂在上面的设备 (默认一个 FakeCST816S)"""
+
+    def __init__(self, bus_id=0, scl=None, sda=None, freq=400000, device=None):
+        self.device = device if device is not None else FakeCST816S()
+
+    def writeto(self, addr, buf, stop=True):
+        return self.device.writeto(addr, buf, stop)
+
+    def readfrom_into(self, addr, buf):
+        return self.device.readfrom_into(addr, buf)
+
+
+class _SPIBus:
+    def __init__(self, host=None, mosi=None, miso=None, sck=None):
+        self.host = host
+
+
+class SPI:
+    Bus = _SPIBus
+
+
+class RTC:
+    def __init__(self):
+        self._dt = (2024, 1, 1, 0, 0, 0, 0, 0)
+
+    def datetime(self, dt=None):
+        if dt is None:
+            return self._dt
+        self._dt = dt
+
+
+def _make_machine():
+    mod = types.ModuleType("machine")
+    mod.Pin = Pin
+    mod.I2C = I2C
+    mod.SPI = SPI
+    mod.RTC = RTC
+    mod.freq = lambda *args: 240000000
+    return mod
+
+
+# -------------------------------------------------------------------- network
+
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+STAT_NO_AP_FOUND = 201
+STAT_WRONG_PASSWORD = 202
+STAT_CONNECT_FAIL = 203
+
+
+class WLAN:
+    """
+    network.WLAN 替身，按假时钟推进连接过程。
+
+    assoc_ms: 从 connect() 到获取 IP 的时间 (慢速关联)
+    password: 正确的密码；不一致时 fail_ms 后报 STAT_WRONG_PASSWORD
+    ap_present: False 时 fail_ms 后报 STAT_NO_AP_FOUND
+    radio_on_ms 累计射频打开的时间，用于比较功耗。
+    """
+
+    def __init__(self, interface=0, password="secret", assoc_ms=3000, fail_ms=1500,
+                 ap_present=True):
+        self.password = password
+        self.assoc_ms = assoc_ms
+        self.fail_ms = fail_ms
+        self.ap_present = ap_present
+        self._active = False
+        self._active_since = 0
+        self._connect_at = None
+        self._connect_pw = None
+        self.connected = False
+        self.radio_on_ms = 0
+        self.connect_calls = 0
+        self.status_calls = 0
+
+    def active(self, on=None):
+        if on is None:
+            return self._active
+        now = CLOCK.ticks_ms()
+        if on and not self._active:
+            self._active_since = now
+        elif not on and self._active:
+            self.radio_on_ms += now - self._active_since
+            self.disconnect()
+        self._active = bool(on)
+
+    def connect(self, ssid, password):
+        if not self._active:
+            raise OSError("WLAN not active")
+        self.connect_calls += 1
+        self._connect_at = CLOCK.ticks_ms()
+        self._connect_pw = password
+
+    def disconnect(self):
+        self._connect_at = None
+        self.connected = False
+
+    def drop(self):
+        """模拟 AP 断开"""
+        self._connect_at = None
+        self.connected = False
+
+    def status(self):
+        self.status_calls += 1
+        return self._status()
+
+    def _status(self):
+        if self.connected:
+            return STAT_GOT_IP
+        if not self._active or self._connect_at is None:
+            return STAT_IDLE
+        elapsed = CLOCK.ticks_ms() - self._connect_at
+        if not self.ap_present:
+            return STAT_NO_AP_FOUND if elapsed >= self.fail_ms else STAT_CONNECTING
+        if self._connect_pw != self.password:
+            return STAT_WRONG_PASSWORD if elapsed >= self.fail_ms else STAT_CONNECTING
+        if elapsed >= self.assoc_ms:
+            self.connected = True
+            return STAT_GOT_IP
+        return STAT_CONNECTING
+
+    def isconnected(self):
+        return self._status() == STAT_GOT_IP
+
+    def ifconfig(self):
+        return ("192.168.1.50", "255.255.255.0", "192.168.1.1", "192.168.1.1")
+
+
+def _make_network():
+    mod = types.ModuleType("network")
+    mod.WLAN = WLAN
+    mod.STA_IF = 0
+    mod.AP_IF = 1
+    for name in ("STAT_IDLE", "STAT_CONNECTING", "STAT_GOT_IP", "STAT_NO_AP_FOUND",
+                 "STAT_WRONG_PASSWORD", "STAT_CONNECT_FAIL"):
+        setattr(mod, name, globals()[name])
+    return mod
+
+
+# -------------------------------------------------------------------- lcd_bus
+
+class SPIBus:
+    """
+    lcd_bus.SPIBus 替身：记录每次 tx_color 的窗口和字节数，不做任何传输。
+    transfers 中每一项为 (cmd, nbytes, x1, y1, x2, y2, last)。
+    """
+
+    def __init__(self, spi_bus=None, dc=None, cs=None, freq=None):
+        self.transfers = []
+        self.bytes_sent = 0
+        self.framebuffers = []
+
+    def allocate_framebuffer(self, size, caps):
+        buf = bytearray(size)
+        self.framebuffers.append((size, caps))
+        return buf
+
+    def tx_color(self, cmd, data, x1, y1, x2, y2, rotation, last):
+        n = len(data)
+        self.transfers.append((cmd, n, x1, y1, x2, y2, last))
+        self.bytes_sent += n
+
+    def reset_stats(self):
+        self.transfers = []
+        self.bytes_sent = 0
+
+
+def _make_lcd_bus():
+    mod = types.ModuleType("lcd_bus")
+    mod.SPIBus = SPIBus
+    mod.MEMORY_SPIRAM = 0x400
+    mod.MEMORY_INTERNAL = 0x800
+    mod.MEMORY_DMA = 0x008
+    return mod
+
+
+# ---------------------------------------------------------------------- lvgl
+
+class area_t:
+    def __init__(self, x1=0, y1=0, x2=0, y2=0):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+
+    @staticmethod
+    def __cast__(obj):
+        return obj
+
+    def as_tuple(self):
+        return self.x1, self.y1, self.x2, self.y2
+
+
+class Event:
+    def __init__(self, code, param=None, target=None, user_data=None):
+        self.code = code
+        self._param = param
+        self._target = target
+        self._user_data = user_data
+
+    def get_code(self):
+        return self.code
+
+    def get_param(self):
+        return self._param
+
+    def get_target(self):
+        return self._target
+
+    def get_target_obj(self):
+        return self._target
+
+    def get_current_target_obj(self):
+        return self._target
+
+    def get_user_data(self):
+        return self._user_data
+
+
+class _EventTarget:
+    def __init__(self):
+        self._event_cbs = []
+
+    def add_event_cb(self, cb, code, user_data):
+        self._event_cbs.append((cb, code, user_data))
+
+    def remove_event_cb(self, cb):
+        self._event_cbs = [d for d in self._event_cbs if d[0] is not cb]
+
+    def send_event(self, code, param=None):
+        e = None
+        for cb, c, ud in list(self._event_cbs):
+            if c == code or c == EVENT.ALL:
+                e = Event(code, param, self, ud)
+                cb(e)
+        return e
+
+
+class FakeDisplay(_EventTarget):
+    """
+    lv_display_t 替身。invalidate() 按 lv_inv_area 的顺序处理失效区域：
+    裁到屏幕、发送 INVALIDATE_AREA、跳过已包含在已有区域内的、保存。
+    """
+
+    def __init__(self, width=240, height=240):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.inv_areas = []
+        self.flush_ready_calls = 0
+        self.render_mode = None
+
+    def invalidate(self, x1, y1, x2, y2):
+        x1 = max(x1, 0)
+        y1 = max(y1, 0)
+        x2 = min(x2, self.width - 1)
+        y2 = min(y2, self.height - 1)
+        if x1 > x2 or y1 > y2:
+            return
+        area = area_t(x1, y1, x2, y2)
+        self.send_event(EVENT.INVALIDATE_AREA, area)
+        a = area.as_tuple()
+        for b in self.inv_areas:
+            if b[0] <= a[0] and b[1] <= a[1] and a[2] <= b[2] and a[3] <= b[3]:
+                return
+        self.inv_areas.append(a)
+
+    def refr_ready(self):
+        self.send_event(EVENT.REFR_READY, None)
+        self.inv_areas = []
+
+    def flush_ready(self):
+        self.flush_ready_calls += 1
+
+    def flush_is_last(self):
+        return True
+
+    def set_render_mode(self, mode):
+        self.render_mode = mode
+
+
+class obj(_EventTarget):
+    """lv.obj 替身：维护子对象列表和位置，样式与标志只记录不生效"""
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+        self.children = []
+        self.x = 0
+        self.y = 0
+        self.styles = {}
+        if parent is not None:
+            parent.children.append(self)
+
+    def __getattr__(self, name):
+        # set_style_* / add_flag / remove_flag 等：记录最后一次的参数
+        if name.startswith(("set_style_", "add_flag", "remove_flag", "add_state", "remove_state")):
+            def setter(*args):
+                self.styles[name] = args
+            return setter
+        raise AttributeError(name)
+
+    def get_child_count(self):
+        return len(self.children)
+
+    def clean(self):
+        self.children = []
+
+    def delete(self):
+        if self.parent is not None and self in self.parent.children:
+            self.parent.children.remove(self)
+
+    def set_x(self, x):
+        self.x = x
+
+    def get_x(self):
+        return self.x
+
+    def set_pos(self, x, y):
+        self.x = x
+        self.y = y
+
+    def move_foreground(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent.children.append(self)
+
+
+class image(obj):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.src = None
+        self.opa = 255
+
+    def set_src(self, src):
+        self.src = src
+
+    def set_style_image_opa(self, opa, selector):
+        self.opa = opa
+
+
+_active_screen = [None]
+
+
+def screen_active():
+    return _active_screen[0]
+
+
+def screen_load(scr):
+    _active_screen[0] = scr
+
+
+class draw_buf_t:
+    """lv_draw_buf_t 替身；live 记录当前未释放的缓冲"""
+
+    live = []
+    limit = None    # 总字节数上限，超过时 draw_buf_create 返回 None
+
+    def __init__(self, w, h, cf, stride):
+        self.w = w
+        self.h = h
+        self.cf = cf
+        self.data = bytearray(w * h * 2)
+
+
+def draw_buf_create(w, h, cf, stride):
+    used = sum(len(b.data) for b in draw_buf_t.live)
+    if draw_buf_t.limit is not None and used + w * h * 2 > draw_buf_t.limit:
+        return None
+    buf = draw_buf_t(w, h, cf, stride)
+    draw_buf_t.live.append(buf)
+    return buf
+
+
+def draw_buf_destroy(buf):
+    draw_buf_t.live.remove(buf)
+
+
+def snapshot_take_to_draw_buf(scr, cf, buf):
+    """按屏幕 id 填充缓冲，不同屏幕的快照内容不同"""
+    v = id(scr) & 0xFF
+    buf.data[:] = bytes([v]) * len(buf.data)
+    return RESULT.OK
+
+
+class anim_t:
+    """
+    lv_anim_t 替身。动画不会自己走动：调用 fakes.anim_tick() 时按假时钟
+    计算进度并调用 exec_cb，到达终点后调用 completed_cb。
+    """
+
+    running = []
+
+    def init(self):
+        self.var = None
+        self.start_value = 0
+        self.end_value = 0
+        self.duration = 0
+        self.path_cb = None
+        self.exec_cb = None
+        self.completed_cb = None
+        self.started = 0
+
+    def set_var(self, var):
+        self.var = var
+
+    def set_values(self, start, end):
+        self.start_value = start
+        self.end_value = end
+
+    def set_duration(self, ms):
+        self.duration = ms
+
+    def set_path_cb(self, cb):
+        self.path_cb = cb
+
+    def set_custom_exec_cb(self, cb):
+        self.exec_cb = cb
+
+    def set_completed_cb(self, cb):
+        self.completed_cb = cb
+
+    @staticmethod
+    def path_ease_out(t):
+        return 1 - (1 - t) * (1 - t)
+
+    @staticmethod
+    def path_linear(t):
+        return t
+
+    @staticmethod
+    def start(a):
+        a.started = CLOCK.ticks_ms()
+        anim_t.running.append(a)
+
+
+def anim_delete(var, cb):
+    anim_t.running = [a for a in anim_t.running if a.var is not var]
+
+
+def anim_tick():
+    """推进所有动画到假时钟的当前时刻"""
+    now = CLOCK.ticks_ms()
+    for a in list(anim_t.running):
+        t = (now - a.started) / a.duration if a.duration else 1.0
+        if t > 1.0:
+            t = 1.0
+        p = a.path_cb(t) if a.path_cb is not None else t
+        a.exec_cb(a, int(a.start_value + (a.end_value - a.start_value) * p))
+        if t >= 1.0 and a in anim_t.running:
+            anim_t.running.remove(a)
+            if a.completed_cb is not None:
+                a.completed_cb(a)
+
+
+class ColorPointer:
+    """flush_cb 收到的 color_p 替身"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def __dereference__(self, n):
+        return memoryview(self._data)[:n]
+
+
+class _Namespace:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class image_dsc_t:
+    """只记录构造时传入的字段"""
+
+    def __init__(self, fields=None):
+        fields = fields or {}
+        self.header = _Namespace(**fields.get("header", {}))
+        self.data_size = fields.get("data_size", 0)
+        self.data = fields.get("data")
+
+
+RESULT = _Namespace(INVALID=0, OK=1)
+
+obj.FLAG = _Namespace(HIDDEN=1, CLICKABLE=2, SCROLLABLE=16)
+
+EVENT = _Namespace(
+    ALL=0, PRESSED=1, CLICKED=7, VALUE_CHANGED=35, DRAW_TASK_ADDED=29,
+    INVALIDATE_AREA=47, REFR_READY=50, SCREEN_LOADED=40, SCREEN_UNLOADED=41,
+    SCREEN_LOAD_START=38, SCREEN_UNLOAD_START=39, DELETE=44,
+)
+
+
+def _make_lvgl():
+    mod = types.ModuleType("lvgl")
+    mod.area_t = area_t
+    mod.EVENT = EVENT
+    mod.COLOR_FORMAT = _Namespace(RGB565=0x12, RGB565A8=0x14, ARGB8888=0x10, A8=0x0E,
+                                  A1=0x0B, A2=0x0C, A4=0x0D)
+    mod.IMAGE_HEADER_MAGIC = 0x19
+    mod.image_dsc_t = image_dsc_t
+    mod.DISPLAY_RENDER_MODE = _Namespace(PARTIAL=0, DIRECT=1, FULL=2)
+    mod.DISPLAY_ROTATION = _Namespace(_0=0, _90=1, _180=2, _270=3)
+    mod.INDEV_STATE = _Namespace(RELEASED=0, PRESSED=1)
+    mod.INDEV_TYPE = _Namespace(POINTER=1)
+    mod.RESULT = RESULT
+    mod.OPA = _Namespace(TRANSP=0, COVER=255)
+    mod.color_hex = lambda v: v
+    mod.obj = obj
+    mod.image = image
+    mod.screen_active = screen_active
+    mod.screen_load = screen_load
+    mod.draw_buf_t = draw_buf_t
+    mod.draw_buf_create = draw_buf_create
+    mod.draw_buf_destroy = draw_buf_destroy
+    mod.snapshot_take_to_draw_buf = snapshot_take_to_draw_buf
+    mod.image_cache_drop = lambda src: None
+    mod.anim_t = anim_t
+    mod.anim_delete = anim_delete
+    return mod
+
+
+# -------------------------------------------------------------------- gc9a01
+
+class GC9A01:
+    """显示驱动基类替身，只保留 GC9A01Display 用到的属性"""
+
+    def __init__(self, data_bus=None, display_width=240, display_height=240,
+                 offset_x=0, offset_y=0, **kwargs):
+        self._data_bus = data_bus
+        self._offset_x = offset_x
+        self._offset_y = offset_y
+        self._rotation = 0
+        self._ramwr = 0x2C
+        self._disp_drv = FakeDisplay(display_width, display_height)
+        self.windows = []
+
+    def _set_memory_location(self, x1, y1, x2, y2):
+        self.windows.append((x1, y1, x2, y2))
+
+    def _flush_cb(self, disp_drv, area, color_p):
+        size = (area.x2 - area.x1 + 1) * (area.y2 - area.y1 + 1) * 2
+        self._set_memory_location(area.x1, area.y1, area.x2, area.y2)
+        self._data_bus.tx_color(self._ramwr, color_p.__dereference__(size),
+                                area.x1, area.y1, area.x2, area.y2,
+                                self._rotation, disp_drv.flush_is_last())
+
+    def _flush_ready_cb(self, *args):
+        self._disp_drv.flush_ready()
+
+
+def _make_gc9a01():
+    mod = types.ModuleType("gc9a01")
+    mod.GC9A01 = GC9A01
+    mod.STATE_LOW = 0
+    mod.STATE_HIGH = 1
+    mod.STATE_PWM = 2
+    mod.BYTE_ORDER_BGR = 1
+    mod.BYTE_ORDER_RGB = 0
+    return mod
+
+
+# --------------------------------------------------------- pointer_framework
+
+class PointerDriver:
+    PRESSED = 1
+    RELEASED = 0
+
+    def __init__(self, touch_cal=None, startup_rotation=None, debug=False):
+        pass
+
+
+def _make_pointer_framework(lv):
+    mod = types.ModuleType("pointer_framework")
+    mod.PointerDriver = PointerDriver
+    mod.lv = lv
+    return mod
+
+
+# -------------------------------------------------------------------- install
+
+def install():
+    """把替身模块放进 sys.modules (已存在的不覆盖)，并给 time 补上 ticks 函数"""
+    lv = sys.modules.get("lvgl") or _make_lvgl()
+    modules = {
+        "micropython": _make_micropython,
+        "machine": _make_machine,
+        "network": _make_network,
+        "lcd_bus": _make_lcd_bus,
+        "gc9a01": _make_gc9a01,
+        "lvgl": lambda: lv,
+        "pointer_framework": lambda: _make_pointer_framework(lv),
+    }
+    for name, make in modules.items():
+        if name not in sys.modules:
+            sys.modules[name] = make()
+
+    # MicroPython 的 gc 扩展；主机上没有堆上限，按充足的空闲内存处理
+    if not hasattr(gc, "mem_free"):
+        gc.mem_free = lambda: 256 * 1024
+        gc.mem_alloc = lambda: 0
+
+    time.ticks_ms = CLOCK.ticks_ms
+    time.ticks_us = CLOCK.ticks_us
+    time.ticks_diff = _ticks_diff
+    time.ticks_add = _ticks_add
+    time.sleep_ms = CLOCK.advance
+    time.sleep_us = lambda us: CLOCK.advance(us / 1000)
@@ -0,0 +1,154 @@
+# http_server.py - 本地替身 HTTP/1.1 服务器 (asyncio，只监听 127.0.0.1)
+#
+# 每个路径登记一个 Route，描述响应内容和要注入的故障：
+#   delay     发送响应头之前等待的秒数
+#   stall     发送一半正文后停住的秒数 (模拟服务器中途卡住)
+#   drop      收到请求后不回应直接断开；整数 n 表示前 n 次断开，之后正常
+#   chunked   用 chunked 编码发送正文
+#   close     响应带 Connection: close 并在发送后断开
+# 连接默认保持 (keep-alive)。handshake 是每个新连接在处理第一个请求前的
+# 等待秒数，用来模拟 TLS 握手的开销。connections / requests 统计建立的连接数和
+# 收到的请求 (方法, 路径, 正文)，供测试和 tools/bench_http_pool.py 使用。
+
+import asyncio
+
+
+class Route:
+    def __init__(self, body=b"", status=200, delay=0, stall=0, drop=False,
+                 chunked=False, close=False, content_type="application/json"):
+        if isinstance(body, str):
+            body = body.encode()
+        self.body = body
+        self.status = status
+        self.delay = delay
+        self.stall = stall
+        self.drop = drop
+        self.chunked = chunked
+        self.close = close
+        self.content_type = content_type
+
+
+class StandInServer:
+    def __init__(self, routes=None, handshake=0):
+        self.routes = dict(routes or {})
+        self.handshake = handshake
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = []
+        self.port = None
+        self._server = None
+        self._writers = []
+        self._tasks = []
+
+    @property
+    def base_url(self):
+        return "http://127.0.0.1:{}".format(self.port)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def close_idle_connections(self):
+        """服务器端关闭所有连接 (模拟空闲超时)"""
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+        await asyncio.sleep(0.01)
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        method, path, _ = line.decode().split(" ", 2)
+        length = 0
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            key, _, value = line.decode().partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+        body = await reader.readexactly(length) if length else b""
+        return method, path, body
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.open_connections += 1
+        self._writers.append(writer)
+        self._tasks.append(asyncio.current_task())
+        try:
+            if self.handshake:
+                await asyncio.sleep(self.handshake)
+            while True:
+                try:
+                    req = await self._read_request(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                if req is None:
+                    break
+                self.requests.append(req)
+                route = self.routes.get(req[1].split("?", 1)[0])
+                if route is None:
+                    route = Route(b"not found", status=404, content_type="text/plain")
+                if not await self._respond(route, writer):
+                    break
+        except asyncio.CancelledError:
+            pass    # stop() 时结束仍在等待的连接
+        finally:
+            self.open_connections -= 1
+            if writer in self._writers:
+                self._writers.remove(writer)
+            self._tasks.remove(asyncio.current_task())
+            writer.close()
+
+    async def _respond(self, route, writer):
+        """发送一个响应，返回连接是否继续保持"""
+        if route.drop:
+            if route.drop is not True:
+                route.drop -= 1
+            return False
+        if route.delay:
+            await asyncio.sleep(route.delay)
+
+        body = route.body
+        head = "HTTP/1.1 {} X\r\nContent-Type: {}\r\n".format(route.status, route.content_type)
+        if route.chunked:
+            head += "Transfer-Encoding: chunked\r\n"
+        else:
+            head += "Content-Length: {}\r\n".format(len(body))
+        if route.close:
+            head += "Connection: close\r\n"
+        writer.write(head.encode() + b"\r\n")
+
+        half = len(body) // 2
+        parts = [body[:half], body[half:]] if route.stall else [body]
+        for i, part in enumerate(parts):
+            if i and route.stall:
+                await writer.drain()
+                await asyncio.sleep(route.stall)
+            if route.chunked:
+                if part:
+                    writer.write(b"%x\r\n" % len(part) + part + b"\r\n")
+            else:
+                writer.write(part)
+        if route.chunked:
+            writer.write(b"0\r\n\r\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            return False
+        return not route.close
@@ -0,0 +1,81 @@
+# test_circular_series.py - 循环折线只让改动的列失效，缺口绕回开头时两段都要失效
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "libs", "circular_series"))
+
+from circular_series import CircularSeries
+
+_X1 = 10
+_W = 290    # 30 个点，每列 10 像素
+
+
+class FakeChart:
+    def __init__(self):
+        self.areas = []
+        self.full = 0
+
+    def set_point_count(self, n):
+        self.points = n
+
+    def set_ext_y_array(self, series, ys):
+        self.ys = ys
+
+    def set_ext_x_array(self, series, xs):
+        self.xs = xs
+
+    def refresh(self):
+        pass
+
+    def invalidate(self):
+        self.full += 1
+
+    def get_content_coords(self, area):
+        area.x1, area.y1, area.x2, area.y2 = _X1, 20, _X1 + _W, 170
+
+    def invalidate_area(self, area):
+        self.areas.append((area.x1, area.x2))
+
+
+def columns(area, margin=6):
+    x1, x2 = area
+    return (x1 + margin - _X1) // 10, (x2 - margin - _X1) // 10
+
+
+def make(gap=2):
+    chart = FakeChart()
+    circ = CircularSeries(30, gap=gap)
+    circ.bind(chart, None)
+    return chart, circ
+
+
+def test_middle_append_invalidates_neighbour_columns():
+    chart, circ = make()
+    circ.head = 10
+    circ.append(50)
+    assert [columns(a) for a in chart.areas] == [(9, 13)]
+    assert chart.full == 0
+
+
+def test_gap_wrapping_invalidates_left_edge():
+    chart, circ = make()
+    circ.head = 28
+    circ.append(50)
+    # 缺口写到下标 29 和 0：右侧 27..29，左侧 0..1
+    assert sorted(columns(a) for a in chart.areas) == [(0, 1), (27, 29)]
+    assert circ.ys[0] == circ.none
+
+    chart.areas.clear()
+    circ.append(60)
+    # pos=29，缺口为 0 和 1
+    assert sorted(columns(a) for a in chart.areas) == [(0, 2), (28, 29)]
+    assert circ.ys[1] == circ.none and circ.head == 0
+
+
+def test_scatter_invalidates_whole_chart():
+    chart = FakeChart()
+    circ = CircularSeries(10, gap=0, scatter=True)
+    circ.bind(chart, None)
+    circ.append(5, 3)
+    assert chart.full == 1 and chart.areas == []
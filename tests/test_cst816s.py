@@ -0,0 +1,80 @@
+# test_cst816s.py - 轮询与 INT 中断两种读取方式的 I2C 流量 (I2C/Pin 替身)
+#
+# touch_read 每 5 ms 调用一次 (主循环节拍)，模拟 1 秒；按下时芯片每 10 ms
+# 更新一次坐标并在 INT 线上给出一个脉冲。
+
+import fakes
+from cst816s import CST816S
+
+_READ_PERIOD_MS = 5
+_CHIP_PERIOD_MS = 10
+
+
+def make_touch(irq):
+    pin = fakes.Pin(12) if irq else None
+    chip = fakes.FakeCST816S(int_pin=pin)
+    touch = CST816S(fakes.I2C(device=chip), irq_pin=pin)
+    touch.reset_bus_stats()
+    chip.reset_stats()
+    return touch, chip
+
+
+def run_second(touch, chip, finger_down):
+    """返回这 1 秒内 I2C 传输次数和读到的按下次数"""
+    pressed = 0
+    for t in range(0, 1000, _READ_PERIOD_MS):
+        if finger_down and t % _CHIP_PERIOD_MS == 0:
+            chip.touch(60 + t // 10, 120)
+        coords = touch._get_coords()
+        if coords is not None:
+            pressed += 1
+    return chip.transactions, pressed
+
+
+def test_polling_reads_bus_every_tick():
+    touch, chip = make_touch(irq=False)
+    transactions, pressed = run_second(touch, chip, finger_down=False)
+    # 每次读取是一次写寄存器地址加一次 6 字节读
+    assert transactions == 2 * 1000 // _READ_PERIOD_MS
+    assert pressed == 0
+
+
+def test_irq_idle_is_silent():
+    touch, chip = make_touch(irq=True)
+    # 构造后第一次读取会确认一次初始状态
+    touch._get_coords()
+    chip.reset_stats()
+    transactions, pressed = run_second(touch, chip, finger_down=False)
+    assert transactions == 0
+    assert pressed == 0
+
+
+def test_irq_active_reads_once_per_pulse():
+    touch, chip = make_touch(irq=True)
+    transactions, pressed = run_second(touch, chip, finger_down=True)
+    pulses = 1000 // _CHIP_PERIOD_MS
+    assert chip.int_pin.irqs == pulses
+    assert transactions == 2 * pulses
+    # 两次脉冲之间返回缓存的样本，每次 touch_read 都是按下状态
+    assert pressed == 1000 // _READ_PERIOD_MS
+    assert touch.bus_reads == pulses
+
+
+def test_irq_release_is_reported():
+    touch, chip = make_touch(irq=True)
+    chip.touch(100, 80)
+    assert touch._get_coords() == (touch.PRESSED, 100, 80)
+    assert touch._get_coords() == (touch.PRESSED, 100, 80)
+    chip.release()
+    assert touch._get_coords() is None
+    assert touch._get_coords() is None
+
+
+def test_irq_retries_after_bus_error():
+    touch, chip = make_touch(irq=True)
+    chip.touch(100, 80)
+    chip.fail = True
+    assert touch._get_coords() is None
+    chip.fail = False
+    # 出错后不等下一个脉冲，下一次读取直接重试
+    assert touch._get_coords() == (touch.PRESSED, 100, 80)
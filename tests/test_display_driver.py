@@ -0,0 +1,103 @@
+# test_display_driver.py - 圆屏裁剪与条带刷新 (lcd_bus 替身记录总线传输)
+
+import fakes
+from display_driver import GC9A01Display, RoundMask, coalesce
+
+
+def make_display():
+    bus = fakes.SPIBus()
+    disp = GC9A01Display(data_bus=bus, display_width=240, display_height=240)
+    disp.enable_round_clip()
+    return disp, bus
+
+
+def flush_strip(disp, y1, y2, x1=0, x2=239):
+    data = bytearray((x2 - x1 + 1) * (y2 - y1 + 1) * 2)
+    disp._flush_cb(disp._disp_drv, fakes.area_t(x1, y1, x2, y2), fakes.ColorPointer(data))
+
+
+def test_mask_clips_to_disc():
+    mask = RoundMask(240, 240)
+    assert mask.clip(0, 0, 239, 239) == (0, 0, 239, 239)
+    assert mask.clip(100, 100, 139, 139) == (100, 100, 139, 139)
+    # 左上角 20x20 完全在圆外
+    assert mask.clip(0, 0, 19, 19) is None
+    # 顶部一整行只有中间一段可见
+    x1, y1, x2, y2 = mask.clip(0, 0, 239, 0)
+    assert y1 == y2 == 0
+    assert 100 < x1 < 120 < x2 < 140
+
+
+def test_coalesce_merges_contained_and_adjacent():
+    assert coalesce([(10, 10, 50, 50), (20, 20, 30, 30)]) == [(10, 10, 50, 50)]
+    assert coalesce([(0, 0, 9, 9), (10, 0, 19, 9)]) == [(0, 0, 19, 9)]
+    # 对角的两个小区域合并后面积变大，保持分开
+    assert len(coalesce([(0, 0, 9, 9), (100, 100, 109, 109)])) == 2
+
+
+def test_hidden_area_is_dropped_when_frame_has_areas():
+    disp, bus = make_display()
+    lv_disp = disp._disp_drv
+    lv_disp.invalidate(100, 100, 139, 139)
+    lv_disp.invalidate(0, 0, 19, 19)
+    assert lv_disp.inv_areas == [(100, 100, 139, 139)]
+    assert disp.areas_dropped == 1
+
+
+def test_hidden_area_alone_sends_nothing():
+    disp, bus = make_display()
+    lv_disp = disp._disp_drv
+    lv_disp.invalidate(0, 0, 19, 19)
+    assert lv_disp.inv_areas == [(0, 0, 0, 0)]
+    flush_strip(disp, 0, 0, 0, 0)
+    assert bus.transfers == []
+    assert lv_disp.flush_ready_calls == 1
+
+
+def test_visible_area_is_clipped():
+    disp, bus = make_display()
+    lv_disp = disp._disp_drv
+    lv_disp.invalidate(0, 20, 239, 29)
+    x1, y1, x2, y2 = lv_disp.inv_areas[0]
+    assert (y1, y2) == (20, 29)
+    assert x1 > 0 and x2 < 239
+
+
+def test_saved_pixels_count_duplicates_once():
+    disp, bus = make_display()
+    lv_disp = disp._disp_drv
+    # 同一个标签在一帧内失效两次，再加一个包含在其中的小区域
+    lv_disp.invalidate(100, 100, 139, 139)
+    lv_disp.invalidate(100, 100, 139, 139)
+    lv_disp.invalidate(110, 110, 119, 119)
+    lv_disp.refr_ready()
+    assert disp.last_frame_saved_px == 0
+
+    lv_disp.invalidate(0, 0, 239, 239)
+    lv_disp.refr_ready()
+    assert disp.last_frame_saved_px == 0  # 整屏的外接框就是整屏
+
+    lv_disp.invalidate(0, 0, 239, 9)
+    lv_disp.refr_ready()
+    x1, y1, x2, y2 = RoundMask().clip(0, 0, 239, 9)
+    assert disp.last_frame_saved_px == 240 * 10 - (x2 - x1 + 1) * (y2 - y1 + 1)
+
+
+def test_flush_drops_hidden_rows():
+    disp, bus = make_display()
+    flush_strip(disp, 100, 139)
+    assert bus.bytes_sent == 240 * 40 * 2
+    assert disp.flush_rows_skipped == 0
+
+    bus.reset_stats()
+    # 最上面一条条带只剩可见行；整条在圆外时不触碰总线
+    flush_strip(disp, 0, 39, 0, 59)
+    top = RoundMask().visible_rows(0, 0, 59, 39)[0]
+    assert bus.transfers[0][3] == top
+    assert bus.bytes_sent == 60 * (40 - top) * 2
+    assert disp.flush_rows_skipped == top
+
+    bus.reset_stats()
+    flush_strip(disp, 0, 19, 0, 19)
+    assert bus.transfers == []
+    assert disp.get_flush_stats()['rows_skipped'] == top + 20
@@ -0,0 +1,70 @@
+# test_gesture.py - 回放触摸坐标序列，检查 GestureRecognizer 的识别结果
+#
+# data/gesture_traces.json 每条记录是一次操作的 touch_read 采样：
+# [t, x, y] 为按下，[t] 为抬起；expect 是按顺序应得到的手势名。
+
+import json
+import os
+
+import pytest
+
+import cst816s
+from gesture import GestureRecognizer
+
+_TRACES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gesture_traces.json")
+
+with open(_TRACES) as f:
+    TRACES = json.load(f)
+
+
+def replay(recognizer, samples):
+    """按时间戳送入采样，返回 (手势名, vx, vy, 抬起时刻) 列表"""
+    names = {getattr(cst816s, n): n[len("GESTURE_"):] for n in dir(cst816s) if n.startswith("GESTURE_")}
+    events = []
+    for s in samples:
+        if len(s) == 3:
+            recognizer.feed(True, s[1], s[2], s[0])
+        else:
+            recognizer.feed(False, t=s[0])
+        ev = recognizer.pop_event()
+        while ev is not None:
+            events.append((names[ev[0]], ev[1], ev[2], s[0]))
+            ev = recognizer.pop_event()
+    return events
+
+
+@pytest.mark.parametrize("trace", TRACES, ids=[t["name"] for t in TRACES])
+def test_trace(trace):
+    events = replay(GestureRecognizer(), trace["samples"])
+    assert [e[0] for e in events] == trace["expect"]
+
+
+@pytest.mark.parametrize("name", ["swipe_left", "swipe_right", "swipe_up", "swipe_down", "fling_left_short"])
+def test_swipe_reported_on_lift(name):
+    trace = next(t for t in TRACES if t["name"] == name)
+    lift = trace["samples"][-1][0]
+    (gesture, vx, vy, t), = replay(GestureRecognizer(), trace["samples"])
+    assert t == lift
+    # 速度方向与手势一致
+    if gesture == "SWIPE_LEFT":
+        assert vx < 0
+    elif gesture == "SWIPE_RIGHT":
+        assert vx > 0
+    elif gesture == "SWIPE_UP":
+        assert vy < 0
+    else:
+        assert vy > 0
+
+
+def test_long_press_fires_while_held():
+    trace = next(t for t in TRACES if t["name"] == "long_press")
+    (gesture, _, _, t), = replay(GestureRecognizer(long_press_ms=600), trace["samples"])
+    assert t == 600
+
+
+def test_thresholds_are_configurable():
+    trace = next(t for t in TRACES if t["name"] == "fling_left_short")
+    assert replay(GestureRecognizer(fling_velocity=5000), trace["samples"]) == []
+    trace = next(t for t in TRACES if t["name"] == "two_slow_taps")
+    events = replay(GestureRecognizer(double_tap_ms=1000), trace["samples"])
+    assert [e[0] for e in events] == ["SINGLE_CLICK", "DOUBLE_CLICK"]
@@ -0,0 +1,72 @@
+# test_glyph_cache.py - 从字库按需读取字形，展开为 A8 后按 stride 写入
+
+import os
+import struct
+import sys
+
+import pytest
+
+from glyph_cache import BinFontReader, GlyphCache, expand_a8
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..")
+_FONT = os.path.join(_ROOT, "smartwatch", "font_cn_16.bin")
+sys.path.insert(0, os.path.join(_ROOT, "tools"))
+
+import font_subset
+
+
+def _pixel(bitmap, bpp, i):
+    bit = i * bpp
+    return (bitmap[bit // 8] >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)
+
+
+@pytest.mark.parametrize("bpp", [1, 2, 4, 8])
+def test_expand_odd_width_rows(bpp):
+    box_w, box_h, stride = 5, 3, 8
+    levels = (1 << bpp) - 1
+    values = [(i * 7) % (levels + 1) for i in range(box_w * box_h)]
+    packed = bytearray((len(values) * bpp + 7) // 8)
+    for i, v in enumerate(values):
+        bit = i * bpp
+        packed[bit // 8] |= v << (8 - bpp - bit % 8)
+
+    out = bytearray(b"\xee" * stride * box_h)
+    expand_a8(packed, bpp, box_w, box_h, out, stride)
+    for y in range(box_h):
+        row = out[y * stride:y * stride + box_w]
+        assert list(row) == [values[y * box_w + x] * (255 // levels) for x in range(box_w)]
+        # stride 之后的填充字节不动
+        assert out[y * stride + box_w:(y + 1) * stride] == b"\xee" * (stride - box_w)
+
+
+def test_reads_glyphs_from_font_file():
+    reader = BinFontReader(_FONT)
+    try:
+        cache = GlyphCache(reader, max_bytes=4096)
+        glyph = cache.get(ord("北"))
+        assert glyph is not None
+        adv_w, box_w, box_h, ofs_x, ofs_y, bitmap = glyph
+        assert 0 < box_w <= reader.font_size + 2 and 0 < box_h <= reader.font_size + 2
+        assert any(_pixel(bitmap, reader.bpp, i) for i in range(box_w * box_h))
+
+        out = bytearray(box_w * box_h)
+        expand_a8(bitmap, reader.bpp, box_w, box_h, out, box_w)
+        top = 255 // ((1 << reader.bpp) - 1)
+        assert max(out) == ((1 << reader.bpp) - 1) * top
+
+        assert cache.get(ord("北")) is glyph
+        assert cache.get(0x10FFFF) is None
+        assert cache.get_stats()['hits'] == 1
+    finally:
+        reader.close()
+
+
+def test_subset_cmap_groups_fit_u16():
+    codes = [0x20, 0x20 + 0xFFFE, 0x20 + 0xFFFF, 0x20 + 0x1FFFD]
+    table = font_subset._build_cmap(codes)
+    count = struct.unpack_from("<I", table, 8)[0]
+    groups = [struct.unpack_from("<IIHHHBB", table, 12 + 16 * i) for i in range(count)]
+    assert [(g[1], g[2], g[4]) for g in groups] == [
+        (0x20, 0xFFFF, 2),
+        (0x20 + 0xFFFF, 0xFFFF, 2),
+    ]
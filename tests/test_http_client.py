@@ -0,0 +1,174 @@
+# test_http_client.py - 对本地替身服务器发请求，注入延迟、卡顿和断线
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import http_client
+from http_server import Route, StandInServer
+
+_WEATHER = json.dumps({"results": [{"location": {"name": "Beijing"},
+                                    "now": {"text": "Sunny", "code": "0", "temperature": "21"}}]})
+
+
+@pytest.fixture(autouse=True)
+def reset_pool():
+    http_client._pool.clear()
+    for key in http_client.stats:
+        http_client.stats[key] = 0
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            # 池中的连接属于这个事件循环，结束前关掉
+            http_client.close_idle()
+    return asyncio.run(main())
+
+
+async def fetch(url, timeout=2, method="GET", data=None):
+    res = await http_client.request(method, url, data, None, timeout)
+    try:
+        return res.status_code, await res.read()
+    finally:
+        await res.close()
+
+
+def test_get_and_json_paths():
+    async def main():
+        async with StandInServer({"/now": Route(_WEATHER), "/chunked": Route(_WEATHER, chunked=True)}) as srv:
+            status, body = await fetch(srv.base_url + "/now")
+            assert status == 200 and json.loads(body)["results"][0]["now"]["code"] == "0"
+
+            res = await http_client.get(srv.base_url + "/chunked")
+            data = await res.json_paths(["results.0.now.temperature"])
+            await res.close()
+            assert data == {"results.0.now.temperature": "21"}
+
+            status, body = await fetch(srv.base_url + "/missing")
+            assert status == 404
+    run(main())
+
+
+def test_post_sends_body():
+    async def main():
+        async with StandInServer({"/fx": Route('{"code":200}')}) as srv:
+            await fetch(srv.base_url + "/fx", method="POST", data="money=1&fromcoin=USD")
+            assert srv.requests[-1] == ("POST", "/fx", b"money=1&fromcoin=USD")
+    run(main())
+
+
+def test_slow_headers_time_out():
+    async def main():
+        async with StandInServer({"/slow": Route(_WEATHER, delay=1.0)}) as srv:
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await fetch(srv.base_url + "/slow", timeout=0.2)
+            assert time.monotonic() - start < 0.8
+    run(main())
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_stalled_body_times_out_and_closes_connection(chunked):
+    async def main():
+        async with StandInServer({"/stall": Route(_WEATHER, stall=1.0, chunked=chunked),
+                                  "/ok": Route(_WEATHER)}) as srv:
+            res = await http_client.get(srv.base_url + "/stall", timeout=0.2)
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await res.read()
+            assert time.monotonic() - start < 0.8
+            await res.close()
+            # 卡住的连接没有放回池中，下一次请求新开连接
+            assert http_client._pool.get((False, "127.0.0.1", srv.port), []) == []
+            status, _ = await fetch(srv.base_url + "/ok")
+            assert status == 200
+            assert srv.connections == 2
+    run(main())
+
+
+def test_dropped_connection_raises():
+    async def main():
+        async with StandInServer({"/drop": Route(drop=True)}) as srv:
+            with pytest.raises(http_client.HttpError):
+                await fetch(srv.base_url + "/drop")
+    run(main())
+
+
+def test_requests_run_concurrently():
+    async def main():
+        async with StandInServer({"/slow": Route(_WEATHER, delay=0.3)}) as srv:
+            ticks = 0
+
+            async def ui():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ui_task = asyncio.create_task(ui())
+            start = time.monotonic()
+            results = await asyncio.gather(*[fetch(srv.base_url + "/slow") for _ in range(3)])
+            elapsed = time.monotonic() - start
+            ui_task.cancel()
+            assert [r[0] for r in results] == [200, 200, 200]
+            # 三个请求重叠等待，界面协程在等待期间照常运行
+            assert elapsed < 0.8
+            assert ticks > 10
+    run(main())
+
+
+def test_connection_is_reused():
+    async def main():
+        async with StandInServer({"/now": Route(_WEATHER)}) as srv:
+            for _ in range(5):
+                status, _ = await fetch(srv.base_url + "/now")
+                assert status == 200
+            assert srv.connections == 1
+            assert http_client.stats["connections_opened"] == 1
+            assert http_client.stats["connections_reused"] == 4
+    run(main())
+
+
+def test_stale_get_is_retried_on_new_connection():
+    async def main():
+        async with StandInServer({"/now": Route(_WEATHER)}) as srv:
+            await fetch(srv.base_url + "/now")
+            await srv.close_idle_connections()
+            status, _ = await fetch(srv.base_url + "/now")
+            assert status == 200
+            assert srv.connections == 2
+    run(main())
+
+
+def test_stale_post_is_not_resent():
+    async def main():
+        async with StandInServer({"/fx": Route('{"code":200}')}) as srv:
+            await fetch(srv.base_url + "/fx", method="POST", data="a=1")
+            await srv.close_idle_connections()
+            with pytest.raises((http_client.HttpError, OSError)):
+                await fetch(srv.base_url + "/fx", method="POST", data="a=2")
+            assert [r[2] for r in srv.requests] == [b"a=1"]
+            assert http_client._pool.get((False, "127.0.0.1", srv.port), []) == []
+    run(main())
+
+
+def test_cancelled_request_closes_pooled_connection():
+    async def main():
+        async with StandInServer({"/now": Route(_WEATHER), "/slow": Route(_WEATHER, delay=1.0)}) as srv:
+            await fetch(srv.base_url + "/now")
+            key = (False, "127.0.0.1", srv.port)
+            writer = http_client._pool[key][0][1]
+            task = asyncio.create_task(fetch(srv.base_url + "/slow"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # 取消时正在使用的池连接被关闭，而不是留着半个响应
+            assert writer.is_closing()
+            assert http_client._pool.get((False, "127.0.0.1", srv.port), []) == []
+    run(main())
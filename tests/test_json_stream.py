@@ -0,0 +1,51 @@
+# test_json_stream.py - 对响应样本按任意分块流式解析，结果与 json.loads 一致
+
+import json
+import os
+
+import pytest
+
+from json_stream import JsonPathReader
+
+_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "responses")
+
+CASES = [
+    ("seniverse_now.json", ["results.0.now", "results.0.location.name"]),
+    ("tianapi_fxrate.json", ["code", "msg", "result.exchange"]),
+    ("rates_latest.json", ["base", "rates.CNY", "rates.JPY", "rates.XXX"]),
+]
+
+
+def lookup(tree, path):
+    node = tree
+    for part in path.split("."):
+        node = node[int(part)] if isinstance(node, list) else node.get(part)
+        if node is None:
+            return None
+    return node
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 256])
+@pytest.mark.parametrize("name,paths", CASES)
+def test_matches_json_loads(name, paths, chunk):
+    with open(os.path.join(_SAMPLES, name), "rb") as f:
+        body = f.read()
+    tree = json.loads(body)
+    reader = JsonPathReader(paths)
+    for i in range(0, len(body), chunk):
+        reader.feed(body[i:i + chunk])
+    result = reader.finish()
+    for p in paths:
+        assert result.get(p) == lookup(tree, p)
+
+
+def test_done_before_end_of_body():
+    with open(os.path.join(_SAMPLES, "rates_latest.json"), "rb") as f:
+        body = f.read()
+    reader = JsonPathReader(["base"])
+    fed = 0
+    while not reader.done:
+        reader.feed(body[fed:fed + 64])
+        fed += 64
+    assert reader.finish() == {"base": "USD"}
+    assert fed < len(body)
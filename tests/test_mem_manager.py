@@ -0,0 +1,40 @@
+# test_mem_manager.py - 分配预算按 gc.mem_alloc() 的增量计算，外部回收后不会变成负数
+
+import gc
+
+import pytest
+
+from mem_manager import MemoryManager
+
+
+@pytest.fixture
+def heap(monkeypatch):
+    state = {'alloc': 100000, 'free': 200000}
+    monkeypatch.setattr(gc, "mem_alloc", lambda: state['alloc'])
+    monkeypatch.setattr(gc, "mem_free", lambda: state['free'])
+    monkeypatch.setattr(gc, "collect", lambda: None)
+    return state
+
+
+def test_budget_collects_in_idle_frame(heap):
+    mem = MemoryManager(budget=10000)
+    heap['alloc'] += 9999
+    assert not mem.idle(16)
+    heap['alloc'] += 1
+    assert mem.idle(16)
+    assert mem.last_reason == "budget"
+
+
+def test_automatic_gc_resets_baseline(heap):
+    mem = MemoryManager(budget=10000)
+    heap['alloc'] += 8000
+    # MicroPython 自己回收了一次，用量低于上次记录的基准
+    heap['alloc'] = 60000
+    assert mem.allocated_since_collect() == 0
+    assert mem.get_stats()['since_collect'] == 0
+
+    heap['alloc'] += 9000
+    assert mem.allocated_since_collect() == 9000
+    assert not mem.idle(16)
+    heap['alloc'] += 1000
+    assert mem.idle(16)
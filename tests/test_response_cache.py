@@ -0,0 +1,95 @@
+# test_response_cache.py - 用假时钟 (wall) 验证 TTL、重启后的持久化和时钟回拨
+
+import os
+
+import pytest
+
+from response_cache import ResponseCache, _key_hash
+
+
+class Clock:
+    def __init__(self, now=1_760_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def wall():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, wall):
+    return ResponseCache(str(tmp_path / "cache"), wall)
+
+
+def test_fresh_until_ttl(cache, wall):
+    cache.put("weather:beijing", {"temperature": "21"})
+    wall.now += 3599
+    assert cache.get("weather:beijing", 3600) == {"temperature": "21"}
+    wall.now += 1
+    assert cache.get("weather:beijing", 3600) is None
+    assert cache.get_stale("weather:beijing") == {"temperature": "21"}
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_ttl_is_per_call(cache, wall):
+    cache.put("weather:beijing", 1)
+    cache.put("fx:USD:CNY", [7.12, 7.12])
+    wall.now += 900
+    # 天气 1 小时有效，汇率 10 分钟有效
+    assert cache.get("weather:beijing", 3600) == 1
+    assert cache.get("fx:USD:CNY", 600) is None
+
+
+def test_survives_reboot(tmp_path, wall):
+    directory = str(tmp_path / "cache")
+    ResponseCache(directory, wall).put("weather:beijing", {"code": "0"})
+
+    wall.now += 60
+    rebooted = ResponseCache(directory, wall)
+    assert rebooted.age("weather:beijing") == 60
+    assert rebooted.get("weather:beijing", 3600) == {"code": "0"}
+    assert not any(name.endswith(".tmp") for name in os.listdir(directory))
+
+
+def test_clock_not_synced_serves_only_stale(tmp_path, wall):
+    directory = str(tmp_path / "cache")
+    ResponseCache(directory, wall).put("weather:beijing", {"code": "0"})
+
+    # 重启后 NTP 尚未同步，RTC 从 2000 年开始计时
+    boot = ResponseCache(directory, Clock(946_684_800))
+    assert boot.age("weather:beijing") is None
+    assert boot.get("weather:beijing", 3600) is None
+    assert boot.get_stale("weather:beijing") == {"code": "0"}
+
+
+def test_memory_only(wall):
+    cache = ResponseCache(None, wall)
+    cache.put("k", [1, 2])
+    assert cache.get("k", 10) == [1, 2]
+    cache.invalidate("k")
+    assert cache.get_stale("k") is None
+
+
+def test_invalidate_removes_file(cache, wall, tmp_path):
+    cache.put("k", 1)
+    cache.invalidate("k")
+    assert os.listdir(str(tmp_path / "cache")) == []
+    assert ResponseCache(str(tmp_path / "cache"), wall).get_stale("k") is None
+
+
+def test_bad_files_are_ignored(tmp_path, wall):
+    directory = str(tmp_path / "cache")
+    cache = ResponseCache(directory, wall)
+    # 同名文件里存的是另一个键 (哈希冲突)
+    with open(os.path.join(directory, _key_hash("a") + ".json"), "w") as f:
+        f.write('[%d, "b", 1]' % wall.now)
+    assert cache.get_stale("a") is None
+    # 写了一半的文件
+    with open(os.path.join(directory, _key_hash("c") + ".json"), "w") as f:
+        f.write('[%d, "c", {"te' % wall.now)
+    assert cache.get_stale("c") is None
@@ -0,0 +1,57 @@
+# test_scheduler.py - 没有唤醒条件时协程主循环一次睡到下一个定时器，post() 提前唤醒
+
+import asyncio
+import time
+
+from scheduler import MainLoop
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_sleeps_whole_delay_without_wake_cb():
+    loop = MainLoop()
+    waits = []
+    original = loop._wait_posted
+
+    async def counted(ms):
+        waits.append(ms)
+        return await original(ms)
+
+    loop._wait_posted = counted
+    start = time.perf_counter()
+    run(loop._sleep_async(60))
+    elapsed = (time.perf_counter() - start) * 1000
+    # 一次等待，不再每 10ms 轮询
+    assert waits == [60]
+    assert elapsed >= 50
+
+
+def test_post_wakes_sleep_early():
+    loop = MainLoop()
+    ran = []
+
+    async def main():
+        async def producer():
+            await asyncio.sleep(0.02)
+            loop.post(ran.append, 1)
+
+        task = asyncio.create_task(producer())
+        start = time.perf_counter()
+        await loop._sleep_async(2000)
+        await task
+        return (time.perf_counter() - start) * 1000
+
+    elapsed = run(main())
+    assert elapsed < 500
+    loop._run_posted()
+    assert ran == [1]
+
+
+def test_pending_post_skips_sleep():
+    loop = MainLoop()
+    loop.post(lambda: None)
+    start = time.perf_counter()
+    run(loop._sleep_async(1000))
+    assert time.perf_counter() - start < 0.1
@@ -0,0 +1,68 @@
+# test_screen_registry.py - 按预算的 LRU 清理与分片预热
+
+import lvgl as lv
+from screen_registry import ScreenRegistry, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_PINNED
+
+
+def make_screen(counts, name, widgets=3):
+    scr = lv.obj()
+
+    def build():
+        counts[name] = counts.get(name, 0) + 1
+        for _ in range(widgets):
+            lv.obj(scr)
+            yield
+    return scr, build
+
+
+def make_registry(budget):
+    counts = {}
+    registry = ScreenRegistry(budget=budget)
+    home = lv.obj()
+    lv.obj(home)
+    registry.register("home", home, priority=PRIORITY_PINNED)
+    screens = {"home": home}
+    for name, cost, priority in (("a", 10, PRIORITY_NORMAL), ("b", 10, PRIORITY_NORMAL),
+                                 ("c", 10, PRIORITY_LOW)):
+        scr, build = make_screen(counts, name)
+        registry.register(name, scr, build, cost, priority)
+        screens[name] = scr
+    lv.screen_load(home)
+    return registry, screens, counts
+
+
+def test_swiping_within_budget_does_not_rebuild(capsys):
+    registry, s, counts = make_registry(budget=20)
+    for _ in range(10):
+        registry.show(s["a"])
+        registry.show(s["b"])
+    assert counts == {"a": 1, "b": 1}
+    assert registry.evictions == 0
+
+
+def test_low_priority_is_evicted_first(capsys):
+    registry, s, counts = make_registry(budget=20)
+    registry.show(s["c"])
+    registry.show(s["a"])
+    registry.show(s["b"])
+    assert s["c"].get_child_count() == 0
+    assert s["a"].get_child_count() > 0
+    # 同优先级时清理最久未用的
+    registry.show(s["c"])
+    assert s["a"].get_child_count() == 0
+    assert s["b"].get_child_count() > 0
+    assert registry.get_stats()["builds"] == {"a": 1, "b": 1, "c": 2}
+
+
+def test_idle_warm_up_is_sliced(clock):
+    registry, s, counts = make_registry(budget=30)
+    registry.max_slice_ms = 0
+    registry.prefetch([s["a"]])
+    assert registry.idle(16)
+    assert not registry.is_built(s["a"])
+    while registry.idle(16):
+        pass
+    assert registry.is_built(s["a"])
+    assert registry.warmups == 1
+    registry.show(s["a"])
+    assert counts == {"a": 1}
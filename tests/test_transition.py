@@ -0,0 +1,87 @@
+# test_transition.py - 快照缓冲只在动画期间存在，切换总是落到正确的页面
+
+import pytest
+
+import fakes
+import lvgl as lv
+from transition import SnapshotTransition, TRANSITION_SLIDE, TRANSITION_NONE
+
+
+@pytest.fixture
+def screens(clock):
+    fakes.anim_t.running = []
+    fakes.draw_buf_t.live = []
+    fakes.draw_buf_t.limit = None
+    a, b, c = lv.obj(), lv.obj(), lv.obj()
+    lv.screen_load(a)
+    return a, b, c
+
+
+def run_to_end(step_ms=16, limit_ms=2000):
+    for _ in range(limit_ms // step_ms):
+        if not fakes.anim_t.running:
+            return
+        fakes.CLOCK.advance(step_ms)
+        fakes.anim_tick()
+
+
+def test_buffers_live_only_during_animation(screens):
+    a, b, c = screens
+    t = SnapshotTransition(mode=TRANSITION_SLIDE, duration=250)
+    assert fakes.draw_buf_t.live == []
+
+    t.start(a, b, "next")
+    assert len(fakes.draw_buf_t.live) == 2
+    assert lv.screen_active() is t._screen
+
+    run_to_end()
+    assert lv.screen_active() is b
+    assert fakes.draw_buf_t.live == []
+    assert t._img_out.src is None and t._img_in.src is None
+    assert t.get_stats()['frames'] > 1
+
+
+def test_slide_moves_both_images(screens):
+    a, b, c = screens
+    t = SnapshotTransition(mode=TRANSITION_SLIDE, duration=250)
+    t.start(a, b, "next")
+    fakes.CLOCK.advance(100)
+    fakes.anim_tick()
+    assert t._img_out.x < 0 < t._img_in.x
+    assert t._img_in.x - t._img_out.x == 240
+
+
+def test_interrupted_transition_starts_from_previous_target(screens):
+    a, b, c = screens
+    t = SnapshotTransition(duration=250)
+    t.start(a, b, "next")
+    fakes.CLOCK.advance(50)
+    fakes.anim_tick()
+
+    # 第二次滑动时显示的是过渡屏幕，切出页面应取上一个目标
+    t.start(lv.screen_active(), c, "next")
+    assert len(fakes.draw_buf_t.live) == 2
+    out_buf = t._img_out.src
+    assert out_buf.data[0] == id(b) & 0xFF
+
+    run_to_end()
+    assert lv.screen_active() is c
+    assert fakes.draw_buf_t.live == []
+
+
+def test_no_memory_falls_back_to_plain_load(screens):
+    a, b, c = screens
+    fakes.draw_buf_t.limit = 240 * 240 * 2    # 只够一张快照
+    t = SnapshotTransition()
+    t.start(a, b, "next")
+    assert lv.screen_active() is b
+    assert fakes.draw_buf_t.live == []
+    assert fakes.anim_t.running == []
+
+
+def test_mode_none_loads_directly(screens):
+    a, b, c = screens
+    t = SnapshotTransition(mode=TRANSITION_NONE)
+    t.start(a, b)
+    assert lv.screen_active() is b
+    assert fakes.draw_buf_t.live == []
@@ -0,0 +1,142 @@
+# test_wifi_manager.py - 用假 WLAN 驱动连接状态机：慢速关联、密码错误、退避和关闭射频
+
+import pytest
+
+import fakes
+import wifi_manager
+from wifi_manager import WifiManager, STATE_OFF, STATE_CONNECTING, STATE_ONLINE, STATE_BACKOFF
+
+_TICK_MS = 250
+
+
+@pytest.fixture(autouse=True)
+def quiet(capsys, clock):
+    yield
+
+
+def make(wlan=None, **kwargs):
+    wlan = wlan or fakes.WLAN(assoc_ms=3000)
+    events = []
+    kwargs.setdefault("linger_ms", 5000)
+    mgr = WifiManager(wlan, "home", "secret",
+                      on_offline=lambda: events.append("offline"),
+                      on_wake=lambda: events.append("wake"), **kwargs)
+    return mgr, wlan, events
+
+
+def run(mgr, ms):
+    for _ in range(ms // _TICK_MS):
+        fakes.CLOCK.advance(_TICK_MS)
+        mgr.tick()
+
+
+def test_slow_association_runs_callbacks_once_online():
+    mgr, wlan, events = make(fakes.WLAN(assoc_ms=6000), linger_ms=10000)
+    online = []
+    mgr.when_online(lambda: online.append(fakes.CLOCK.ticks_ms()))
+    assert events == ["wake"]
+
+    run(mgr, 5000)
+    assert mgr.state == STATE_CONNECTING and online == []
+    # 每次 tick 只读一次状态，不会在里面等待
+    assert wlan.status_calls <= 5000 // _TICK_MS
+
+    run(mgr, 1500)
+    assert mgr.state == STATE_ONLINE
+    assert len(online) == 1 and 6000 <= online[0] <= 6500
+    assert mgr.connects == 1
+
+
+def test_wrong_password_backs_off_to_max():
+    mgr, wlan, events = make(fakes.WLAN(password="other"), backoff_max_ms=60000)
+    mgr.request()
+    run(mgr, 2000)
+    assert mgr.state == STATE_BACKOFF
+    assert mgr.last_error == "wrong password"
+    assert not wlan.active()
+    assert "offline" in events
+
+    # 退避期间保持需求也不会重试
+    for _ in range(50):
+        mgr.request()
+        run(mgr, 1000)
+    assert wlan.connect_calls == 1
+    for _ in range(15):
+        mgr.request()
+        run(mgr, 1000)
+    assert wlan.connect_calls == 2
+
+
+def test_no_retry_after_backoff_without_demand():
+    mgr, wlan, events = make(fakes.WLAN(password="other"), backoff_max_ms=2000, linger_ms=1000)
+    mgr.request()
+    run(mgr, 5000)
+    assert wlan.connect_calls == 1
+    assert mgr.state == STATE_OFF and mgr.sleeping
+
+
+def test_timeout_retries_with_exponential_backoff():
+    wlan = fakes.WLAN(assoc_ms=10 ** 9)
+    mgr, wlan, events = make(wlan, connect_timeout_ms=2000, backoff_min_ms=1000, backoff_max_ms=8000)
+    attempts = []
+    for _ in range(40000 // _TICK_MS):
+        mgr.request()
+        calls = wlan.connect_calls
+        fakes.CLOCK.advance(_TICK_MS)
+        mgr.tick()
+        if wlan.connect_calls != calls:
+            attempts.append(fakes.CLOCK.ticks_ms())
+    gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+    # 每次尝试 2 s 超时，间隔依次为 2+1、2+2、2+4、2+8、2+8 秒 (按 tick 取整)
+    assert [round(g / 1000) for g in gaps[:5]] == [3, 4, 6, 10, 10]
+    assert mgr.failures >= 5
+
+
+def test_ap_appears_later():
+    wlan = fakes.WLAN(ap_present=False, assoc_ms=500)
+    mgr, wlan, events = make(wlan, backoff_min_ms=2000)
+    mgr.when_online(lambda: None)
+    run(mgr, 2000)
+    assert mgr.last_error == "AP not found"
+    wlan.ap_present = True
+    run(mgr, 2500)
+    assert mgr.connects == 1
+    assert mgr.get_stats()["backoff_ms"] == 2000
+
+
+def test_radio_off_after_linger_and_wake_on_request():
+    mgr, wlan, events = make(fakes.WLAN(assoc_ms=500), linger_ms=5000)
+    mgr.request()
+    run(mgr, 1000)
+    assert mgr.online and not mgr.sleeping
+
+    run(mgr, 5000)
+    assert mgr.state == STATE_OFF
+    assert not wlan.active()
+    assert mgr.sleeping
+    assert wlan.radio_on_ms <= 6000
+
+    events.clear()
+    mgr.request()
+    assert events == ["wake"]
+    assert not mgr.sleeping
+    run(mgr, 1000)
+    assert mgr.online
+
+
+def test_connection_lost():
+    mgr, wlan, events = make(fakes.WLAN(assoc_ms=500))
+    mgr.request()
+    run(mgr, 1000)
+    wlan.drop()
+    events.clear()
+    mgr.tick()
+    assert mgr.state == STATE_OFF
+    assert events == ["offline"]
+    # 仍在 linger 时间内，下一次 tick 重新连接
+    mgr.tick()
+    assert mgr.state == STATE_CONNECTING
+
+
+def test_uses_network_constants():
+    assert wifi_manager.STAT_GOT_IP == fakes.STAT_GOT_IP
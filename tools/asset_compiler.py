@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# asset_compiler.py - 把 PNG/BMP 预编译成 LVGL v9 的 .bin 图片
+#
+# 示例里普遍用 f.read() 把整个 PNG 读进内存，再交给 LVGL 在设备上解码。
+# 这里在电脑上一次性转换成 LVGL 可直接使用的像素格式，设备端只需
+# img.set_src("S:xxx.bin")，加载时间可预测，不再需要 PNG 解码器的工作内存。
+#
+# 输出文件 = 12 字节 lv_image_header_t + (可选的压缩头) + 像素数据，
+# 并生成 manifest.json 记录每个文件的来源、格式、尺寸和大小。
+#
+# 用法：
+#   python3 tools/asset_compiler.py                      # 默认处理 assets/ libs/ smartwatch/
+#   python3 tools/asset_compiler.py --cf RGB565 --compress rle -o build/assets assets/star.png
+#
+# LZ4 压缩需要主机安装 lz4 (pip install lz4)，设备固件需启用 LV_USE_LZ4。
+
+import argparse
+import json
+import os
+import struct
+import sys
+
+from imgread import read_image, rgba_to_rgb565a8
+
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+_DEFAULT_INPUTS = ["assets", "libs", "smartwatch"]
+_EXTENSIONS = (".png", ".bmp")
+
+IMAGE_HEADER_MAGIC = 0x19
+IMAGE_FLAGS_COMPRESSED = 0x0008
+
+# lv_color_format_t 取值
+COLOR_FORMATS = {
+    "I1": 0x07,
+    "I2": 0x08,
+    "I4": 0x09,
+    "I8": 0x0A,
+    "RGB565": 0x12,
+    "RGB565A8": 0x14,
+    "ARGB8888": 0x10,
+}
+
+# lv_image_compress_t 取值
+COMPRESS_NONE = 0
+COMPRESS_RLE = 1
+COMPRESS_LZ4 = 2
+_COMPRESS_METHODS = {"none": COMPRESS_NONE, "rle": COMPRESS_RLE, "lz4": COMPRESS_LZ4}
+
+
+# ===== 像素格式转换 =====
+
+def _encode_rgb565(width, height, rgba):
+    out = bytearray(width * height * 2)
+    for i in range(width * height):
+        r, g, b = rgba[i * 4:i * 4 + 3]
+        c = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        out[i * 2] = c & 0xFF
+        out[i * 2 + 1] = c >> 8
+    return bytes(out), width * 2
+
+
+def _encode_argb8888(width, height, rgba):
+    # LVGL 在内存中按 B, G, R, A 顺序存放
+    out = bytearray(width * height * 4)
+    for i in range(width * height):
+        r, g, b, a = rgba[i * 4:i * 4 + 4]
+        out[i * 4:i * 4 + 4] = bytes((b, g, r, a))
+    return bytes(out), width * 4
+
+
+def _encode_indexed(width, height, rgba, bpp):
+    # 只做精确的调色板映射：颜色数超过 2^bpp 时报错，不做有损量化
+    colors = {}
+    for i in range(width * height):
+        key = rgba[i * 4:i * 4 + 4]
+        if key not in colors:
+            colors[key] = len(colors)
+    limit = 1 << bpp
+    if len(colors) > limit:
+        raise ValueError("{} colours do not fit in I{} (max {})".format(len(colors), bpp, limit))
+
+    palette = bytearray(limit * 4)
+    for (r, g, b, a), idx in colors.items():
+        palette[idx * 4:idx * 4 + 4] = bytes((b, g, r, a))
+
+    stride = (width * bpp + 7) // 8
+    pixels = bytearray(stride * height)
+    per_byte = 8 // bpp
+    for y in range(height):
+        for x in range(width):
+            i = y * width + x
+            idx = colors[rgba[i * 4:i * 4 + 4]]
+            # 高位在前
+            shift = (per_byte - 1 - x % per_byte) * bpp
+            pixels[y * stride + x // per_byte] |= idx << shift
+    return bytes(palette) + bytes(pixels), stride
+
+
+def encode(width, height, rgba, cf):
+    """返回 (像素数据, 行跨度)"""
+    if cf == "RGB565":
+        return _encode_rgb565(width, height, rgba)
+    if cf == "RGB565A8":
+        return rgba_to_rgb565a8(width, height, rgba), width * 2
+    if cf == "ARGB8888":
+        return _encode_argb8888(width, height, rgba)
+    if cf in ("I1", "I2", "I4", "I8"):
+        return _encode_indexed(width, height, rgba, int(cf[1:]))
+    raise ValueError("unsupported colour format: " + cf)
+
+
+def pixel_size(cf):
+    """RLE 的块大小：一个像素 (或一个字节) 占用的字节数"""
+    return {"RGB565": 2, "RGB565A8": 2, "ARGB8888": 4}.get(cf, 1)
+
+
+# ===== 压缩 =====
+
+def rle_compress(data, blk):
+    """
+    LVGL 的 RLE：控制字节最高位为 1 时，后跟 (ctrl & 0x7F) 个原样块；
+    否则后跟一个块，重复 ctrl 次。块大小 blk 为像素字节数。
+    """
+    if len(data) % blk:
+        data += b"\x00" * (blk - len(data) % blk)
+    count = len(data) // blk
+    out = bytearray()
+    i = 0
+    while i < count:
+        block = data[i * blk:(i + 1) * blk]
+        run = 1
+        while i + run < count and run < 127 and data[(i + run) * blk:(i + run + 1) * blk] == block:
+            run += 1
+        if run >= 3:
+            out.append(run)
+            out += block
+            i += run
+            continue
+
+        # 原样段：一直延伸到出现 3 个以上的重复块为止
+        start = i
+        while i < count and i - start < 127:
+            block = data[i * blk:(i + 1) * blk]
+            if i + 2 < count and data[(i + 1) * blk:(i + 2) * blk] == block \
+                    and data[(i + 2) * blk:(i + 3) * blk] == block:
+                break
+            i += 1
+        out.append(0x80 | (i - start))
+        out += data[start * blk:i * blk]
+    return bytes(out)
+
+
+def compress(data, method, blk):
+    if method == COMPRESS_RLE:
+        return rle_compress(data, blk)
+    if method == COMPRESS_LZ4:
+        if lz4 is None:
+            raise SystemExit("LZ4 compression requires the lz4 package (pip install lz4)")
+        return lz4.block.compress(data, store_size=False)
+    return data
+
+
+# ===== 文件输出 =====
+
+def build_bin(width, height, rgba, cf, method=COMPRESS_NONE):
+    """生成完整的 .bin 内容，返回 (字节, 未压缩数据大小)"""
+    data, stride = encode(width, height, rgba, cf)
+    flags = 0
+    body = data
+    if method != COMPRESS_NONE:
+        packed = compress(data, method, pixel_size(cf))
+        flags |= IMAGE_FLAGS_COMPRESSED
+        # lv_image_compressed_t：method:4 + reserved:28, compressed_size, decompressed_size
+        body = struct.pack("<III", method, len(packed), len(data)) + packed
+
+    header = struct.pack(
+        "<BBHHHHH",
+        IMAGE_HEADER_MAGIC, COLOR_FORMATS[cf], flags, width, height, stride, 0
+    )
+    return header + body, len(data)
+
+
+def _collect(inputs):
+    for path in inputs:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.lower().endswith(_EXTENSIONS):
+                        yield os.path.join(dirpath, name)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile PNG/BMP images into LVGL v9 .bin files")
+    parser.add_argument("inputs", nargs="*", help="image files or directories (default: assets libs smartwatch)")
+    parser.add_argument("-o", "--output", default=os.path.join(_ROOT, "build", "assets"),
+                        help="output directory (default: build/assets)")
+    parser.add_argument("--cf", default="RGB565A8", choices=sorted(COLOR_FORMATS),
+                        help="colour format (default: RGB565A8)")
+    parser.add_argument("--compress", default="none", choices=sorted(_COMPRESS_METHODS),
+                        help="compression method (default: none)")
+    parser.add_argument("--manifest", default="manifest.json",
+                        help="manifest file name inside the output directory")
+    args = parser.parse_args(argv)
+
+    inputs = args.inputs or [os.path.join(_ROOT, d) for d in _DEFAULT_INPUTS]
+    method = _COMPRESS_METHODS[args.compress]
+    manifest = {}
+    failed = 0
+
+    for src in _collect(inputs):
+        rel = os.path.relpath(os.path.abspath(src), _ROOT)
+        if rel.startswith(".."):
+            rel = os.path.basename(src)
+        dst_rel = os.path.splitext(rel)[0] + ".bin"
+        try:
+            width, height, rgba = read_image(src)
+            blob, raw_size = build_bin(width, height, rgba, args.cf, method)
+        except ValueError as e:
+            print("skip {}: {}".format(rel, e))
+            failed += 1
+            continue
+
+        dst = os.path.join(args.output, dst_rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with open(dst, "wb") as f:
+            f.write(blob)
+
+        manifest[dst_rel.replace(os.sep, "/")] = {
+            "src": rel.replace(os.sep, "/"),
+            "cf": args.cf,
+            "w": width,
+            "h": height,
+            "compress": args.compress,
+            "data_size": raw_size,
+            "file_size": len(blob),
+        }
+        print("{} -> {} ({}x{}, {} bytes)".format(rel, dst_rel, width, height, len(blob)))
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, args.manifest), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+    print("{} images compiled, {} skipped".format(len(manifest), failed))
+    return 1 if failed and not manifest else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
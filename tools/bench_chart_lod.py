@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# bench_chart_lod.py - 多级抽取每次重绘处理的点数 (主机端)
+#
+# 用 EcgSimulator 生成一段长记录，建立最小/最大值金字塔，然后在不同缩放
+# 倍数下统计每次更新读取的条目数和耗时。直接把整段记录交给图表时，
+# LVGL 每帧都要遍历全部样本，作为对照列出。
+#
+# 用法：python3 tools/bench_chart_lod.py [--samples 100000] [--points 200]
+
+import argparse
+import os
+import sys
+import time
+from array import array
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, os.path.join(_ROOT, "libs", "chart_lod"))
+
+from chart_source import EcgSimulator
+from chart_lod import ChartLOD
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the min/max level-of-detail chart layer")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--factor", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    samples = array('h', [0]) * args.samples
+    EcgSimulator(250).read(samples)
+
+    start = time.perf_counter()
+    lod = ChartLOD(samples, args.points, args.factor)
+    build_ms = (time.perf_counter() - start) * 1000
+    stats = lod.get_stats()
+    print("{} samples: {} levels, pyramid {} bytes, built in {:.1f} ms".format(
+        stats['samples'], stats['levels'], stats['pyramid_bytes'], build_ms))
+
+    print("{:>8} {:>10} {:>6} {:>10} {:>12} {:>10}".format(
+        "zoom", "visible", "level", "visited", "us/update", "full scan"))
+    zoom = 256
+    while zoom <= 256 * args.samples // args.points * 2:
+        lod.set_zoom(zoom)
+        rounds = 50
+        start = time.perf_counter()
+        for i in range(rounds):
+            # 每轮平移一点，模拟拖动
+            lod.scroll_to((i * 997) % args.samples)
+        us = (time.perf_counter() - start) * 1e6 / rounds
+        print("{:>7}x {:>10} {:>6} {:>10} {:>12.0f} {:>10}".format(
+            zoom // 256, lod.span(), lod.level, lod.visited, us, args.samples))
+        zoom *= 4
+
+
+if __name__ == "__main__":
+    main()
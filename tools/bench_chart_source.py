@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# bench_chart_source.py - 测量 RingChartSource 可持续处理的采样率 (主机端)
+#
+# 用 EcgSimulator 作为替身传感器，按不同块大小送入样本，每 frame_ms 毫秒的
+# 样本量调用一次 flush() (模拟每帧一次刷新)，统计每秒能处理的样本数，并与
+# 旧方式 (每个样本一次 set_next_value，即一次图表失效) 的失效次数对比。
+#
+# 主机结果只用于比较不同参数；设备上的绝对数值会低一到两个数量级。
+#
+# 用法：python3 tools/bench_chart_source.py [--seconds 2] [--rate 250]
+
+import argparse
+import os
+import sys
+import time
+from array import array
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+
+from chart_source import RingChartSource, EcgSimulator
+
+
+def run(rate_hz, block, seconds, frame_ms, capacity, points):
+    sensor = EcgSimulator(rate_hz)
+    source = RingChartSource(capacity, points, min_interval_ms=0)
+    buf = array('h', [0]) * block
+    per_frame = max(1, rate_hz * frame_ms // 1000)
+
+    total = 0
+    since_flush = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        n = sensor.read(buf)
+        source.push(buf, n)
+        total += n
+        since_flush += n
+        if since_flush >= per_frame:
+            source.flush()
+            since_flush = 0
+    elapsed = time.perf_counter() - start
+    return total / elapsed, source
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ring-buffer chart source")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rate", type=int, default=250, help="simulated sensor rate (Hz)")
+    parser.add_argument("--frame-ms", type=int, default=33)
+    parser.add_argument("--capacity", type=int, default=500)
+    parser.add_argument("--points", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    print("{:>6} {:>14} {:>10} {:>12} {:>16}".format(
+        "block", "samples/s", "flushes", "flush us", "invalidations/s"))
+    for block in (1, 8, 25, 100):
+        rate, source = run(args.rate, block, args.seconds, args.frame_ms, args.capacity, args.points)
+        stats = source.get_stats()
+        # 按 rate Hz 的实时数据流折算：新方式每帧最多一次，旧方式每个样本一次
+        frames_per_s = min(args.rate, 1000 // args.frame_ms)
+        print("{:>6} {:>14.0f} {:>10} {:>12} {:>7} (old {})".format(
+            block, rate, stats['flushes'], stats['flush_us'], frames_per_s, args.rate))
+
+
+if __name__ == "__main__":
+    main()
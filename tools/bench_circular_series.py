@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# bench_circular_series.py - 循环序列追加一个点的开销与点数的关系 (主机端)
+#
+# 对照 lv_example_chart_7 原来的做法：两个 Python 列表各 pop(0) 再 append，
+# 每次都要搬移整个列表 (O(n))；CircularSeries.append 只写入一个位置和缺口。
+#
+# 用法：python3 tools/bench_circular_series.py [--appends 20000]
+
+import argparse
+import os
+import sys
+import time
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "libs", "circular_series"))
+
+from circular_series import CircularSeries
+
+
+def _lists(count, appends):
+    xs = [0] * count
+    ys = [0] * count
+    start = time.perf_counter()
+    for i in range(appends):
+        xs.pop(0)
+        xs.append(i)
+        ys.pop(0)
+        ys.append(i)
+    return (time.perf_counter() - start) * 1e9 / appends
+
+
+def _circular(count, appends):
+    series = CircularSeries(count, gap=2, scatter=True)
+    start = time.perf_counter()
+    for i in range(appends):
+        series.append(i & 0x7FFF, i & 0x7FFF)
+    return (time.perf_counter() - start) * 1e9 / appends
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark circular chart series appends")
+    parser.add_argument("--appends", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print("{:>8} {:>14} {:>14}".format("points", "lists ns/op", "circular ns/op"))
+    for count in (50, 500, 5000, 50000, 200000):
+        print("{:>8} {:>14.0f} {:>14.0f}".format(
+            count, _lists(count, args.appends), _circular(count, args.appends)))
+
+
+if __name__ == "__main__":
+    main()
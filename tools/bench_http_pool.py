@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# bench_http_pool.py - keep-alive 连接池的连接数与请求延迟 (主机端)
+#
+# 对 tests/http_server.py 的本地替身服务器连续发出 --queries 次天气查询，
+# 服务器对每个新连接先等待 --handshake-ms (模拟 TLS 握手)。对比：
+#   fresh    每次请求后关闭连接 (原来 urequests 的行为)
+#   pooled   http_client 的 keep-alive 连接池
+#   stale    连接池，但服务器每隔 --stale-every 次请求关闭一次空闲连接，
+#            GET 在新连接上重试
+# 报告服务器实际接受的连接数、客户端统计的新建/复用次数和每次请求的延迟。
+#
+# 用法：python3 tools/bench_http_pool.py [--queries 50] [--handshake-ms 40]
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, os.path.join(_ROOT, "tests"))
+
+import fakes
+
+fakes.install()
+
+import http_client
+from http_server import Route, StandInServer
+
+_SAMPLE = os.path.join(_ROOT, "tests", "data", "responses", "seniverse_now.json")
+
+
+async def run(mode, queries, handshake_ms, stale_every):
+    with open(_SAMPLE, "rb") as f:
+        body = f.read()
+    http_client._pool.clear()
+    for key in http_client.stats:
+        http_client.stats[key] = 0
+
+    srv = StandInServer({"/v3/weather/now.json": Route(body)}, handshake=handshake_ms / 1000)
+    await srv.start()
+    url = srv.base_url + "/v3/weather/now.json?location=beijing"
+    latencies = []
+    try:
+        for i in range(queries):
+            if mode == "stale" and i and i % stale_every == 0:
+                await srv.close_idle_connections()
+            start = time.perf_counter()
+            res = await http_client.get(url, timeout=5)
+            data = await res.json_paths(["results.0.now"])
+            if mode == "fresh":
+                res._keep_alive = False
+            await res.close()
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert data["results.0.now"]["code"] == "0"
+    finally:
+        http_client.close_idle()
+        await srv.stop()
+    return srv.connections, dict(http_client.stats), latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the keep-alive connection pool")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=40.0)
+    parser.add_argument("--stale-every", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print("{:<7} {:>12} {:>7} {:>7} {:>9} {:>9} {:>9}".format(
+        "mode", "server conns", "opened", "reused", "avg ms", "p95 ms", "total s"))
+    for mode in ("fresh", "pooled", "stale"):
+        conns, stats, lat = asyncio.run(run(mode, args.queries, args.handshake_ms, args.stale_every))
+        s = sorted(lat)
+        print("{:<7} {:>12} {:>7} {:>7} {:>9.1f} {:>9.1f} {:>9.2f}".format(
+            mode, conns, stats['connections_opened'], stats['connections_reused'],
+            sum(s) / len(s), s[len(s) * 95 // 100], sum(s) / 1000))
+
+
+if __name__ == "__main__":
+    main()
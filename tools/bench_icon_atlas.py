@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# bench_icon_atlas.py - 天气图标：PNG 解码与图集读取的耗时和峰值内存 (主机端)
+#
+# 对 weather_incons/ 下的每个图标比较两种加载方式：
+#   png     读入整个 PNG 文件并用 tools/imgread.py 解码为 RGBA
+#           (相当于 LVGL 的 PNG 解码器：压缩数据和完整解码结果同时驻留)
+#   atlas   smartwatch/icon_atlas.py 从 weather_atlas.bin 按偏移把同一张
+#           图标读入预先分配的两个缓冲区之一 (RGB565A8，可直接显示)
+# 用 tracemalloc 记录每次加载的峰值分配。图集的两个缓冲区只在第一次使用时
+# 分配一次，单独列出，不计入每次加载的峰值。CPython 的对象和 zlib 开销比
+# MicroPython 大，绝对值只用于两种方式之间的比较。
+#
+# 用法：python3 tools/bench_icon_atlas.py [--repeat 5]   (需先运行 build_weather_atlas.py)
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, os.path.join(_ROOT, "tests"))
+
+import fakes
+
+fakes.install()
+
+from imgread import read_png
+from icon_atlas import IconAtlas
+
+_ICONS = os.path.join(_ROOT, "weather_incons")
+
+
+def png_way(code):
+    path = os.path.join(_ICONS, "{}@1x.png".format(code))
+    with open(path, "rb") as f:
+        data = f.read()
+    width, height, rgba = read_png(path)
+    del data
+    return len(rgba)
+
+
+def atlas_way(atlas, code):
+    dsc = atlas.get(code)
+    return dsc.data_size
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare weather icon PNG decoding with atlas reads")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(_ICONS, "weather_atlas.json")) as f:
+        codes = sorted(json.load(f)["icons"], key=int)
+    atlas = IconAtlas(os.path.join(_ICONS, "weather_atlas.bin"),
+                      os.path.join(_ICONS, "weather_atlas.json"))
+    atlas._alloc()
+
+    print("{:<6} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+        "code", "png ms", "png peak", "atlas ms", "atlas peak", "speedup"))
+    totals = [0.0, 0, 0.0, 0]
+    for code in codes:
+        png_ms = atlas_ms = 0.0
+        png_peak = atlas_peak = 0
+        for _ in range(args.repeat):
+            ms, peak, _ = measure(png_way, code)
+            png_ms += ms
+            png_peak = max(png_peak, peak)
+            # 每次换到另一个缓冲区，确保真的从文件读取
+            atlas._codes = [None, None]
+            ms, peak, _ = measure(atlas_way, atlas, code)
+            atlas_ms += ms
+            atlas_peak = max(atlas_peak, peak)
+        png_ms /= args.repeat
+        atlas_ms /= args.repeat
+        totals[0] += png_ms
+        totals[1] = max(totals[1], png_peak)
+        totals[2] += atlas_ms
+        totals[3] = max(totals[3], atlas_peak)
+        print("{:<6} {:>10.2f} {:>10} {:>10.3f} {:>10} {:>9.0f}x".format(
+            code, png_ms, png_peak, atlas_ms, atlas_peak, png_ms / atlas_ms))
+
+    n = len(codes)
+    print("avg    {:>10.2f} {:>10} {:>10.3f} {:>10} {:>9.0f}x".format(
+        totals[0] / n, totals[1], totals[2] / n, totals[3], totals[0] / totals[2]))
+    print("atlas buffers (allocated once): {} bytes".format(atlas.get_stats()['buffer_bytes']))
+
+
+if __name__ == "__main__":
+    main()
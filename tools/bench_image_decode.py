@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# bench_image_decode.py - 比较两种图片加载方式的峰值内存 (主机端)
+#
+# 旧方式：f.read() 读入整个文件，再整体解码 (相当于 LVGL 内置 PNG 解码器：
+#         压缩数据、完整的解压结果和目标缓冲区同时驻留)。
+# 新方式：libs/stream_image 逐行解码，直接写入目标缓冲区。
+#
+# 用 tracemalloc 统计分配。CPython 的 zlib 状态 (约 40KB，主要是解压窗口) 也会计入，
+# 所以小图片上新方式反而更高；设备上这部分由 DeflateIO 分配，两种方式都需要。
+#
+# 用法：python3 tools/bench_image_decode.py [文件或目录 ...]   (默认 assets/)
+
+import os
+import sys
+import time
+import tracemalloc
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "libs", "stream_image"))
+
+from imgread import read_image
+from stream_image import StreamImage, CF_ARGB8888, buffer_size
+
+
+def _old_path(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    width, height, rgba = read_image(path)
+    dest = bytearray(buffer_size(width, height, CF_ARGB8888))
+    dest[:] = rgba
+    del data
+    return dest
+
+
+def _new_path(path):
+    img = StreamImage(path)
+    dest = bytearray(buffer_size(img.width, img.height, CF_ARGB8888))
+    img.decode_into(dest, CF_ARGB8888)
+    img.close()
+    return dest
+
+
+def _measure(fn, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed, len(result)
+
+
+def main(argv):
+    inputs = argv or [os.path.join(_ROOT, "assets")]
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith((".png", ".bmp")):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+
+    print("{:<28} {:>9} {:>10} {:>10} {:>7}".format("file", "output", "old peak", "new peak", "ratio"))
+    total_old = total_new = 0
+    for path in files:
+        try:
+            old_peak, old_s, size = _measure(_old_path, path)
+            new_peak, new_s, _ = _measure(_new_path, path)
+        except ValueError as e:
+            print("skip {}: {}".format(os.path.basename(path), e))
+            continue
+        total_old += old_peak
+        total_new += new_peak
+        print("{:<28} {:>9} {:>10} {:>10} {:>6.2f}x".format(
+            os.path.basename(path), size, old_peak, new_peak, old_peak / new_peak))
+    if total_new:
+        print("total peak: old {} bytes, new {} bytes ({:.2f}x)".format(
+            total_old, total_new, total_old / total_new))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# bench_json_stream.py - 流式按路径解析与整体 json.loads 的峰值内存对比 (主机端)
+#
+# 对 tests/data/responses/ 下的响应样本 (天气、逐对汇率、基准汇率表)，
+# 分别用两种方式取出界面需要的字段，用 tracemalloc 记录峰值分配：
+#   old     与 urequests 的 res.json() 相同：读出完整正文，再 json.loads 整棵树
+#   stream  按 256 字节一块 (http_client._READ_CHUNK) 喂给 JsonPathReader
+# 两种方式取到的字段必须一致。CPython 的对象比 MicroPython 大，绝对值
+# 只能用于两种方式之间的比较。
+#
+# 用法：python3 tools/bench_json_stream.py [--chunk 256] [--repeat 4]
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+
+from json_stream import JsonPathReader
+
+_SAMPLES = os.path.join(_ROOT, "tests", "data", "responses")
+
+# (样本文件, 应用请求的路径)，与 smartwatch_app.py / rate_table.py 一致
+CASES = [
+    ("seniverse_now.json", ["results.0.now"]),
+    ("tianapi_fxrate.json", ["code", "msg", "result"]),
+    ("rates_latest.json", ["base"] + ["rates." + c for c in
+                                      ("CNY", "USD", "EUR", "JPY", "HKD", "GBP", "AUD", "CAD")]),
+]
+
+
+def chunks(body, size):
+    # 每块都是新的 bytes 对象，与从 socket 读到的一样
+    for i in range(0, len(body), size):
+        yield bytes(body[i:i + size])
+
+
+def _lookup(tree, path):
+    node = tree
+    for part in path.split("."):
+        node = node[int(part)] if isinstance(node, list) else node.get(part)
+        if node is None:
+            return None
+    return node
+
+
+def old_way(body, paths, size):
+    parts = []
+    for c in chunks(body, size):
+        parts.append(c)
+    content = b"".join(parts)
+    tree = json.loads(content)
+    return {p: _lookup(tree, p) for p in paths}
+
+
+def stream_way(body, paths, size):
+    reader = JsonPathReader(paths)
+    for c in chunks(body, size):
+        reader.feed(c)
+        if reader.done:
+            break
+    return reader.finish()
+
+
+def peak(fn, body, paths, size):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = fn(body, paths, size)
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare peak heap of streaming vs whole-body JSON parsing")
+    parser.add_argument("--chunk", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=4,
+                        help="also test the body repeated this many times inside a list")
+    args = parser.parse_args(argv)
+
+    print("{:<24} {:>8} {:>10} {:>10} {:>7}".format("response", "bytes", "old peak", "stream", "ratio"))
+    for name, paths in CASES:
+        with open(os.path.join(_SAMPLES, name), "rb") as f:
+            body = f.read()
+        # 把响应放进更大的数组中，模拟带历史数据等多余字段的较大响应
+        big = b'{"padding": [' + b",".join([body] * args.repeat) + b'], "data": ' + body + b"}"
+        big_paths = ["data." + p for p in paths]
+
+        for label, data, want in ((name, body, paths), ("  x{} padded".format(args.repeat), big, big_paths)):
+            old_peak, old_result = peak(old_way, data, want, args.chunk)
+            new_peak, new_result = peak(stream_way, data, want, args.chunk)
+            if old_result != new_result:
+                raise SystemExit("{}: results differ\n{}\n{}".format(label, old_result, new_result))
+            print("{:<24} {:>8} {:>10} {:>10} {:>6.1f}x".format(
+                label, len(data), old_peak, new_peak, old_peak / new_peak))
+
+
+if __name__ == "__main__":
+    main()
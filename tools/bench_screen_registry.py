@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# bench_screen_registry.py - 脚本化滑动序列下的重建次数与切换延迟 (主机端)
+#
+# 页面列表、估算占用和优先级与 smartwatch_app.py 中的登记一致。构建函数
+# 不创建真实控件，而是按 --build-ms-per-kb 推进 tests/fakes.py 的假时钟，
+# 所以切换延迟是按构建耗时建模的数值，重建次数是精确的。
+#
+# 对比三种方式：
+#   old       原来的 switch_screen：切走后清理除时间/天气/设置以外的页面
+#   registry  ScreenRegistry 按预算 LRU 清理
+#   warm      在 registry 的基础上，两次滑动之间的空闲帧预热相邻页面
+#
+# 用法：python3 tools/bench_screen_registry.py [--budget 48] [--build-ms-per-kb 4]
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, os.path.join(_ROOT, "tests"))
+
+import fakes
+
+fakes.install()
+
+import lvgl as lv
+from screen_registry import (ScreenRegistry, PRIORITY_LOW, PRIORITY_NORMAL,
+                             PRIORITY_HIGH, PRIORITY_PINNED)
+
+# (名称, 估算占用 KB, 优先级)，顺序即滑动顺序
+SCREENS = [
+    ("time", 0, PRIORITY_PINNED),
+    ("weather", 0, PRIORITY_PINNED),
+    ("heart", 12, PRIORITY_NORMAL),
+    ("sport", 6, PRIORITY_NORMAL),
+    ("exchange", 14, PRIORITY_NORMAL),
+    ("led", 16, PRIORITY_LOW),
+    ("qr", 10, PRIORITY_LOW),
+    ("doubao", 8, PRIORITY_LOW),
+    ("settings", 6, PRIORITY_HIGH),
+]
+_OLD_KEEP = ("time", "weather", "settings")
+
+_FRAME_MS = 16
+_IDLE_FRAMES = 30   # 两次滑动之间约半秒
+
+
+def scenarios(seed):
+    n = len(SCREENS)
+    rng = random.Random(seed)
+    return [
+        # 时间 -> 心率，然后在心率与运动之间来回 20 次
+        ("heart<->sport", ["next", "next"] + ["next", "prev"] * 20),
+        ("full loop x3", ["next"] * (n * 3)),
+        ("back and forth", (["next"] * 4 + ["prev"] * 4) * 5),
+        ("random 60", [rng.choice(("next", "prev")) for _ in range(60)]),
+    ]
+
+
+class Watch:
+    """一组假屏幕及其构建函数；builds 统计每个页面的构建次数"""
+
+    def __init__(self, build_ms_per_kb):
+        self.screens = []
+        self.builders = {}
+        self.builds = 0
+        for name, kb, priority in SCREENS:
+            scr = lv.obj()
+            scr.name = name
+            self.screens.append(scr)
+            if priority != PRIORITY_PINNED:
+                self.builders[name] = self._make_builder(scr, kb, build_ms_per_kb)
+            else:
+                lv.obj(scr)
+
+    def _make_builder(self, scr, kb, ms_per_kb):
+        # 生成器构建函数：每个 yield 是一个切片点 (对应一个控件)
+        def build():
+            if scr.get_child_count() > 0:
+                return
+            self.builds += 1
+            for _ in range(kb):
+                lv.obj(scr)
+                fakes.CLOCK.advance(ms_per_kb)
+                yield
+        return build
+
+
+def run_old(watch, swipes):
+    idx = 0
+    lv.screen_load(watch.screens[0])
+    latencies = []
+    for direction in swipes:
+        old = watch.screens[idx]
+        idx = (idx + (1 if direction == "next" else -1)) % len(watch.screens)
+        target = watch.screens[idx]
+        start = fakes.CLOCK.ticks_us()
+        builder = watch.builders.get(target.name)
+        if builder is not None:
+            for _ in builder():
+                pass
+        lv.screen_load(target)
+        latencies.append(fakes.CLOCK.ticks_us() - start)
+        # 原实现 1 秒后清理旧页面；两次滑动间隔内必然已经清理
+        if old.name not in _OLD_KEEP and lv.screen_active() is not old:
+            old.clean()
+        fakes.CLOCK.advance(_IDLE_FRAMES * _FRAME_MS)
+    return latencies
+
+
+def run_registry(watch, swipes, budget, warm):
+    registry = ScreenRegistry(budget=budget)
+    for (name, kb, priority), scr in zip(SCREENS, watch.screens):
+        registry.register(name, scr, watch.builders.get(name), kb * 1024, priority)
+    n = len(watch.screens)
+    idx = 0
+    lv.screen_load(watch.screens[0])
+    latencies = []
+    for direction in swipes:
+        if warm:
+            registry.prefetch([watch.screens[(idx + 1) % n], watch.screens[(idx - 1) % n]])
+            for _ in range(_IDLE_FRAMES):
+                registry.idle(_FRAME_MS)
+                fakes.CLOCK.advance(_FRAME_MS)
+        else:
+            fakes.CLOCK.advance(_IDLE_FRAMES * _FRAME_MS)
+        idx = (idx + (1 if direction == "next" else -1)) % n
+        registry.show(watch.screens[idx])
+        latencies.append(registry.last_switch_us)
+    return latencies
+
+
+def report(label, watch, latencies):
+    lat = sorted(latencies)
+    print("  {:<9} {:>8} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+        label, watch.builds, sum(lat) / len(lat) / 1000,
+        lat[len(lat) * 95 // 100] / 1000, lat[-1] / 1000))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark screen rebuilds over scripted swipes")
+    parser.add_argument("--budget", type=int, default=48, help="registry budget in KB")
+    parser.add_argument("--build-ms-per-kb", type=float, default=4.0,
+                        help="modelled build time per KB of estimated screen cost")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for name, swipes in scenarios(args.seed):
+        print("{} ({} swipes)".format(name, len(swipes)))
+        print("  {:<9} {:>8} {:>10} {:>10} {:>10}".format("mode", "rebuilds", "avg ms", "p95 ms", "max ms"))
+        # 注册表清理页面时会打印日志，这里不需要
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs = []
+            for label in ("old", "registry", "warm"):
+                fakes.CLOCK.reset()
+                watch = Watch(args.build_ms_per_kb)
+                if label == "old":
+                    lat = run_old(watch, swipes)
+                else:
+                    lat = run_registry(watch, swipes, args.budget * 1024, label == "warm")
+                runs.append((label, watch, lat))
+        for label, watch, lat in runs:
+            report(label, watch, lat)
+
+
+if __name__ == "__main__":
+    main()
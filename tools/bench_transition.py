@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# bench_transition.py - 快照切换动画的帧时间 (主机端)
+#
+# 用 tests/fakes.py 的 lvgl 替身运行 SnapshotTransition：每一帧先推进动画
+# (anim_cb + _apply)，再用主机端的合成器把两张 RGB565 快照按图片位置
+# 逐行拷贝到 240x240 帧缓冲，近似 LVGL 每帧要做的工作。假时钟每帧前进
+# --period-ms，帧数由动画时长决定；主要指标是实测的每帧合成耗时
+# (avg / max work ms)，以及按平均耗时算出的最高帧率。
+#
+# 页面上的控件数量只影响开始时的一次快照，不影响每帧耗时；表中按不同
+# 控件数量各跑一遍以便对照。淡入模式的混合在主机上同样按整行拷贝计算。
+#
+# 用法：python3 tools/bench_transition.py [--period-ms 16] [--runs 20]
+
+import argparse
+import os
+import sys
+import time
+
+_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "smartwatch"))
+sys.path.insert(0, os.path.join(_ROOT, "tests"))
+
+import fakes
+
+fakes.install()
+
+import lvgl as lv
+from transition import (SnapshotTransition, TRANSITION_SLIDE, TRANSITION_FADE,
+                        TRANSITION_COVER)
+
+_W = 240
+_H = 240
+_ROW = _W * 2
+
+MODES = (("slide", TRANSITION_SLIDE), ("fade", TRANSITION_FADE), ("cover", TRANSITION_COVER))
+
+
+def compose(frame, screen):
+    """按子对象顺序把图片的可见部分逐行拷到帧缓冲 (后面的覆盖前面的)"""
+    for img in screen.children:
+        src = img.src
+        if src is None:
+            continue
+        x = img.x
+        if x >= _W or x <= -_W:
+            continue
+        sx = -x if x < 0 else 0
+        dx = x if x > 0 else 0
+        n = (_W - abs(x)) * 2
+        data = memoryview(src.data)
+        for y in range(_H):
+            d = y * _ROW + dx * 2
+            s = y * _ROW + sx * 2
+            frame[d:d + n] = data[s:s + n]
+
+
+def make_screen(widgets):
+    scr = lv.obj()
+    for _ in range(widgets):
+        lv.obj(scr)
+    return scr
+
+
+def run(mode, widgets, period_ms, duration):
+    fakes.CLOCK.reset()
+    fakes.anim_t.running = []
+    frame = bytearray(_W * _H * 2)
+    old, new = make_screen(widgets), make_screen(widgets)
+    lv.screen_load(old)
+    t = SnapshotTransition(mode=mode, duration=duration)
+    t.start(old, new, "next")
+    peak = sum(len(b.data) for b in fakes.draw_buf_t.live)
+
+    costs = []
+    while fakes.anim_t.running:
+        start = time.perf_counter()
+        fakes.anim_tick()
+        if lv.screen_active() is t._screen:
+            compose(frame, t._screen)
+        costs.append((time.perf_counter() - start) * 1000)
+        fakes.CLOCK.advance(period_ms)
+
+    held = sum(len(b.data) for b in fakes.draw_buf_t.live)
+    return costs, peak, held
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark snapshot transition frame times")
+    parser.add_argument("--period-ms", type=float, default=16.0, help="LVGL refresh period")
+    parser.add_argument("--duration", type=int, default=250)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print("{:<6} {:>8} {:>7} {:>12} {:>12} {:>8} {:>8} {:>9}".format(
+        "mode", "widgets", "frames", "avg work ms", "max work ms", "max fps", "peak KB", "after KB"))
+    for name, mode in MODES:
+        for widgets in (10, 100, 1000):
+            costs = []
+            for _ in range(args.runs):
+                run_costs, peak, held = run(mode, widgets, args.period_ms, args.duration)
+                costs += run_costs
+            avg = sum(costs) / len(costs)
+            print("{:<6} {:>8} {:>7.1f} {:>12.3f} {:>12.3f} {:>8.0f} {:>8.0f} {:>9.0f}".format(
+                name, widgets, len(costs) / args.runs, avg, max(costs),
+                1000 / avg if avg else 0, peak / 1024, held / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# build_weather_atlas.py - 把天气图标打包成一个 RGB565A8 图集
+#
+# 手表每次天气变化都要经文件系统读取并解码一张 PNG。这里在电脑上预先把
+# weather_incons/ 下的全部图标转换为 LVGL 可直接显示的 RGB565A8 数据，
+# 依次拼接成 weather_atlas.bin，并生成索引 weather_atlas.json：
+#
+#     {"format": "RGB565A8", "icons": {"天气代码": [偏移, 宽, 高], ...}}
+#
+# 运行时由 smartwatch/icon_atlas.py 按偏移只读取需要的那一张。
+#
+# 用法：python3 tools/build_weather_atlas.py [图标目录]
+
+import json
+import os
+import sys
+
+from imgread import read_png, rgba_to_rgb565a8
+
+ATLAS_NAME = "weather_atlas.bin"
+INDEX_NAME = "weather_atlas.json"
+_SUFFIX = "@1x.png"
+
+
+def build(icon_dir):
+    names = [n for n in os.listdir(icon_dir) if n.endswith(_SUFFIX)]
+    names.sort(key=lambda n: int(n[:-len(_SUFFIX)]))
+    if not names:
+        raise SystemExit("no *{} icons in {}".format(_SUFFIX, icon_dir))
+
+    icons = {}
+    offset = 0
+    with open(os.path.join(icon_dir, ATLAS_NAME), "wb") as out:
+        for name in names:
+            width, height, rgba = read_png(os.path.join(icon_dir, name))
+            data = rgba_to_rgb565a8(width, height, rgba)
+            out.write(data)
+            icons[name[:-len(_SUFFIX)]] = [offset, width, height]
+            offset += len(data)
+
+    with open(os.path.join(icon_dir, INDEX_NAME), "w") as f:
+        json.dump({"format": "RGB565A8", "icons": icons}, f, separators=(",", ":"), sort_keys=True)
+
+    print("{} icons, {} bytes -> {}".format(len(icons), offset, os.path.join(icon_dir, ATLAS_NAME)))
+
+
+if __name__ == "__main__":
+    default_dir = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "weather_incons"))
+    build(sys.argv[1] if len(sys.argv) > 1 else default_dir)
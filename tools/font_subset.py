@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# font_subset.py - 按源码中实际使用的字符裁剪 LVGL binfont
+#
+# 手表界面只用到几十个汉字 (菜单、设置、汇率查询……)，却要从 flash 载入整套
+# 中文字库。这里扫描 Python 源码中的字符串常量，收集出现过的字符，从完整的
+# lv_font_conv 二进制字体 (.bin / .fnt) 中只保留这些字形，生成新的 binfont。
+#
+# 运行时动态出现的文字 (例如接口返回的天气描述) 不在子集中，由
+# smartwatch/glyph_cache.py 从完整字体按需读取。
+#
+# 说明：字形数据原样复制 (保留压缩和位深)，字距表 (kern) 不保留。
+#
+# 用法：
+#   python3 tools/font_subset.py assets/font/lv_font_simsun_16_cjk.fnt \
+#       -o smartwatch/font_cn_16.bin smartwatch/
+#   可用 --text "额外字符" 补充字符
+
+import argparse
+import ast
+import os
+import struct
+import sys
+
+_HEAD_FORMAT = "<IHHHhHhHhhHHBBBBBBBBBBhH"
+_HEAD_FIELDS = (
+    "version", "tables_count", "font_size", "ascent", "descent", "typo_ascent",
+    "typo_descent", "typo_line_gap", "min_y", "max_y", "default_advance_width",
+    "kerning_scale", "index_to_loc_format", "glyph_id_format", "advance_width_format",
+    "bits_per_pixel", "xy_bits", "wh_bits", "advance_width_bits", "compression_id",
+    "subpixels_mode", "padding", "underline_position", "underline_thickness",
+)
+
+# cmap 子表格式
+CMAP_FORMAT0_FULL = 0
+CMAP_SPARSE_FULL = 1
+CMAP_FORMAT0_TINY = 2
+CMAP_SPARSE_TINY = 3
+
+
+def _tables(data):
+    tables = {}
+    pos = 0
+    while pos + 8 <= len(data):
+        size, tag = struct.unpack("<I4s", data[pos:pos + 8])
+        tables[tag.decode()] = (pos, size)
+        pos += size
+    return tables
+
+
+class BinFont:
+    """解析 lv_font_conv 生成的二进制字体"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.tables = _tables(self.data)
+        start, size = self.tables["head"]
+        values = struct.unpack(_HEAD_FORMAT, self.data[start + 8:start + 8 + struct.calcsize(_HEAD_FORMAT)])
+        self.head = dict(zip(_HEAD_FIELDS, values))
+        self.cmap = self._read_cmap()
+        self.loca = self._read_loca()
+
+    def _read_cmap(self):
+        """返回 {码点: 字形编号}"""
+        data = self.data
+        start, _ = self.tables["cmap"]
+        count = struct.unpack("<I", data[start + 8:start + 12])[0]
+        cmap = {}
+        for i in range(count):
+            h = start + 12 + i * 16
+            offset, range_start, range_length, gid_start, entries, fmt, _ = \
+                struct.unpack("<IIHHHBB", data[h:h + 16])
+            body = start + offset
+            if fmt == CMAP_FORMAT0_TINY:
+                for k in range(range_length):
+                    cmap[range_start + k] = gid_start + k
+            elif fmt == CMAP_FORMAT0_FULL:
+                for k in range(range_length):
+                    # 偏移 0 只在第一个位置有效，其余位置表示缺字
+                    delta = data[body + k]
+                    if delta or k == 0:
+                        cmap[range_start + k] = gid_start + delta
+            elif fmt in (CMAP_SPARSE_TINY, CMAP_SPARSE_FULL):
+                codes = struct.unpack("<{}H".format(entries), data[body:body + entries * 2])
+                if fmt == CMAP_SPARSE_FULL:
+                    ids = struct.unpack("<{}H".format(entries),
+                                        data[body + entries * 2:body + entries * 4])
+                else:
+                    ids = range(entries)
+                for code, gid in zip(codes, ids):
+                    cmap[range_start + code] = gid_start + gid
+        return cmap
+
+    def _read_loca(self):
+        start, _ = self.tables["loca"]
+        count = struct.unpack("<I", self.data[start + 8:start + 12])[0]
+        if self.head["index_to_loc_format"] == 0:
+            fmt, width = "<{}H", 2
+        else:
+            fmt, width = "<{}I", 4
+        return struct.unpack(fmt.format(count), self.data[start + 12:start + 12 + count * width])
+
+    def glyph_blob(self, gid):
+        start, size = self.tables["glyf"]
+        begin = self.loca[gid]
+        end = self.loca[gid + 1] if gid + 1 < len(self.loca) else size
+        return self.data[start + begin:start + end]
+
+
+def _pad4(data):
+    return data + b"\x00" * (-len(data) % 4)
+
+
+def _table(tag, body):
+    body = _pad4(body)
+    return struct.pack("<I4s", len(body) + 8, tag) + body
+
+
+def _build_cmap(codes):
+    """把排好序的码点按 u16 跨度分组，每组一个 sparse tiny 子表，字形编号连续"""
+    groups = []
+    for code in codes:
+        # range_length = 末码点 - 起始码点 + 1 要放进 u16
+        if groups and code - groups[-1][0] < 0xFFFF:
+            groups[-1][1].append(code)
+        else:
+            groups.append((code, [code]))
+
+    header_size = 8 + 4 + 16 * len(groups)
+    headers = b""
+    payload = b""
+    gid = 1
+    for range_start, members in groups:
+        data = _pad4(struct.pack("<{}H".format(len(members)), *[c - range_start for c in members]))
+        headers += struct.pack(
+            "<IIHHHBB", header_size + len(payload), range_start,
+            members[-1] - range_start + 1, gid, len(members), CMAP_SPARSE_TINY, 0
+        )
+        payload += data
+        gid += len(members)
+    return _table(b"cmap", struct.pack("<I", len(groups)) + headers + payload)
+
+
+def subset(font, chars):
+    """返回 (新字体字节, 实际包含的码点, 缺失的码点)"""
+    codes = sorted(c for c in chars if c in font.cmap)
+    missing = sorted(c for c in chars if c not in font.cmap)
+
+    blobs = [font.glyph_blob(0)] + [font.glyph_blob(font.cmap[c]) for c in codes]
+    offsets = []
+    glyf = b""
+    for blob in blobs:
+        offsets.append(8 + len(glyf))
+        glyf += blob
+
+    head = dict(font.head)
+    head["tables_count"] = 3           # 不含 kern
+    head["index_to_loc_format"] = 1    # u32 偏移
+    head["glyph_id_format"] = 1
+    head_body = struct.pack(_HEAD_FORMAT, *[head[k] for k in _HEAD_FIELDS])
+
+    out = _table(b"head", head_body)
+    out += _build_cmap(codes)
+    out += _table(b"loca", struct.pack("<I{}I".format(len(offsets)), len(offsets), *offsets))
+    out += _table(b"glyf", glyf)
+    return out, codes, missing
+
+
+def scan_sources(paths):
+    """收集 .py 文件中字符串常量用到的字符 (含 f-string 的常量部分)"""
+    chars = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files = []
+            for dirpath, _, filenames in os.walk(path):
+                files += [os.path.join(dirpath, n) for n in filenames if n.endswith(".py")]
+        else:
+            files = [path]
+        for name in sorted(files):
+            with open(name, encoding="utf-8") as f:
+                try:
+                    tree = ast.parse(f.read(), name)
+                except SyntaxError as e:
+                    print("skip {}: {}".format(name, e))
+                    continue
+            # 文档字符串和 print() 的参数不会显示在屏幕上
+            skip = set()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+                    skip.add(id(node.value))
+                elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                        and node.func.id == "print":
+                    for arg in node.args:
+                        for sub in ast.walk(arg):
+                            skip.add(id(sub))
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Constant) and isinstance(node.value, str) \
+                        and id(node) not in skip:
+                    chars.update(ord(c) for c in node.value)
+    return chars
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Subset an LVGL binfont to the characters used in Python sources")
+    parser.add_argument("font", help="source binfont (.bin / .fnt from lv_font_conv)")
+    parser.add_argument("sources", nargs="+", help="Python files or directories to scan")
+    parser.add_argument("-o", "--output", required=True, help="output binfont")
+    parser.add_argument("--text", default="", help="extra characters to keep")
+    parser.add_argument("--no-ascii", action="store_true", help="do not force printable ASCII")
+    args = parser.parse_args(argv)
+
+    chars = scan_sources(args.sources)
+    chars.update(ord(c) for c in args.text)
+    if not args.no_ascii:
+        chars.update(range(0x20, 0x7F))
+    # 控制字符和换行不需要字形
+    chars = set(c for c in chars if c >= 0x20)
+
+    font = BinFont(args.font)
+    data, codes, missing = subset(font, chars)
+    with open(args.output, "wb") as f:
+        f.write(data)
+
+    print("{} glyphs, {} bytes (source {} glyphs, {} bytes) -> {}".format(
+        len(codes), len(data), len(font.cmap), len(font.data), args.output))
+    if missing:
+        print("{} characters not in source font: {}".format(
+            len(missing), "".join(chr(c) for c in missing if c > 0x7F)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# imgread.py - 主机端图片读取 (只依赖标准库)
+#
+# 供资源构建脚本使用，在电脑上运行 (CPython)，不需要安装 Pillow。
+# 支持 8 位非隔行 PNG (灰度、灰度+透明、RGB、RGBA、调色板)，
+# 以及未压缩 / 位域格式的 8、16、24、32 位 BMP。
+
+import struct
+import zlib
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 颜色类型 -> 每像素字节数
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _unfilter(raw, width, height, bpp):
+    stride = width * bpp
+    out = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:    # Sub
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif ftype == 2:  # Up
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif ftype == 3:  # Average
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ftype == 4:  # Paeth
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                if pa <= pb and pa <= pc:
+                    pred = a
+                elif pb <= pc:
+                    pred = b
+                else:
+                    pred = c
+                line[i] = (line[i] + pred) & 0xFF
+        elif ftype != 0:
+            raise ValueError("bad PNG filter type {}".format(ftype))
+        out[y * stride:(y + 1) * stride] = line
+        prev = line
+    return out
+
+
+def read_png(path):
+    """读取 PNG，返回 (宽, 高, RGBA 字节)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError("{}: not a PNG file".format(path))
+
+    pos = 8
+    idat = []
+    palette = None
+    trns = None
+    width = height = depth = ctype = interlace = None
+    while pos < len(data):
+        length, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if tag == b"IHDR":
+            width, height, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", body)
+        elif tag == b"PLTE":
+            palette = body
+        elif tag == b"tRNS":
+            trns = body
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+
+    if depth != 8 or interlace != 0 or ctype not in _PNG_CHANNELS:
+        raise ValueError("{}: only 8-bit non-interlaced PNG is supported".format(path))
+
+    bpp = _PNG_CHANNELS[ctype]
+    pixels = _unfilter(zlib.decompress(b"".join(idat)), width, height, bpp)
+
+    if ctype == 6:
+        return width, height, bytes(pixels)
+
+    rgba = bytearray(width * height * 4)
+    for i in range(width * height):
+        if ctype == 2:
+            r, g, b = pixels[i * 3:i * 3 + 3]
+            a = 255
+        elif ctype == 3:
+            idx = pixels[i]
+            r, g, b = palette[idx * 3:idx * 3 + 3]
+            a = trns[idx] if trns is not None and idx < len(trns) else 255
+        elif ctype == 4:
+            r = g = b = pixels[i * 2]
+            a = pixels[i * 2 + 1]
+        else:
+            r = g = b = pixels[i]
+            a = 255
+        rgba[i * 4:i * 4 + 4] = bytes((r, g, b, a))
+    return width, height, bytes(rgba)
+
+
+def _mask_shift(mask):
+    if mask == 0:
+        return 0, 0
+    shift = 0
+    while not (mask >> shift) & 1:
+        shift += 1
+    return shift, mask >> shift
+
+
+def read_bmp(path):
+    """读取 BMP，返回 (宽, 高, RGBA 字节)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] != b"BM":
+        raise ValueError("{}: not a BMP file".format(path))
+
+    offset = struct.unpack("<I", data[10:14])[0]
+    header_size, width, height, _, bpp, compression = struct.unpack("<IiiHHI", data[14:34])
+    top_down = height < 0
+    height = abs(height)
+
+    if compression in (3, 6):  # BI_BITFIELDS / BI_ALPHABITFIELDS
+        if header_size >= 52:
+            masks = struct.unpack("<III", data[54:66])
+        else:
+            masks = struct.unpack("<III", data[14 + header_size:26 + header_size])
+        alpha_mask = struct.unpack("<I", data[66:70])[0] if header_size >= 56 else 0
+    elif compression == 0:
+        if bpp == 16:
+            masks = (0x7C00, 0x03E0, 0x001F)
+        else:
+            masks = (0xFF0000, 0x00FF00, 0x0000FF)
+        alpha_mask = 0
+    else:
+        raise ValueError("{}: compressed BMP is not supported".format(path))
+
+    if bpp not in (8, 16, 24, 32):
+        raise ValueError("{}: {}-bit BMP is not supported".format(path, bpp))
+
+    palette = None
+    if bpp == 8:
+        palette = data[14 + header_size:offset]
+
+    fields = [_mask_shift(m) for m in masks + (alpha_mask,)]
+    stride = (width * bpp + 31) // 32 * 4
+    step = bpp // 8
+    rgba = bytearray(width * height * 4)
+    for y in range(height):
+        src = offset + (y if top_down else height - 1 - y) * stride
+        for x in range(width):
+            pos = src + x * step
+            if bpp == 8:
+                idx = data[pos]
+                b, g, r = palette[idx * 4:idx * 4 + 3]
+                a = 255
+            else:
+                value = int.from_bytes(data[pos:pos + step], "little")
+                if bpp == 24:
+                    b, g, r = data[pos:pos + 3]
+                    a = 255
+                else:
+                    channels = []
+                    for shift, maxval in fields:
+                        channels.append((value >> shift & maxval) * 255 // maxval if maxval else 255)
+                    r, g, b, a = channels
+            d = (y * width + x) * 4
+            rgba[d:d + 4] = bytes((r, g, b, a))
+    return width, height, bytes(rgba)
+
+
+def read_image(path):
+    """按文件头识别 PNG / BMP，返回 (宽, 高, RGBA 字节)"""
+    with open(path, "rb") as f:
+        magic = f.read(8)
+    if magic == _PNG_SIGNATURE:
+        return read_png(path)
+    if magic[:2] == b"BM":
+        return read_bmp(path)
+    raise ValueError("{}: unknown image format".format(path))
+
+
+def rgba_to_rgb565a8(width, height, rgba):
+    """
+    转换为 LVGL v9 的 RGB565A8：先是 w*h 个小端 RGB565，再是 w*h 字节的 alpha 平面。
+    """
+    count = width * height
+    color = bytearray(count * 2)
+    alpha = bytearray(count)
+    for i in range(count):
+        r, g, b, a = rgba[i * 4:i * 4 + 4]
+        c = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+        color[i * 2] = c & 0xFF
+        color[i * 2 + 1] = c >> 8
+        alpha[i] = a
+    return bytes(color) + bytes(alpha)
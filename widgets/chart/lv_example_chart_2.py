@@ -2,72 +2,95 @@
 import time
 import lvgl as lv
 import display_driver
+from alloc_meter import AllocMeter
+
+# Descriptors reused for every line segment; the callback runs once per
+# segment per redraw, so it must not allocate them itself. lv.draw_triangle
+# and lv.draw_rect copy the descriptor into the new draw task.
+chart_coords = lv.area_t()
+rect_area = lv.area_t()
+tri_dsc = lv.draw_triangle_dsc_t()
+tri_dsc.init()
+tri_dsc.bg_grad.dir = lv.GRAD_DIR.VER
+rect_dsc = lv.draw_rect_dsc_t()
+rect_dsc.init()
+rect_dsc.bg_grad.dir = lv.GRAD_DIR.VER
 
 def draw_event_cb(e):
-
-    obj = lv.obj.__cast__(e.get_target())
-
-    # Add the faded area before the lines are drawn
-    dsc = lv.obj_draw_part_dsc_t.cast(e.get_param())
-    if dsc.part != lv.PART.ITEMS:
-        return
-    if not dsc.p1 or not dsc.p2:
+    draw_task = e.get_draw_task()
+    # Only the line segments of the series; None for any other draw task
+    line_dsc = draw_task.get_line_dsc()
+    if line_dsc is None or line_dsc.base.part != lv.PART.ITEMS:
         return
 
-    # Add  a line mask that keeps the area below the line
-    line_mask_param = lv.draw_mask_line_param_t()
-    line_mask_param.points_init(dsc.p1.x, dsc.p1.y, dsc.p2.x, dsc.p2.y, lv.DRAW_MASK_LINE_SIDE.BOTTOM)
-    # line_mask_id = line_mask_param.draw_mask_add(None)
-    line_mask_id = lv.draw_mask_add(line_mask_param, None)
-    # Add a fade effect: transparent bottom covering top
-    h = obj.get_height()
-    fade_mask_param = lv.draw_mask_fade_param_t()
-    coords = lv.area_t()
-    obj.get_coords(coords)
-    fade_mask_param.init(coords, lv.OPA.COVER, coords.y1 + h // 8, lv.OPA.TRANSP,coords.y2)
-    fade_mask_id = lv.draw_mask_add(fade_mask_param,None)
-
-    # Draw a rectangle that will be affected by the mask
-    draw_rect_dsc = lv.draw_rect_dsc_t()
-    draw_rect_dsc.init()
-    draw_rect_dsc.bg_opa = lv.OPA._20
-    draw_rect_dsc.bg_color = dsc.line_dsc.color
-
-    a = lv.area_t()
-    a.x1 = dsc.p1.x
-    a.x2 = dsc.p2.x - 1
-    a.y1 = min(dsc.p1.y, dsc.p2.y)
-    coords = lv.area_t()
-    obj.get_coords(coords)
-    a.y2 = coords.y2
-    lv.draw_rect(a, dsc.clip_area, draw_rect_dsc)
-
-    # Remove the masks
-    lv.draw_mask_remove_id(line_mask_id)
-    lv.draw_mask_remove_id(fade_mask_id)
-
+    obj = lv.obj.__cast__(e.get_target())
+    obj.get_coords(chart_coords)
+    p1 = line_dsc.p1
+    p2 = line_dsc.p2
+    y_top = p1.y if p1.y < p2.y else p2.y
+    y_bottom = p2.y if p1.y < p2.y else p1.y
+
+    # Fade from the line towards the bottom of the chart
+    full_h = obj.get_height()
+    fract_upper = (int(y_top) - chart_coords.y1) * 255 // full_h
+    fract_lower = (int(y_bottom) - chart_coords.y1) * 255 // full_h
+    color = line_dsc.color
+
+    # Triangle between the segment and the horizontal through its lower end
+    tri_dsc.p[0].x = p1.x
+    tri_dsc.p[0].y = p1.y
+    tri_dsc.p[1].x = p2.x
+    tri_dsc.p[1].y = p2.y
+    tri_dsc.p[2].x = p1.x if p1.y < p2.y else p2.x
+    tri_dsc.p[2].y = y_bottom
+    tri_dsc.bg_grad.stops[0].color = color
+    tri_dsc.bg_grad.stops[0].opa = 255 - fract_upper
+    tri_dsc.bg_grad.stops[0].frac = 0
+    tri_dsc.bg_grad.stops[1].color = color
+    tri_dsc.bg_grad.stops[1].opa = 255 - fract_lower
+    tri_dsc.bg_grad.stops[1].frac = 255
+    lv.draw_triangle(line_dsc.base.layer, tri_dsc)
+
+    # Rectangle from the lower end down to the bottom of the chart
+    rect_dsc.bg_grad.stops[0].color = color
+    rect_dsc.bg_grad.stops[0].opa = 255 - fract_lower
+    rect_dsc.bg_grad.stops[0].frac = 0
+    rect_dsc.bg_grad.stops[1].color = color
+    rect_dsc.bg_grad.stops[1].opa = 0
+    rect_dsc.bg_grad.stops[1].frac = 255
+    rect_area.x1 = int(p1.x)
+    rect_area.x2 = int(p2.x) - 1
+    rect_area.y1 = int(y_bottom) - 1
+    rect_area.y2 = chart_coords.y2
+    lv.draw_rect(line_dsc.base.layer, rect_dsc, rect_area)
+
+
+cnt = 0
 
 def add_data(timer):
-    # LV_UNUSED(timer);
-    cnt = 0;
-    char1.set_next_value(ser1, lv.rand(20, 90))
+    global cnt
+    chart1.set_next_value(ser1, lv.rand(20, 90))
 
     if cnt % 4 == 0:
-        chart1.set_next_value(ser2, lv_rand(40, 60))
+        chart1.set_next_value(ser2, lv.rand(40, 60))
 
-    cnt +=1
+    cnt += 1
 
 #
 # Add a faded area effect to the line chart
 #
 
 # Create a chart1
-chart1 = lv.chart(lv.scr_act())
+chart1 = lv.chart(lv.screen_active())
 chart1.set_size(200, 150)
 chart1.center()
 chart1.set_type(lv.chart.TYPE.LINE)    # Show lines and points too
 
-chart1.add_event_cb(draw_event_cb, lv.EVENT.DRAW_PART_BEGIN, None)
+# Print the bytes allocated by draw_event_cb per frame
+meter = AllocMeter("chart_2 draw")
+chart1.add_event_cb(meter.wrap(draw_event_cb), lv.EVENT.DRAW_TASK_ADDED, None)
+chart1.add_event_cb(meter.frame_end_cb, lv.EVENT.DRAW_POST_END, None)
+chart1.add_flag(lv.obj.FLAG.SEND_DRAW_TASK_EVENTS)
 chart1.set_update_mode(lv.chart.UPDATE_MODE.CIRCULAR)
 
 # Add two data series
@@ -78,5 +101,4 @@ for i in range(10):
     chart1.set_next_value(ser1, lv.rand(20, 90))
     chart1.set_next_value(ser2, lv.rand(30, 70))
 
-# timer = lv.timer_t(add_data, 200, None)
-
+# timer = lv.timer_create(add_data, 200, None)
@@ -2,6 +2,7 @@
 import time
 import lvgl as lv
 import display_driver
+from chart_lod import ChartLOD
 
 # Source: https://github.com/ankur219/ECG-Arrhythmia-classification/blob/642230149583adfae1e4bd26c6f0e1fd8af2be0e/sample.csv
 ecg_sample = [
@@ -51,7 +52,7 @@ def slider_x_event_cb(e):
 
     slider = lv.slider.__cast__(e.get_target())
     v = slider.get_value()
-    chart.set_zoom_x(v)
+    lod.set_zoom(v)
 
 def slider_y_event_cb(e):
 
@@ -59,11 +60,18 @@ def slider_y_event_cb(e):
     v = slider.get_value()
     chart.set_zoom_y(v)
 
+drag = lv.point_t()
+
+def chart_drag_event_cb(e):
+    # Pan the visible window while the chart is dragged horizontally
+    lv.indev_get_act().get_vect(drag)
+    lod.pan(-drag.x, chart.get_content_width())
 
 #
 # Display 1000 data points with zooming and scrolling.
-# See how the chart changes drawing mode (draw only vertical lines) when
-# the points get too crowded.
+# The chart only ever holds 200 points: ChartLOD picks the min/max level
+# matching the zoom and copies just the visible part into the chart,
+# so the cost of a redraw does not grow with the number of samples.
  
 # Create a chart
 chart = lv.chart(lv.scr_act())
@@ -76,9 +84,10 @@ chart.set_style_size(0, lv.PART.INDICATOR)
 
 ser = chart.add_series(lv.palette_main(lv.PALETTE.RED), lv.chart.AXIS.PRIMARY_Y)
 
-pcnt = len(ecg_sample)
-chart.set_point_count(pcnt)
-chart.set_ext_y_array(ser, ecg_sample)
+# lv_coord_t is int16 in this LVGL version
+lod = ChartLOD(ecg_sample, points=200, coord='h')
+lod.bind(chart, ser)
+chart.add_event_cb(chart_drag_event_cb, lv.EVENT.PRESSING, None)
 
 slider = lv.slider(lv.scr_act())
 slider.set_range(lv.IMG_ZOOM.NONE, lv.IMG_ZOOM.NONE * 10)
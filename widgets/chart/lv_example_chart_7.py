@@ -2,73 +2,75 @@
 import time
 import lvgl as lv
 import display_driver
+from alloc_meter import AllocMeter
+from circular_series import CircularSeries
+
+POINT_COUNT = 50
+MIX_STEPS = 64  # colour steps between red and blue
+
+# Colour table: built once, so drawing a point only looks up an existing colour
+red = lv.palette_main(lv.PALETTE.RED)
+blue = lv.palette_main(lv.PALETTE.BLUE)
+mix_colors = [red.color_mix(blue, i * 255 // (MIX_STEPS - 1)) for i in range(MIX_STEPS)]
+
+# Per-point style table, indexed like the series arrays and updated only
+# when a point changes; the opacity only depends on the age of the point
+point_mix = bytearray(POINT_COUNT)
+age_opa = bytearray((lv.OPA.COVER * i) // (POINT_COUNT - 1) for i in range(POINT_COUNT))
+
+def set_point_style(idx, x, y):
+    # Make smaller values blue, higher values red
+    x_opa = (x * lv.OPA._50) // 200
+    y_opa = (y * lv.OPA._50) // 1000
+    point_mix[idx] = (x_opa + y_opa) * (MIX_STEPS - 1) // 255
 
 def draw_event_cb(e):
-    dsc = e.get_draw_part_dsc()
-    if dsc.part == lv.PART.ITEMS:
-        obj = e.get_target()
-        ser = obj.get_series_next(None)
-        cnt = obj.get_point_count()
-        # print("cnt: ",cnt)
+    draw_task = e.get_draw_task()
+    # The point markers are fill tasks of the indicator part
+    fill_dsc = draw_task.get_fill_dsc()
+    if fill_dsc is not None and fill_dsc.base.part == lv.PART.INDICATOR:
+        # The points are drawn in array order (the chart's start point stays 0
+        # because CircularSeries writes the arrays itself), so id2 is the array index.
+        idx = fill_dsc.base.id2
         # Make older value more transparent
-        dsc.rect_dsc.bg_opa = (lv.OPA.COVER *  dsc.id) // (cnt - 1)
-        
-        # Make smaller values blue, higher values red
-        # x_array = chart.get_x_array(ser)
-        # y_array = chart.get_y_array(ser)
-        # dsc->id is the tells drawing order, but we need the ID of the point being drawn.
-        start_point = chart.get_x_start_point(ser)
-        # print("start point: ",start_point)
-        p_act = (start_point + dsc.id) % cnt # Consider start point to get the index of the array
-        # print("p_act", p_act)
-        x_opa = (x_array[p_act] * lv.OPA._50) // 200
-        y_opa = (y_array[p_act] * lv.OPA._50) // 1000
-        
-        dsc.rect_dsc.bg_color = lv.palette_main(lv.PALETTE.RED).color_mix(
-                                             lv.palette_main(lv.PALETTE.BLUE),
-                                             x_opa + y_opa)
-        
+        fill_dsc.opa = age_opa[circ.age(idx)]
+        fill_dsc.color = mix_colors[point_mix[idx]]
+
 def add_data(timer,chart):
     # print("add_data")
     x = lv.rand(0,200)
     y = lv.rand(0,1000)
-    chart.set_next_value2(ser, x, y)
-    # chart.set_next_value2(chart.gx, y)
-    x_array.pop(0)
-    x_array.append(x)
-    y_array.pop(0)
-    y_array.append(y)
+    # Overwrites the oldest point in place (O(1)) instead of shifting lists
+    set_point_style(circ.append(y, x), x, y)
     
 #
 # A scatter chart
 #
 
-chart = lv.chart(lv.scr_act())
+chart = lv.chart(lv.screen_active())
 chart.set_size(200, 150)
 chart.align(lv.ALIGN.CENTER, 0, 0)
-chart.add_event_cb(draw_event_cb, lv.EVENT.DRAW_PART_BEGIN, None)
+# Print the bytes allocated by draw_event_cb per frame
+meter = AllocMeter("chart_7 draw")
+chart.add_event_cb(meter.wrap(draw_event_cb), lv.EVENT.DRAW_TASK_ADDED, None)
+chart.add_event_cb(meter.frame_end_cb, lv.EVENT.DRAW_POST_END, None)
+chart.add_flag(lv.obj.FLAG.SEND_DRAW_TASK_EVENTS)
 chart.set_style_line_width(0, lv.PART.ITEMS)   # Remove the lines
 
 chart.set_type(lv.chart.TYPE.SCATTER)
 
-chart.set_axis_tick(lv.chart.AXIS.PRIMARY_X, 5, 5, 5, 1, True, 30)
-chart.set_axis_tick(lv.chart.AXIS.PRIMARY_Y, 10, 5, 6, 5, True, 50)
-
-chart.set_range(lv.chart.AXIS.PRIMARY_X, 0, 200)
-chart.set_range(lv.chart.AXIS.PRIMARY_Y, 0, 1000)
-
-chart.set_point_count(50)
+chart.set_axis_range(lv.chart.AXIS.PRIMARY_X, 0, 200)
+chart.set_axis_range(lv.chart.AXIS.PRIMARY_Y, 0, 1000)
 
 ser = chart.add_series(lv.palette_main(lv.PALETTE.RED), lv.chart.AXIS.PRIMARY_Y)
 
-x_array = []
-y_array = []
-for i in range(50):
-    x_array.append(lv.rand(0, 200))
-    y_array.append(lv.rand(0, 1000))
-                        
-ser.x_points = x_array
-ser.y_points = y_array
+# x/y kept in int32 arrays (the chart's coordinate type in LVGL v9), no gap
+circ = CircularSeries(POINT_COUNT, gap=0, scatter=True)
+circ.bind(chart, ser)
+for i in range(POINT_COUNT):
+    x = lv.rand(0, 200)
+    y = lv.rand(0, 1000)
+    set_point_style(circ.append(y, x), x, y)
 
 # Create an `lv_timer` to update the chart.
 
@@ -2,7 +2,7 @@
 import time
 import lvgl as lv
 import display_driver
-import fs_driver
+import font_registry
 #
 # Show mixed LTR, RTL and Chinese label
 #
@@ -11,26 +11,22 @@ ltr_label = lv.label(lv.screen_active())
 ltr_label.set_text("In modern terminology, a microcontroller is similar to a system on a chip (SoC).");
 # ltr_label.set_style_text_font(ltr_label, &lv_font_montserrat_16, 0);
 
-fs_drv = lv.fs_drv_t()
-fs_driver.fs_register(fs_drv, 'S')
+# Use the built-in font if enabled in lv_conf.h, otherwise load it from assets/font
+font_registry.set_font_dir("../../assets/font")
+font_montserrat_16 = font_registry.get("montserrat-16", lv.screen_active())
+ltr_label.set_style_text_font(font_montserrat_16, 0)
 
-try:
-    ltr_label.set_style_text_font(ltr_label, lv.font_montserrat_16, 0)
-except:
-    font_montserrat_16 = lv.binfont_create("S:./montserrat-16.fnt")
-    ltr_label.set_style_text_font(font_montserrat_16, 0)
-    
 ltr_label.set_width(310)
 ltr_label.align(lv.ALIGN.TOP_LEFT, 5, 5)
 
 rtl_label = lv.label(lv.screen_active())
 rtl_label.set_text("CPU - Central Processing Unit.")
 rtl_label.set_style_base_dir(lv.BASE_DIR.RTL, 0)
-rtl_label.set_style_text_font(lv.font_montserrat_16, 0)
+rtl_label.set_style_text_font(font_montserrat_16, 0)
 rtl_label.set_width(310)
 rtl_label.align(lv.ALIGN.LEFT_MID, 5, 0)
 
-font_simsun_16_cjk = lv.binfont_create("S:./lv_font_simsun_16_cjk.fnt")
+font_simsun_16_cjk = font_registry.get("cn-16", lv.screen_active())
 
 cz_label = lv.label(lv.screen_active())
 cz_label.set_style_text_font(font_simsun_16_cjk, 0)
@@ -2,7 +2,7 @@
 import time
 import lvgl as lv
 import display_driver
-import fs_driver
+import font_registry
 
 def event_handler(e):
     code = e.get_code()
@@ -20,14 +20,9 @@ def event_handler(e):
 style_sel =  lv.style_t()
 style_sel.init()
 
-try:
-    style_sel.set_text_font(lv.font_montserrat_16)
-except:
-    fs_drv = lv.fs_drv_t()
-    fs_driver.fs_register(fs_drv, 'S')
-    print("montserrat-16 not enabled in lv_conf.h, dynamically loading the font")
-    font_montserrat_16 = lv.font_load("S:../montserrat-16.fnt")
-    style_sel.set_text_font(font_montserrat_16)
+# Loaded from assets/font only if montserrat-16 is not enabled in lv_conf.h
+font_registry.set_font_dir("../../assets/font")
+style_sel.set_text_font(font_registry.get("montserrat-16", lv.screen_active()))
     
 opts = "\n".join(["1","2","3","4","5","6","7","8","9","10"])
 
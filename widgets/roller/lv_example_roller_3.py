@@ -2,7 +2,7 @@
 import time
 import lvgl as lv
 import display_driver
-import fs_driver
+import font_registry
 import sys
 
 class Lv_Roller_3():
@@ -30,14 +30,10 @@ class Lv_Roller_3():
         #if LV_FONT_MONTSERRAT_22
         #    lv_obj_set_style_text_font(roller1, &lv_font_montserrat_22, LV_PART_SELECTED);
         #endif
-        try:
-            roller1.set_style_text_font(lv.font_montserrat_22)
-        except:
-            fs_drv = lv.fs_drv_t()
-            fs_driver.fs_register(fs_drv, 'S')
-            print("montserrat-22 not enabled in lv_conf.h, dynamically loading the font")
-            font_montserrat_22 = lv.font_load("S:" + "../../assets/font/montserrat-22.fnt")
-            roller1.set_style_text_font(font_montserrat_22,lv.PART.SELECTED)
+        # Loaded from assets/font only if montserrat-22 is not enabled in lv_conf.h
+        font_registry.set_font_dir("../../assets/font")
+        font_montserrat_22 = font_registry.get("montserrat-22", lv.scr_act())
+        roller1.set_style_text_font(font_montserrat_22, lv.PART.SELECTED)
            
         roller1.set_options("\n".join([
             "January",